@@ -7,7 +7,7 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uuid
@@ -16,13 +16,22 @@ from pathlib import Path
 import json
 from typing import Dict, Any, Optional
 import asyncio
-from src.backend.analysis.pipeline_video_frames import FrameAnalysisPipeline
-from src.backend.analysis.pipeline_manager import run_full_pipeline
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+# Heavy libraries (torch via ultralytics/easyocr/whisper, spaCy, NLTK,
+# scikit-learn) are imported where they are used or by the background
+# warm-up, so the server accepts requests right after process start.
 from src.backend.analysis.pipeline_ingestion import run_ingestion_pipeline
+from src.backend.analysis.media_info import MediaInfo, get_media_info, sidecar_path
 from src.backend.analysis.pipeline_audio_text import AudioTranscriptionPipeline
+from src.backend.analysis.pipeline_audio_features import run_audio_features
+from src.backend.analysis.transcript_stream import TranscriptStream
+from src.backend.analysis.kwic_index import get_kwic_index
+from src.backend.analysis.search_index import get_search_index
+from src.backend.analysis.pipeline_vad import default_workers
 from src.backend.utils.logger import get_logger
-from src.backend.analysis.pos_analysis import POSAnalysis
-from src.backend.analysis.quantitative_analysis import QuantitativeAnalysis
 from fastapi import Form
 
 
@@ -55,6 +64,13 @@ AUDIO_DIR = Path("outputs/audio")
 TRANSCRIPTS_DIR = Path("outputs/transcripts")
 STATIC_DIR = Path("static")
 
+# Fast preview pass settings (provisional results before the full pass)
+PREVIEW_SAMPLE_FPS = 1
+PREVIEW_IMGSZ = 320
+PREVIEW_YOLO_MODEL = "models/yolov8n.pt"
+# Videos shorter than this skip the preview: the full pass is done soon anyway
+PREVIEW_MIN_DURATION_S = 60.0
+
 UPLOAD_DIR.mkdir(exist_ok=True)
 RESULTS_DIR.mkdir(exist_ok=True)
 AUDIO_DIR.mkdir(exist_ok=True)
@@ -67,6 +83,54 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 # Store analysis status and results
 analysis_status: Dict[str, Dict[str, Any]] = {}
 
+# Live transcript segments per analysis (see /api/stream/{id}/transcript)
+transcript_streams: Dict[str, TranscriptStream] = {}
+
+# Background warm-up of heavy libraries and models (see /api/health).
+# Set VAA1_WARMUP=0 to load everything on first use instead.
+SERVER_START = time.monotonic()
+warmup_status: Dict[str, Any] = {"state": "pending", "loaded": [], "errors": {}}
+
+
+def warm_up():
+    """Import heavy pipeline modules and load the spaCy model in the background."""
+    warmup_status["state"] = "running"
+    steps = [
+        ("frame_pipeline", lambda: importlib.import_module("src.backend.analysis.pipeline_video_frames")),
+        ("ultralytics", lambda: importlib.import_module("ultralytics")),
+        ("easyocr", lambda: importlib.import_module("easyocr")),
+        ("spacy_model", lambda: importlib.import_module("src.backend.analysis.pos_analysis").get_nlp()),
+        ("nltk_resources", lambda: importlib.import_module(
+            "src.backend.analysis.quantitative_analysis").ensure_nltk_resources()),
+    ]
+    for name, step in steps:
+        try:
+            step()
+            warmup_status["loaded"].append(name)
+        except Exception as e:
+            # Not fatal: the stage that needs it reports the error when it runs
+            warmup_status["errors"][name] = str(e)
+            logger.warning(f"⚠️ Warm-up step '{name}' failed: {str(e)}")
+    warmup_status["state"] = "done"
+    warmup_status["seconds"] = round(time.monotonic() - SERVER_START, 2)
+    logger.info(f"🔥 Warm-up finished in {warmup_status['seconds']}s ({', '.join(warmup_status['loaded']) or 'nothing loaded'})")
+
+
+def sync_text_indexes():
+    """Index transcripts/OCR CSVs written while the server was not running."""
+    try:
+        logger.info(f"🔎 Search index sync: {get_search_index().sync(TRANSCRIPTS_DIR)}")
+        logger.info(f"🔎 KWIC index sync: {get_kwic_index().sync_transcripts(TRANSCRIPTS_DIR)}")
+    except Exception as e:
+        logger.warning(f"⚠️ Text index sync failed: {str(e)}")
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    if os.environ.get("VAA1_WARMUP", "1") != "0":
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    threading.Thread(target=sync_text_indexes, name="index-sync", daemon=True).start()
+
 @app.post("/api/upload", response_model=dict)
 async def upload_video(file: UploadFile = File(...), cvatID: int = Form(...)) -> dict:
     """
@@ -96,6 +160,14 @@ async def upload_video(file: UploadFile = File(...), cvatID: int = Form(...)) ->
         # Save uploaded file
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
+
+        # Probe once per upload; the MediaInfo is persisted next to the file
+        # and reused by every stage
+        media_info = None
+        try:
+            media_info = get_media_info(file_path).to_dict()
+        except Exception as probe_error:
+            logger.warning(f"⚠️ Media probe failed for {safe_filename}: {str(probe_error)}")
         
         # Initialize analysis status
         analysis_status[analysis_id] = {
@@ -110,6 +182,8 @@ async def upload_video(file: UploadFile = File(...), cvatID: int = Form(...)) ->
             "end_time": None,
             "output_files": {},
             "pipeline_type": "full",
+            "preview": None,
+            "media_info": media_info,
             "cvatID": cvatID
         }
         
@@ -129,7 +203,15 @@ async def upload_video(file: UploadFile = File(...), cvatID: int = Form(...)) ->
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 @app.post("/api/analyze/{analysis_id}", response_model=dict)
-async def start_analysis(analysis_id: str, background_tasks: BackgroundTasks, pipeline_type: str = "full") -> dict:
+async def start_analysis(
+    analysis_id: str,
+    background_tasks: BackgroundTasks,
+    pipeline_type: str = "full",
+    preview: bool = True,
+    save_audio: bool = True,
+    diarize: bool = False,
+    num_speakers: Optional[int] = None
+) -> dict:
     """
     Start video analysis for uploaded video
     Runs in background
@@ -138,6 +220,16 @@ async def start_analysis(analysis_id: str, background_tasks: BackgroundTasks, pi
     - "full": Video + Audio analysis (default)
     - "visual_only": Only video frame analysis  
     - "audio_only": Only audio transcription
+
+    preview: run a fast low-fidelity visual pass alongside the full pass and
+    publish its provisional detections in /api/status until the full pass
+    replaces them (skipped for videos under PREVIEW_MIN_DURATION_S)
+
+    save_audio: keep the extracted WAV for the "audio" download; when false
+    the audio is only decoded in memory for transcription
+
+    diarize: label transcript segments with speakers (num_speakers if known,
+    otherwise estimated)
     """
     if analysis_id not in analysis_status:
         raise HTTPException(status_code=404, detail="Analysis ID not found")
@@ -157,9 +249,17 @@ async def start_analysis(analysis_id: str, background_tasks: BackgroundTasks, pi
     status["progress"] = 10  # Initial progress
     status["start_time"] = asyncio.get_event_loop().time()
     status["pipeline_type"] = pipeline_type
+    status["preview"] = None
+
+    if pipeline_type in ["full", "audio_only"]:
+        transcript_streams[analysis_id] = TranscriptStream(
+            TRANSCRIPTS_DIR / f"{analysis_id}_transcript.partial.jsonl"
+        )
     
     # Add analysis to background tasks
-    background_tasks.add_task(run_complete_analysis, analysis_id, pipeline_type)
+    background_tasks.add_task(
+        run_complete_analysis, analysis_id, pipeline_type, preview, save_audio, diarize, num_speakers
+    )
     
     logger.info(f"Analysis started for {analysis_id} with pipeline: {pipeline_type}")
     
@@ -171,8 +271,325 @@ async def start_analysis(analysis_id: str, background_tasks: BackgroundTasks, pi
         "pipeline_type": pipeline_type
     }
 
-def run_complete_analysis(analysis_id: str, pipeline_type: str):
-    """Run the complete analysis pipeline in background"""
+def run_preview_analysis(
+    analysis_id: str,
+    video_path: str,
+    output_dir: Path,
+    media_info: Optional[MediaInfo] = None,
+    full_done: Optional[threading.Event] = None
+):
+    """
+    Fast preview pass: sampled frames, small YOLO input size, no OCR.
+    Publishes provisional results on the analysis status unless the full
+    pass (full_done) has already finished.
+    """
+    import time
+    status = analysis_status[analysis_id]
+    preview_start = time.time()
+
+    logger.info(f"⚡ Starting preview pass for {analysis_id}")
+    from src.backend.analysis.pipeline_video_frames import FrameAnalysisPipeline
+    preview_pipeline = FrameAnalysisPipeline(
+        video_path,
+        output_dir=str(output_dir / "preview"),
+        yolo_model_path=PREVIEW_YOLO_MODEL,
+        enable_ocr=False,
+        media_info=media_info
+    )
+    preview_results = preview_pipeline.analyze(
+        save_video=False,
+        display=False,
+        sample_fps=PREVIEW_SAMPLE_FPS,
+        imgsz=PREVIEW_IMGSZ
+    )
+
+    yolo_results = preview_results.get("yolo_results", [])
+    class_counts: Dict[str, int] = {}
+    for det in yolo_results:
+        class_counts[det["class_name"]] = class_counts.get(det["class_name"], 0) + 1
+
+    if full_done is not None and full_done.is_set():
+        logger.info(f"⚡ Preview for {analysis_id} finished after the full pass, discarded")
+        return
+
+    status["preview"] = {
+        "yolo_results": yolo_results,
+        "class_counts": class_counts,
+        "sample_fps": PREVIEW_SAMPLE_FPS,
+        "imgsz": PREVIEW_IMGSZ,
+        "processing_time": round(time.time() - preview_start, 2)
+    }
+    status["progress"] = max(status["progress"], 25)
+    logger.info(f"⚡ Preview ready for {analysis_id}: {len(yolo_results)} provisional detections")
+
+
+def run_visual_pipeline(
+    analysis_id: str,
+    video_path: str,
+    analysis_output_dir: Path,
+    preview: bool = True,
+    media_info: Optional[MediaInfo] = None
+):
+    """
+    Visual stage (YOLO + OCR, with an optional concurrent preview pass).
+    Returns (results, output_files); failures are reported as results["visual_error"].
+    """
+    results = {}
+    output_files = {}
+
+    # PREVIEW PASS (provisional, replaced by the full-fidelity results). Runs
+    # alongside the full pass so it adds no latency; skipped for short videos.
+    preview_thread = None
+    full_done = threading.Event()
+    if preview and media_info is not None and 0 < media_info.duration < PREVIEW_MIN_DURATION_S:
+        logger.info(f"⚡ Skipping preview for {analysis_id}: {media_info.duration:.0f}s video")
+        preview = False
+    if preview:
+        def preview_task():
+            try:
+                run_preview_analysis(analysis_id, video_path, analysis_output_dir, media_info, full_done)
+            except Exception as preview_error:
+                # The preview is best-effort; the full pass still runs
+                logger.warning(f"⚠️ Preview pass failed: {str(preview_error)}")
+
+        preview_thread = threading.Thread(target=preview_task, name=f"preview-{analysis_id[:8]}", daemon=True)
+        preview_thread.start()
+
+    try:
+        logger.info("🎥 Starting visual analysis pipeline...")
+        
+        # Initialize frame analysis pipeline
+        from src.backend.analysis.pipeline_video_frames import FrameAnalysisPipeline
+        frame_pipeline = FrameAnalysisPipeline(video_path, media_info=media_info)
+        
+        # Run the analysis
+        visual_results = frame_pipeline.analyze(
+            save_video=True, 
+            display=False
+        )
+        
+        # Store visual results
+        results["visual_analysis"] = {
+            "yolo_results": visual_results.get("yolo_results", []),
+            "ocr_results": visual_results.get("ocr_results", []),
+            "annotated_video": visual_results.get("annotated_video"),
+            "yolo_csv": visual_results.get("yolo_csv"),
+            "ocr_csv": visual_results.get("ocr_csv"),
+            "summary_json": visual_results.get("summary_json")
+        }
+        
+        # Add output files for download
+        output_files["video"] = visual_results.get("annotated_video")
+        output_files["yolo_csv"] = visual_results.get("yolo_csv")
+        output_files["ocr_csv"] = visual_results.get("ocr_csv")
+        output_files["summary_json"] = visual_results.get("summary_json")
+
+        # Make OCR text searchable (/api/search)
+        get_search_index().index_ocr(
+            analysis_id, visual_results.get("ocr_results", []), path=visual_results.get("ocr_csv")
+        )
+        
+        logger.info(f"✅ Visual analysis completed: {len(visual_results.get('yolo_results', []))} detections")
+        
+    except Exception as visual_error:
+        logger.error(f"❌ Visual pipeline failed: {str(visual_error)}")
+        import traceback
+        logger.error(f"📝 Traceback: {traceback.format_exc()}")
+        results["visual_error"] = str(visual_error)
+
+    if preview_thread is not None:
+        # The full results are written; the preview's files are no longer needed
+        full_done.set()
+        preview_thread.join()
+        shutil.rmtree(analysis_output_dir / "preview", ignore_errors=True)
+
+    return results, output_files
+
+
+def run_audio_pipeline(
+    analysis_id: str,
+    video_path: str,
+    save_audio: bool = True,
+    workers: Optional[int] = None,
+    media_info: Optional[MediaInfo] = None,
+    diarize: bool = False,
+    num_speakers: Optional[int] = None
+):
+    """
+    Audio stage (extraction, transcription, POS and quantitative analysis).
+    Returns (results, output_files); failures are reported as results["audio_error"].
+    """
+    results = {}
+    output_files = {}
+
+    try:
+        logger.info("🎵 Starting audio pipeline...")
+
+        # Step 1: Prepare organized paths
+        organized_audio_path = AUDIO_DIR / f"{analysis_id}_audio.wav"
+        organized_transcript_path = TRANSCRIPTS_DIR / f"{analysis_id}_transcript.json"
+
+        # Ensure dirs exist
+        AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+        TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
+
+        # Step 2: Decode audio in memory (transcription happens once, in step 3).
+        # The WAV is only written when the audio download was requested.
+        ingestion_result = run_ingestion_pipeline(
+            video_path,
+            transcribe=False,
+            keep_audio=save_audio,
+            audio_output_path=str(organized_audio_path),
+            media_info=media_info
+        )
+
+        # Step 2b: Loudness / spectral feature track from the same PCM buffer
+        audio_features = run_audio_features(ingestion_result["pcm"], AUDIO_DIR / analysis_id)
+
+        # Step 3: Transcribe the PCM buffer and write the transcript artifact,
+        # streaming segments to clients as they are produced
+        stream = transcript_streams.get(analysis_id)
+        audio_pipeline = AudioTranscriptionPipeline(
+            str(organized_audio_path),
+            vad=True,
+            workers=workers,
+            pcm=ingestion_result["pcm"],
+            transcript_path=str(organized_transcript_path),
+            gate_music=True,
+            diarize=diarize,
+            num_speakers=num_speakers
+        )
+        try:
+            transcript = audio_pipeline.run(
+                on_segment=stream.publish if stream else None
+            )
+        finally:
+            if stream:
+                stream.close()
+        if stream and organized_transcript_path.exists():
+            stream.discard()
+
+        # Step 4: POS analysis on the in-memory transcript
+        # (per segment, batched through nlp.pipe, with merged global aggregates)
+        logger.info("📝 Starting POS analysis on transcript segments...")
+        from src.backend.analysis.pos_analysis import analyze_segments
+        pos_result = analyze_segments(transcript.get("segments", []))
+
+        pos_path_init = f"{analysis_id}_pos.json" 
+        pos_path = TRANSCRIPTS_DIR / pos_path_init
+        pos_path.parent.mkdir(exist_ok=True, parents=True)
+
+        with open(pos_path, "w", encoding="utf-8") as f:
+            json.dump(pos_result, f, indent=2, ensure_ascii=False)
+
+        logger.info(f"POS Results saved: {pos_path}")
+
+        # Step 4b: Full-text index of the segments (/api/search) and
+        # positional index for keyword-in-context queries (/api/kwic)
+        get_search_index().index_transcript(
+            analysis_id, transcript.get("segments", []), path=organized_transcript_path
+        )
+        get_kwic_index().add_transcript(
+            f"transcript:{analysis_id}",
+            transcript.get("segments", []),
+            name=organized_transcript_path.name,
+            mtime_ns=organized_transcript_path.stat().st_mtime_ns if organized_transcript_path.exists() else None
+        )
+
+        # Step 5: Additional Quantitative Analysis (corpus-wide). Runs in its own
+        # try block: a failure here (e.g. missing NLTK data) is reported but
+        # must not discard the transcript and POS results above.
+        quantitative_path = None
+        try:
+            # The corpus index only reads files that changed since the last sync
+            # and adds this transcript; cost scales with the new text, not the corpus
+            data_dir = Path("src/backend/analysis/analysis/analysis")  # <- change this to the output files directory
+            from src.backend.analysis.corpus_index import get_corpus_index
+            from src.backend.analysis.quantitative_analysis import QuantitativeAnalysis
+            corpus_index = get_corpus_index()
+            corpus_index.sync_directory(data_dir)
+            corpus_index.add_document(
+                f"transcript:{analysis_id}",
+                pos_result["text"],
+                name=f"{analysis_id}_transcript.txt"
+            )
+            qa = QuantitativeAnalysis(index=corpus_index)
+            qa_results = qa.run()
+
+            quantitative_path = TRANSCRIPTS_DIR / f"{analysis_id}_quantitative.json"
+            token_info = qa_results["token_info"]
+            quantitative_data = {
+                "documents": json.loads(qa_results["stats_df"].to_json(orient="records")),
+                "token_count": token_info["token_count"],
+                "type_count": token_info["type_count"],
+                "ttr": token_info["ttr"],
+                "top_terms": token_info["freq_dist"].most_common(50),
+                "tfidf_top_terms": (
+                    json.loads(qa_results["tfidf_df"].to_json(orient="records"))
+                    if qa_results["tfidf_df"] is not None else []
+                ),
+                "bigrams": qa_results["bigrams"],
+            }
+            with open(quantitative_path, "w", encoding="utf-8") as f:
+                json.dump(quantitative_data, f, indent=2, ensure_ascii=False, default=str)
+
+            logger.info(
+                f"Quantitative analysis saved: {quantitative_path} "
+                f"({len(quantitative_data['documents'])} corpus documents, {quantitative_data['token_count']} tokens)"
+            )
+        except Exception as qa_error:
+            logger.error(f"❌ Quantitative analysis failed: {qa_error}")
+            results["quantitative_error"] = str(qa_error)
+            quantitative_path = None
+
+        # Step 6: Store results
+        results["audio_analysis"] = {
+            "audio_path": ingestion_result["audio_path"],
+            "transcript_path": str(organized_transcript_path),
+            "transcript": transcript,
+            "pos_analysis": str(pos_path),
+            "quantitative_analysis": str(quantitative_path) if quantitative_path else None,
+            "music_timeline": str(audio_pipeline.music_timeline_path) if audio_pipeline.music_timeline_path else None,
+            "audio_features": audio_features,
+            "speakers": sorted({seg["speaker"] for seg in transcript["segments"] if "speaker" in seg}),
+            "metadata": ingestion_result.get("metadata", {}),
+        }
+
+        if ingestion_result["audio_path"]:
+            output_files["audio"] = ingestion_result["audio_path"]
+        output_files["transcript"] = str(organized_transcript_path)
+        output_files["pos_analysis"] = str(pos_path)
+        if quantitative_path:
+            output_files["quantitative_analysis"] = str(quantitative_path)
+        output_files["audio_features"] = audio_features["header_path"]
+        output_files["audio_features_data"] = audio_features["data_path"]
+        if audio_pipeline.music_timeline_path:
+            output_files["music_timeline"] = str(audio_pipeline.music_timeline_path)
+
+        logger.info("✅ Audio pipeline completed successfully")
+
+    except Exception as audio_error:
+        logger.error(f"❌ Audio pipeline failed: {str(audio_error)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        results["audio_error"] = str(audio_error)
+
+    return results, output_files
+
+
+def run_complete_analysis(
+    analysis_id: str,
+    pipeline_type: str,
+    preview: bool = True,
+    save_audio: bool = True,
+    diarize: bool = False,
+    num_speakers: Optional[int] = None
+):
+    """
+    Run the complete analysis pipeline in background.
+    For "full" analyses the visual and audio stages run concurrently; their
+    results and error states are merged when both are done.
+    """
     try:
         status = analysis_status[analysis_id]
         video_path = status["file_path"]
@@ -187,6 +604,14 @@ def run_complete_analysis(analysis_id: str, pipeline_type: str):
             raise FileNotFoundError(error_msg)
         
         logger.info("✅ Video file exists")
+
+        # Cached since upload (memory or sidecar file); stages never re-probe
+        media_info = None
+        try:
+            media_info = get_media_info(video_path)
+            status["media_info"] = media_info.to_dict()
+        except Exception as probe_error:
+            logger.warning(f"⚠️ Media probe failed: {str(probe_error)}")
         
         # Create output directory for this analysis
         analysis_output_dir = RESULTS_DIR / analysis_id
@@ -194,139 +619,35 @@ def run_complete_analysis(analysis_id: str, pipeline_type: str):
         
         results = {}
         output_files = {}
-        
-        # VISUAL PROCESSING (YOLO + OCR)
-        if pipeline_type in ["full", "visual_only"]:
-            try:
-                logger.info("🎥 Starting visual analysis pipeline...")
-                
-                # Initialize frame analysis pipeline
-                frame_pipeline = FrameAnalysisPipeline(video_path)
-                
-                # Run the analysis
-                visual_results = frame_pipeline.analyze(
-                    save_video=True, 
-                    display=False
-                )
-                
-                # Store visual results
-                results["visual_analysis"] = {
-                    "yolo_results": visual_results.get("yolo_results", []),
-                    "ocr_results": visual_results.get("ocr_results", []),
-                    "annotated_video": visual_results.get("annotated_video"),
-                    "yolo_csv": visual_results.get("yolo_csv"),
-                    "ocr_csv": visual_results.get("ocr_csv"),
-                    "summary_json": visual_results.get("summary_json")
-                }
-                
-                # Add output files for download
-                output_files["video"] = visual_results.get("annotated_video")
-                output_files["yolo_csv"] = visual_results.get("yolo_csv")
-                output_files["ocr_csv"] = visual_results.get("ocr_csv")
-                output_files["summary_json"] = visual_results.get("summary_json")
-                
-                logger.info(f"✅ Visual analysis completed: {len(visual_results.get('yolo_results', []))} detections")
-                
-            except Exception as visual_error:
-                logger.error(f"❌ Visual pipeline failed: {str(visual_error)}")
-                import traceback
-                logger.error(f"📝 Traceback: {traceback.format_exc()}")
-                results["visual_error"] = str(visual_error)
-        
-        # AUDIO PROCESSING 
-        if pipeline_type in ["full", "audio_only"]:
-            try:
-                logger.info("🎵 Starting audio pipeline...")
-
-                # Step 1: Extract audio
-                ingestion_result = run_ingestion_pipeline(video_path)
-                audio_path = ingestion_result["audio_path"]
-
-                if not Path(audio_path).exists():
-                    raise FileNotFoundError(f"Audio file not found: {audio_path}")
-
-                # Step 2: Transcribe
-                audio_pipeline = AudioTranscriptionPipeline(str(audio_path))
-                transcript = audio_pipeline.run()
-
-                # Step 3: Prepare organized paths
-                audio_filename = f"{analysis_id}_audio.wav"
-                transcript_filename = f"{analysis_id}_transcript.json"
-
-                organized_audio_path = AUDIO_DIR / audio_filename
-                organized_transcript_path = TRANSCRIPTS_DIR / transcript_filename
-
-                # Ensure dirs exist
-                AUDIO_DIR.mkdir(parents=True, exist_ok=True)
-                TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
-
-                # Step 4: Move audio
-                shutil.move(audio_path, organized_audio_path)
-
-                # Step 5: Locate transcript file
-                original_transcript_dir = Path(audio_path).parent / "transcripts"
-                original_transcript_path = original_transcript_dir / f"{Path(audio_path).stem}_transcript.json"
-
-                if not original_transcript_path.exists():
-                    alternative_path = audio_pipeline.output_dir / f"{Path(audio_path).stem}_transcript.json"
-                    original_transcript_path = alternative_path
-
-                if not original_transcript_path.exists():
-                    raise FileNotFoundError("Transcript file not found")
-
-                # Step 6: Move transcript
-                shutil.move(str(original_transcript_path), organized_transcript_path)
-
-                # Step 7: POS analysis (AFTER transcript exists in final place)
-                logger.info("📝 Starting POS analysis on transcript...")
-                with open(organized_transcript_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
-                text = " ".join(
-                    seg["text"] for seg in data.get("segments", [])
-                )
-
-                pos_analyzer = POSAnalysis(text)
-                pos_result = pos_analyzer.run()
-
-                pos_path_init = f"{analysis_id}_pos.json" 
-                pos_path = TRANSCRIPTS_DIR / pos_path_init
-                pos_path.parent.mkdir(exist_ok=True, parents=True)
 
-                with open(pos_path, "w", encoding="utf-8") as f:
-                    json.dump(pos_result, f, indent=2, ensure_ascii=False)
-
-                logger.info(f"POS Results saved: {pos_path}")
-
-                # Additional Quantitative Analysis
-
-                data_dir = Path("src/backend/analysis/analysis/analysis")  # <- change this to the output files directory
-                files = sorted(data_dir.rglob("*.txt"))
-                docs = [p.read_text(encoding="utf-8", errors="ignore") for p in files]
-
-                qa = QuantitativeAnalysis(docs=docs, file_paths=files)
-                results = qa.run()
-                print(results["stats_df"].head(20))
-
-                # Step 8: Store results
-                results["audio_analysis"] = {
-                    "audio_path": str(organized_audio_path),
-                    "transcript_path": str(organized_transcript_path),
-                    "pos_analysis": str(pos_path),
-                    "metadata": ingestion_result.get("metadata", {}),
-                }
-
-                output_files["audio"] = str(organized_audio_path)
-                output_files["transcript"] = str(organized_transcript_path)
-                output_files["pos_analysis"] = str(pos_path)
-
-                logger.info("✅ Audio pipeline completed successfully")
-
-            except Exception as audio_error:
-                logger.error(f"❌ Audio pipeline failed: {str(audio_error)}")
-                import traceback
-                logger.error(traceback.format_exc())
-                results["audio_error"] = str(audio_error)
+        run_visual = pipeline_type in ["full", "visual_only"]
+        run_audio = pipeline_type in ["full", "audio_only"]
+
+        if run_visual and run_audio:
+            # Both stages only share the input file. YOLO/OCR and Whisper spend
+            # their time in native code that releases the GIL, so threads give
+            # real overlap; the audio stage gets half the transcription workers
+            # to leave CPU for the visual stage.
+            audio_workers = max(1, default_workers() // 2)
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"analysis-{analysis_id[:8]}") as pool:
+                stages = [
+                    pool.submit(run_visual_pipeline, analysis_id, video_path, analysis_output_dir, preview, media_info),
+                    pool.submit(
+                        run_audio_pipeline, analysis_id, video_path, save_audio, audio_workers, media_info,
+                        diarize, num_speakers
+                    ),
+                ]
+                for stage in stages:
+                    stage_results, stage_files = stage.result()
+                    results.update(stage_results)
+                    output_files.update(stage_files)
+        elif run_visual:
+            results, output_files = run_visual_pipeline(analysis_id, video_path, analysis_output_dir, preview, media_info)
+        elif run_audio:
+            results, output_files = run_audio_pipeline(
+                analysis_id, video_path, save_audio, media_info=media_info,
+                diarize=diarize, num_speakers=num_speakers
+            )
 
         
         # MARK AS COMPLETED
@@ -336,6 +657,7 @@ def run_complete_analysis(analysis_id: str, pipeline_type: str):
             "progress": 100,
             "results": results,
             "output_files": output_files,
+            "preview": None,
             "end_time": time.time()
         })
         
@@ -356,6 +678,15 @@ def run_complete_analysis(analysis_id: str, pipeline_type: str):
             "end_time": time.time()
         })
 
+    finally:
+        # Never leave stream subscribers waiting on a failed/skipped audio stage.
+        # Open SSE responses keep their own reference and drain the remaining
+        # segments; dropping it here keeps the segments from living as long
+        # as the process.
+        stream = transcript_streams.pop(analysis_id, None)
+        if stream:
+            stream.close()
+
 @app.get("/api/status/{analysis_id}", response_model=dict)
 async def get_analysis_status(analysis_id: str) -> dict:
     """
@@ -373,7 +704,23 @@ async def get_analysis_status(analysis_id: str) -> dict:
         "error": status.get("error"),
         "pipeline_type": status.get("pipeline_type", "full"),
         "cvatID" : status["cvatID"],
+        "media_info": status.get("media_info"),
     }
+
+    # Transcript segments produced so far
+    stream = transcript_streams.get(analysis_id)
+    if status["status"] == "processing" and stream:
+        response_data["transcript_segments"] = len(stream.segments)
+
+    # Provisional preview results while the full pass is still running
+    if status["status"] == "processing" and status.get("preview"):
+        preview = status["preview"]
+        response_data["provisional"] = True
+        response_data["summary"] = {
+            "yolo_detections": len(preview["yolo_results"]),
+            "detected_classes": preview["class_counts"],
+        }
+        response_data["preview"] = preview
     
     # Add results if completed
     if status["status"] == "completed" and status.get("results"):
@@ -406,6 +753,51 @@ async def get_analysis_status(analysis_id: str) -> dict:
             response_data["download_links"][file_type] = f"/api/download/{analysis_id}/{file_type}"
     return response_data
 
+@app.get("/api/stream/{analysis_id}/transcript")
+async def stream_transcript(analysis_id: str):
+    """
+    Stream transcript segments as Server-Sent Events while transcription runs.
+    Emits the segments produced so far, then each new one ("segment" events),
+    and a final "done" event when transcription has finished.
+    """
+    if analysis_id not in analysis_status:
+        raise HTTPException(status_code=404, detail="Analysis ID not found")
+
+    stream = transcript_streams.get(analysis_id)
+    if stream is None:
+        # Finished analyses replay the saved transcript
+        results = analysis_status[analysis_id].get("results") or {}
+        transcript = results.get("audio_analysis", {}).get("transcript")
+        if not transcript:
+            raise HTTPException(status_code=404, detail="No transcript stream for this analysis")
+        stream = TranscriptStream()
+        for segment in transcript.get("segments", []):
+            stream.publish(segment)
+        stream.close()
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def push(segment):
+        loop.call_soon_threadsafe(queue.put_nowait, segment)
+
+    backlog = stream.subscribe(push)
+
+    async def event_source():
+        try:
+            for segment in backlog:
+                yield f"event: segment\ndata: {json.dumps(segment, ensure_ascii=False)}\n\n"
+            while True:
+                segment = await queue.get()
+                if segment is None:
+                    break
+                yield f"event: segment\ndata: {json.dumps(segment, ensure_ascii=False)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        finally:
+            stream.unsubscribe(push)
+
+    return StreamingResponse(event_source(), media_type="text/event-stream")
+
 @app.get("/api/download/{analysis_id}/{file_type}")
 async def download_file(analysis_id: str, file_type: str):
     """
@@ -430,7 +822,11 @@ async def download_file(analysis_id: str, file_type: str):
         "summary_json": ("analysis_summary.json", "application/json"),
         "audio": ("extracted_audio.wav", "audio/wav"),
         "transcript": ("transcript.json", "application/json"),
-        "pos_analysis": ("pos_analysis.json", "application/json")
+        "pos_analysis": ("pos_analysis.json", "application/json"),
+        "quantitative_analysis": ("quantitative_analysis.json", "application/json"),
+        "music_timeline": ("music_timeline.json", "application/json"),
+        "audio_features": ("audio_features.json", "application/json"),
+        "audio_features_data": ("audio_features.f32", "application/octet-stream")
     }
     
     if file_type not in file_mapping:
@@ -494,6 +890,9 @@ async def delete_analysis(analysis_id: str) -> dict:
         uploaded_file = Path(status["file_path"])
         if uploaded_file.exists():
             uploaded_file.unlink()
+        media_info_file = sidecar_path(uploaded_file)
+        if media_info_file.exists():
+            media_info_file.unlink()
         
         # Remove result files
         output_files = status.get("output_files", {})
@@ -502,8 +901,18 @@ async def delete_analysis(analysis_id: str) -> dict:
             if result_file.exists():
                 result_file.unlink()
         
+        # Drop the transcript from the corpus index
+        from src.backend.analysis.corpus_index import get_corpus_index
+        get_corpus_index().remove_document(f"transcript:{analysis_id}")
+        get_kwic_index().remove(f"transcript:{analysis_id}")
+        get_search_index().remove(analysis_id)
+
         # Remove from status tracking
         del analysis_status[analysis_id]
+        stream = transcript_streams.pop(analysis_id, None)
+        if stream:
+            stream.discard()
+        (TRANSCRIPTS_DIR / f"{analysis_id}_transcript.partial.jsonl").unlink(missing_ok=True)
         
         logger.info(f"Analysis {analysis_id} deleted successfully")
         
@@ -513,6 +922,43 @@ async def delete_analysis(analysis_id: str) -> dict:
         logger.error(f"Failed to delete analysis {analysis_id}: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to delete analysis")
 
+@app.get("/api/kwic", response_model=dict)
+def keyword_in_context(q: str, window: int = 5, limit: int = 25, offset: int = 0) -> dict:
+    """
+    Keyword-in-context lines for a word across all indexed transcripts,
+    with the timestamps (and speaker) of the segment each hit is in
+    """
+    kwic_index = get_kwic_index()
+    offset = max(offset, 0)
+    try:
+        lines = kwic_index.kwic(q, window=min(max(window, 0), 50), limit=min(max(limit, 1), 500), offset=offset)
+        total = kwic_index.count(q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"query": q, "total": total, "offset": offset, "lines": lines}
+
+@app.get("/api/search", response_model=dict)
+def search(
+    q: str,
+    analysis_id: Optional[str] = None,
+    source: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> dict:
+    """
+    Ranked full-text search over transcript segments and OCR lines of all
+    analyses (or one analysis_id / source), with timestamps
+    """
+    offset = max(offset, 0)
+    try:
+        page = get_search_index().search(
+            q, analysis_id=analysis_id, source=source, limit=min(max(limit, 1), 100), offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page["offset"] = offset
+    return page
+
 @app.get("/", response_model=dict)
 async def root() -> dict:
     """API root endpoint"""
@@ -521,8 +967,11 @@ async def root() -> dict:
         "version": "1.1.0",
         "endpoints": {
             "upload": "/api/upload",
-            "analyze": "/api/analyze/{id}?pipeline_type=full|visual_only|audio_only",
+            "analyze": "/api/analyze/{id}?pipeline_type=full|visual_only|audio_only&preview=true|false&save_audio=true|false&diarize=true|false&num_speakers=N",
             "status": "/api/status/{id}",
+            "transcript_stream": "/api/stream/{id}/transcript",
+            "kwic": "/api/kwic?q=word&window=5&limit=25&offset=0",
+            "search": "/api/search?q=text&analysis_id=ID&source=transcript|ocr&limit=20&offset=0",
             "download": "/api/download/{id}/{type}",
             "analyses": "/api/analyses"
         }
@@ -534,7 +983,9 @@ async def health_check() -> dict:
     return {
         "status": "healthy",
         "service": "Video Analysis API with Audio",
-        "timestamp": asyncio.get_event_loop().time()
+        "timestamp": asyncio.get_event_loop().time(),
+        "uptime_s": round(time.monotonic() - SERVER_START, 2),
+        "warmup": warmup_status
     }
 
 # Frontend serving (keep your existing code)
@@ -1,2 +1,11 @@
-﻿from .pipeline_video_frames import FrameAnalysisPipeline
 __all__ = ["FrameAnalysisPipeline"]
+
+
+def __getattr__(name):
+    # Imported on first access: importing any submodule runs this file, and
+    # the frame pipeline pulls in OpenCV and pandas
+    if name == "FrameAnalysisPipeline":
+        from .pipeline_video_frames import FrameAnalysisPipeline
+
+        return FrameAnalysisPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
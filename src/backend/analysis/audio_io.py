@@ -0,0 +1,106 @@
+"""
+Audio I/O Helpers
+-----------------
+Handles:
+ - Decoding any media file straight into mono float32 PCM via an FFmpeg pipe
+   (the in-memory format the transcription backends accept, no temp files)
+ - Reading / writing 16-bit PCM WAV files
+"""
+
+import subprocess
+import threading
+import wave
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def iter_audio_chunks(
+    media_path: str, sample_rate: int = SAMPLE_RATE, chunk_seconds: float = 30.0
+) -> Iterator[np.ndarray]:
+    """
+    Stream the audio track of a media file as mono float32 chunks.
+
+    FFmpeg decodes and resamples to raw s16le on stdout; nothing is written
+    to disk. Raises RuntimeError if FFmpeg fails.
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", str(media_path),
+        "-vn", "-ac", "1", "-ar", str(sample_rate),
+        "-f", "s16le", "-acodec", "pcm_s16le", "pipe:1",
+    ]
+    chunk_bytes = int(chunk_seconds * sample_rate) * 2
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # Drain stderr concurrently: if FFmpeg fills the stderr pipe while we wait
+    # on stdout, both processes block forever
+    stderr_chunks = []
+    stderr_reader = threading.Thread(
+        target=lambda: stderr_chunks.extend(iter(lambda: process.stderr.read(4096), b"")),
+        daemon=True,
+    )
+    stderr_reader.start()
+    try:
+        while True:
+            raw = process.stdout.read(chunk_bytes)
+            if not raw:
+                break
+            # An odd trailing byte can only come from a truncated stream
+            raw = raw[: len(raw) - (len(raw) % 2)]
+            yield np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+        stderr_reader.join()
+        process.stderr.close()
+        stderr = b"".join(stderr_chunks).decode(errors="ignore")
+
+    if returncode != 0:
+        raise RuntimeError(f"FFmpeg audio decoding failed: {stderr.strip()}")
+
+
+def decode_audio(media_path: str, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Decode the full audio track of a media file into a mono float32 array."""
+    chunks = list(iter_audio_chunks(media_path, sample_rate))
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def write_wav(pcm: np.ndarray, audio_path: str, sample_rate: int = SAMPLE_RATE) -> str:
+    """Write a mono float32 array as a 16-bit PCM WAV file."""
+    audio_path = Path(audio_path)
+    audio_path.parent.mkdir(parents=True, exist_ok=True)
+    samples = (np.clip(pcm, -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(str(audio_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return str(audio_path)
+
+
+def load_wav(audio_path: str) -> np.ndarray:
+    """
+    Load a 16-bit PCM WAV file as a mono float32 array in [-1, 1].
+    The file is expected at SAMPLE_RATE (as written by extract_audio).
+    """
+    audio_path = Path(audio_path)
+    with wave.open(str(audio_path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Expected 16-bit PCM WAV: {audio_path}")
+        if wav.getframerate() != SAMPLE_RATE:
+            raise ValueError(
+                f"Expected {SAMPLE_RATE} Hz audio, got {wav.getframerate()} Hz: {audio_path}"
+            )
+        channels = wav.getnchannels()
+        raw = wav.readframes(wav.getnframes())
+
+    pcm = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels).mean(axis=1)
+    return pcm
@@ -0,0 +1,513 @@
+"""
+Corpus Index
+------------
+Handles:
+ - A persistent, incrementally updated index of the text corpus used by
+   QuantitativeAnalysis (per-document token counts, document frequencies,
+   bigram counts and sentence statistics)
+ - Adding, replacing and removing single documents at a cost proportional
+   to that document, and syncing a directory of *.txt files by size/mtime
+ - Serving the QuantitativeAnalysis outputs (stats, lexical stats, TF-IDF
+   top terms, PMI bigrams, WHO/WHY sentence tags) from the index
+
+On-disk layout (outputs/corpus_index):
+    snapshot.npz         corpus term/document frequencies, the merged n-gram
+                         table (NgramCounts arrays, "ngram_" prefix) and the
+                         document metadata as of journal entry "seq"
+    journal.jsonl        append-only log of document adds/removes after the
+                         snapshot (one JSON object per line)
+    vocab.txt            one term per line; line number = term id (append-only)
+    docs/<id>.npz        per-document term counts and n-gram table
+    docs/<id>.tags.json  per-document WHO/WHY sentence tags
+
+An update writes the document's own files and appends one journal line; it
+never rewrites corpus-sized files. The document's n-gram table is kept as a
+pending part and merged into the corpus table when the next query (or
+compaction) needs it, so a sync merges once instead of once per file. Loading replays the journal on top of the
+snapshot. The journal is folded into a new snapshot (compaction) once it has
+as many entries as there are documents, so the O(corpus) compaction cost is
+spread over that many updates.
+
+Tokens follow build_token_stream (letters only, lowercased); bigrams are
+counted over the stopword-filtered tokens within each document.
+"""
+
+import json
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backend.analysis.ngram_counts import NgramCounts
+from src.backend.analysis.quantitative_analysis import (
+    clean_tokens,
+    corpus_sentence_word_stats,
+    stopword_set,
+    tag_sentences_who_why,
+    top_terms_per_row,
+)
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_DIR = Path("outputs/corpus_index")
+
+# Bump when the stored format or tokenization changes (forces a rebuild)
+INDEX_VERSION = 3
+
+# Journals shorter than this are never compacted (small corpora)
+MIN_COMPACT_ENTRIES = 64
+
+
+def _write_npz(path: Path, **arrays):
+    tmp_path = path.with_name(path.stem + ".tmp.npz")
+    np.savez(tmp_path, **arrays)
+    tmp_path.replace(path)
+
+
+def _write_json(path: Path, data):
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    tmp_path.replace(path)
+
+
+class CorpusIndex:
+    def __init__(self, index_dir=INDEX_DIR, stop_lang: str = "english", spacy_model: str = "en_core_web_sm"):
+        self.index_dir = Path(index_dir)
+        self.docs_dir = self.index_dir / "docs"
+        self.docs_dir.mkdir(parents=True, exist_ok=True)
+        self.stop_lang = stop_lang
+        self.spacy_model = spacy_model
+        self._lock = threading.RLock()
+
+        self.documents: Dict[str, dict] = {}
+        self.vocab: List[str] = []
+        self.term_ids: Dict[str, int] = {}
+        # Frequency buffers grow by doubling; tf/df are views of the used part
+        self._tf = np.zeros(0, dtype=np.int64)
+        self._df = np.zeros(0, dtype=np.int64)
+        # Unigrams and bigrams of the stopword-filtered tokens: the merged table
+        # plus per-document parts (+1 added, -1 removed) not yet merged into it
+        self._ngram_table = NgramCounts.empty()
+        self._ngram_parts: List[NgramCounts] = []
+        self._ngram_signs: List[int] = []
+        # doc_id -> (term_ids, counts), filled as documents are added or first queried
+        self._doc_terms: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Last journal entry applied, and entries since the snapshot
+        self._seq = 0
+        self._journal_entries = 0
+        self._load()
+
+    @property
+    def tf(self) -> np.ndarray:
+        return self._tf[: len(self.vocab)]
+
+    @property
+    def df(self) -> np.ndarray:
+        return self._df[: len(self.vocab)]
+
+    @property
+    def ngrams(self) -> NgramCounts:
+        """Corpus n-gram table. Pending document tables are merged here, once per query batch."""
+        with self._lock:
+            if self._ngram_parts:
+                self._ngram_table = NgramCounts.merge_all(
+                    [self._ngram_table, *self._ngram_parts], signs=[1, *self._ngram_signs]
+                )
+                self._ngram_parts, self._ngram_signs = [], []
+            return self._ngram_table
+
+    # ---------------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------------
+
+    @property
+    def _snapshot_path(self) -> Path:
+        return self.index_dir / "snapshot.npz"
+
+    @property
+    def _journal_path(self) -> Path:
+        return self.index_dir / "journal.jsonl"
+
+    def _clear_files(self):
+        for path in [*self.index_dir.glob("*.*"), *self.docs_dir.iterdir()]:
+            if path.is_file():
+                path.unlink()
+
+    def _load(self):
+        vocab_path = self.index_dir / "vocab.txt"
+        if vocab_path.exists():
+            with open(vocab_path, "r", encoding="utf-8") as f:
+                self.vocab = f.read().split("\n")[:-1]
+            self.term_ids = {term: i for i, term in enumerate(self.vocab)}
+
+        if self._snapshot_path.exists():
+            with np.load(self._snapshot_path) as snapshot:
+                meta = json.loads(str(snapshot["meta"]))
+                compatible = meta.get("version") == INDEX_VERSION and meta.get("stop_lang") == self.stop_lang
+                if compatible:
+                    self._tf, self._df = snapshot["tf"], snapshot["df"]
+                    self._ngram_table = NgramCounts.from_arrays(snapshot, prefix="ngram_")
+            # Reset only once the snapshot is closed (an open file cannot be deleted on Windows)
+            if not compatible:
+                logger.warning(f"Corpus index at {self.index_dir} has different settings; rebuilding from scratch")
+                self._reset()
+                return
+            self.documents = meta["documents"]
+            self._seq = meta["seq"]
+        elif (self.index_dir / "manifest.json").exists():
+            logger.warning(f"Corpus index at {self.index_dir} uses an older format; rebuilding from scratch")
+            self._reset()
+            return
+        # Terms appended by updates after the snapshot
+        self._grow()
+
+        replayed = 0
+        for entry in self._read_journal():
+            if entry["seq"] <= self._seq:
+                continue  # already folded into the snapshot
+            if entry["op"] == "add":
+                self._apply(entry["key"], entry["meta"], self._load_doc(entry["meta"]["doc_id"]))
+            elif entry["key"] in self.documents:
+                self._unapply(entry["key"])
+            self._seq = entry["seq"]
+            replayed += 1
+        self._journal_entries = replayed
+        if self.documents:
+            logger.info(
+                f"Corpus index loaded: {len(self.documents)} documents, {len(self.vocab)} terms "
+                f"({replayed} journal entries)"
+            )
+
+    def _reset(self):
+        self._clear_files()
+        self.documents, self.vocab, self.term_ids = {}, [], {}
+        self._tf = np.zeros(0, dtype=np.int64)
+        self._df = np.zeros(0, dtype=np.int64)
+        self._ngram_table = NgramCounts.empty()
+        self._ngram_parts, self._ngram_signs = [], []
+        self._doc_terms = {}
+        self._seq = self._journal_entries = 0
+
+    def _read_journal(self) -> List[dict]:
+        if not self._journal_path.exists():
+            return []
+        entries = []
+        with open(self._journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A line cut short by an interrupted write: the update never completed
+                    logger.warning(f"Ignoring incomplete corpus journal entry in {self._journal_path}")
+                    break
+        return entries
+
+    def _save(self, entries: List[dict], new_terms: List[str]):
+        """Persist one batch of updates: new vocabulary lines, then the journal entries."""
+        if new_terms:
+            with open(self.index_dir / "vocab.txt", "a", encoding="utf-8") as f:
+                f.write("".join(term + "\n" for term in new_terms))
+        if entries:
+            # The journal line is what marks an update as complete
+            with open(self._journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+            self._journal_entries += len(entries)
+        if self._journal_entries >= max(MIN_COMPACT_ENTRIES, len(self.documents)):
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into a new snapshot and delete files of removed documents."""
+        with self._lock:
+            meta = {
+                "version": INDEX_VERSION,
+                "stop_lang": self.stop_lang,
+                "seq": self._seq,
+                "documents": self.documents,
+            }
+            _write_npz(
+                self._snapshot_path,
+                meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                tf=self.tf,
+                df=self.df,
+                **self.ngrams.to_arrays(prefix="ngram_"),
+            )
+            # Entries up to seq are in the snapshot; if the journal outlives a crash here,
+            # loading skips them by seq
+            self._journal_path.unlink(missing_ok=True)
+            self._journal_entries = 0
+
+            live = {meta["doc_id"] for meta in self.documents.values()}
+            for path in self.docs_dir.iterdir():
+                if path.name.split(".")[0] not in live:
+                    path.unlink(missing_ok=True)
+        logger.info(f"Corpus index compacted: {len(self.documents)} documents")
+
+    def _doc_path(self, doc_id: str, suffix: str = ".npz") -> Path:
+        return self.docs_dir / f"{doc_id}{suffix}"
+
+    def _load_doc(self, doc_id: str) -> dict:
+        with np.load(self._doc_path(doc_id)) as stored:
+            return dict(stored)
+
+    def _doc_counts(self, doc_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Term ids and counts of a document, read from disk once."""
+        if doc_id not in self._doc_terms:
+            stored = self._load_doc(doc_id)
+            self._doc_terms[doc_id] = (stored["term_ids"], stored["counts"])
+        return self._doc_terms[doc_id]
+
+    # ---------------------------------------------------------------
+    # Updates
+    # ---------------------------------------------------------------
+
+    def _ids(self, terms, new_terms: List[str]) -> np.ndarray:
+        ids = []
+        for term in terms:
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                term_id = self.term_ids[term] = len(self.vocab)
+                self.vocab.append(term)
+                new_terms.append(term)
+            ids.append(term_id)
+        return np.array(ids, dtype=np.int32)
+
+    def _grow(self):
+        if len(self.vocab) > len(self._tf):
+            capacity = max(len(self.vocab), 2 * len(self._tf), 1024)
+            for name in ("_tf", "_df"):
+                grown = np.zeros(capacity, dtype=np.int64)
+                old = getattr(self, name)
+                grown[: len(old)] = old
+                setattr(self, name, grown)
+
+    def _apply(self, key: str, meta: dict, stored: dict):
+        """Add a stored document's counts to the corpus totals (in memory)."""
+        self._grow()
+        np.add.at(self._tf, stored["term_ids"], stored["counts"])
+        np.add.at(self._df, stored["term_ids"], 1)
+        self._ngram_parts.append(NgramCounts.from_arrays(stored, prefix="ngram_"))
+        self._ngram_signs.append(1)
+        self._doc_terms[meta["doc_id"]] = (stored["term_ids"], stored["counts"])
+        self.documents[key] = meta
+
+    def _unapply(self, key: str):
+        """Subtract a document's counts from the corpus totals (in memory; its files stay until compaction)."""
+        meta = self.documents.pop(key)
+        stored = self._load_doc(meta["doc_id"])
+        self._doc_terms.pop(meta["doc_id"], None)
+        np.subtract.at(self._tf, stored["term_ids"], stored["counts"])
+        np.subtract.at(self._df, stored["term_ids"], 1)
+        self._ngram_parts.append(NgramCounts.from_arrays(stored, prefix="ngram_"))
+        self._ngram_signs.append(-1)
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _add(self, key: str, text: str, name: str, source: Optional[Path], new_terms: List[str]) -> List[dict]:
+        """Index one document in memory and write its files; returns its journal entries."""
+        raw_tokens = clean_tokens(text)
+        sw = stopword_set(self.stop_lang)
+        filtered = [w for w in raw_tokens if w not in sw]
+        stats = corpus_sentence_word_stats([text], [Path(name)]).iloc[0]
+        try:
+            tags = tag_sentences_who_why([text], spacy_model=self.spacy_model).to_dict("records")
+        except Exception as e:
+            logger.warning(f"Sentence tagging skipped for {name}: {e}")
+            tags = None
+
+        entries = []
+        if key in self.documents:
+            self._unapply(key)
+            entries.append({"seq": self._next_seq(), "op": "remove", "key": key})
+
+        term_counts = Counter(raw_tokens)
+        term_ids = self._ids(term_counts.keys(), new_terms)
+        stored = {
+            "term_ids": term_ids,
+            "counts": np.fromiter(term_counts.values(), dtype=np.int64, count=len(term_counts)),
+            **NgramCounts.from_tokens(filtered).to_arrays(prefix="ngram_"),
+        }
+        # A fresh id per version: a replaced version's files are still needed to replay the journal
+        doc_id = uuid.uuid4().hex[:16]
+        _write_npz(self._doc_path(doc_id), **stored)
+        if tags is not None:
+            _write_json(self._doc_path(doc_id, ".tags.json"), tags)
+
+        meta = {
+            "doc_id": doc_id,
+            "name": name,
+            "sentences": int(stats["Sentences"]),
+            "words": int(stats["Words"]),
+            "tokens": len(raw_tokens),
+        }
+        if source is not None:
+            stat = Path(source).stat()
+            meta.update({"path": str(source), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+        self._apply(key, meta, stored)
+        entries.append({"seq": self._next_seq(), "op": "add", "key": key, "meta": meta})
+        logger.info(f"Corpus index: added {name} ({len(raw_tokens)} tokens)")
+        return entries
+
+    def add_document(self, key: str, text: str, name: Optional[str] = None, source: Optional[Path] = None):
+        """
+        Add (or replace) one document.
+
+        Args:
+            key: Stable identifier, e.g. a file path or "transcript:<analysis_id>".
+            text: Document text.
+            name: Label used in the outputs (defaults to key).
+            source: File the text was read from; its size/mtime are recorded so
+                sync_directory can skip unchanged files.
+        """
+        with self._lock:
+            new_terms: List[str] = []
+            entries = self._add(key, text, name or key, source, new_terms)
+            self._save(entries, new_terms)
+
+    def remove_document(self, key: str) -> bool:
+        with self._lock:
+            if key not in self.documents:
+                return False
+            self._unapply(key)
+            self._save([{"seq": self._next_seq(), "op": "remove", "key": key}], [])
+        return True
+
+    def sync_directory(self, data_dir, pattern: str = "*.txt") -> Dict[str, int]:
+        """
+        Bring the index in line with the files under data_dir: new or changed
+        files (by size/mtime) are (re)indexed, deleted files are removed.
+        Unchanged files are not read. All changes are saved in one batch.
+        """
+        data_dir = Path(data_dir)
+        files = {str(path.resolve()): path for path in sorted(data_dir.rglob(pattern))}
+        summary = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        with self._lock:
+            entries: List[dict] = []
+            new_terms: List[str] = []
+            for key, meta in list(self.documents.items()):
+                path = meta.get("path")
+                if path and key not in files and Path(path).resolve().is_relative_to(data_dir.resolve()):
+                    self._unapply(key)
+                    entries.append({"seq": self._next_seq(), "op": "remove", "key": key})
+                    summary["removed"] += 1
+
+            for key, path in files.items():
+                meta = self.documents.get(key)
+                stat = path.stat()
+                if meta and meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+                    summary["unchanged"] += 1
+                    continue
+                text = path.read_text(encoding="utf-8", errors="ignore")
+                entries.extend(self._add(key, text, path.name, path, new_terms))
+                summary["updated" if meta else "added"] += 1
+
+            self._save(entries, new_terms)
+
+        logger.info(f"Corpus index synced with {data_dir}: {summary}")
+        return summary
+
+    # ---------------------------------------------------------------
+    # Queries (QuantitativeAnalysis outputs)
+    # ---------------------------------------------------------------
+
+    def stats_df(self) -> pd.DataFrame:
+        with self._lock:
+            rows = [
+                {"Document": meta["name"], "Sentences": meta["sentences"], "Words": meta["words"]}
+                for meta in self.documents.values()
+            ]
+        return pd.DataFrame(rows, columns=["Document", "Sentences", "Words"])
+
+    def token_info(self) -> dict:
+        """
+        Lexical statistics as in build_token_stream. The token lists are not
+        materialized; "token_count" and "type_count" stand in for them.
+        """
+        with self._lock:
+            present = np.flatnonzero(self.tf)
+            token_count = int(self.tf.sum())
+            ngrams = self.ngrams
+            freq_dist = Counter(dict(zip(ngrams.terms.tolist(), ngrams.unigram_counts.tolist())))
+        return {
+            "token_count": token_count,
+            "type_count": len(present),
+            "ttr": len(present) / token_count if token_count else 0.0,
+            "freq_dist": freq_dist,
+        }
+
+    def tfidf_top_terms(self, max_features: int = 1000, top_n: int = 10) -> pd.DataFrame:
+        """
+        Top TF-IDF terms per document, computed from the stored counts
+        (English stopwords removed, vocabulary capped at the max_features
+        most frequent terms, smoothed IDF and L2 norm as in TfidfVectorizer).
+        """
+        from scipy.sparse import csr_matrix
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfTransformer
+
+        with self._lock:
+            candidates = np.array([
+                i for i in np.flatnonzero(self.df).tolist()
+                if len(self.vocab[i]) > 1 and self.vocab[i] not in ENGLISH_STOP_WORDS
+            ], dtype=np.int64)
+            if len(candidates) == 0:
+                return pd.DataFrame(columns=["Document", "TopTerms"])
+            # Highest corpus frequency first; ties alphabetically
+            order = sorted(candidates.tolist(), key=lambda i: (-self.tf[i], self.vocab[i]))[:max_features]
+            selected = np.array(sorted(order, key=lambda i: self.vocab[i]), dtype=np.int64)
+            column = np.full(len(self.vocab), -1, dtype=np.int64)
+            column[selected] = np.arange(len(selected))
+
+            names, indptr, indices, data = [], [0], [], []
+            for meta in self.documents.values():
+                term_ids, term_counts = self._doc_counts(meta["doc_id"])
+                cols = column[term_ids]
+                keep = cols >= 0
+                indices.append(cols[keep])
+                data.append(term_counts[keep])
+                indptr.append(indptr[-1] + int(keep.sum()))
+                names.append(meta["name"])
+            feature_names = np.array([self.vocab[i] for i in selected], dtype=object)
+
+        counts = csr_matrix(
+            (np.concatenate(data), np.concatenate(indices), np.array(indptr)),
+            shape=(len(names), len(selected)),
+        )
+        counts.sort_indices()
+        tfidf = TfidfTransformer().fit_transform(counts)
+        return top_terms_per_row(tfidf, feature_names, names, top_n=top_n)
+
+    def bigram_collocations(self, min_freq: int = 5, top_n: int = 50, measure: str = "pmi") -> List[tuple]:
+        """Top bigrams over the whole corpus (same ranking as compute_bigram_collocations)."""
+        with self._lock:
+            return self.ngrams.nbest(measure, top_n, min_freq=min_freq)
+
+    def sentence_tags(self) -> pd.DataFrame:
+        records = []
+        with self._lock:
+            for meta in self.documents.values():
+                path = self._doc_path(meta["doc_id"], ".tags.json")
+                if path.exists():
+                    with open(path, "r", encoding="utf-8") as f:
+                        records.extend(json.load(f))
+        return pd.DataFrame(records, columns=["sentence", "WHO", "WHY"])
+
+
+_shared: Dict[str, CorpusIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_corpus_index(index_dir=INDEX_DIR) -> CorpusIndex:
+    """Process-wide CorpusIndex per directory (loaded once)."""
+    key = str(Path(index_dir).resolve())
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = CorpusIndex(index_dir)
+        return _shared[key]
@@ -0,0 +1,132 @@
+"""
+Extractive Summary
+------------------
+Handles:
+ - Splitting transcript segments into sentences that keep the segment's
+   start/end timestamps (and speaker)
+ - Ranking sentences with TextRank or by similarity to the corpus centroid,
+   over sparse TF-IDF sentence vectors
+ - Returning the top sentences in chronological order as timestamped key
+   sentences plus a summary paragraph
+
+TextRank runs a power iteration on the cosine-similarity graph without
+building it: with L2-normalized TF-IDF rows X, the similarity matrix is
+X @ X.T (minus its diagonal), so each step costs two sparse products over
+the non-zeros of X instead of one operation per sentence pair.
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+METHODS = ("textrank", "centroid")
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in SENTENCE_BOUNDARY.split(text.strip()) if s]
+
+
+def segment_sentences(segments: Iterable[dict]) -> List[dict]:
+    """Sentences of every segment, each with the start/end/speaker of its segment."""
+    sentences = []
+    for seg in segments:
+        for text in split_sentences(seg.get("text", "")):
+            sentences.append({
+                "text": text,
+                "start": seg.get("start"),
+                "end": seg.get("end"),
+                "speaker": seg.get("speaker"),
+            })
+    return sentences
+
+
+def textrank_scores(X, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+    """
+    PageRank scores of the sentence graph weighted by cosine similarity.
+    X: sparse matrix with L2-normalized (or all-zero) rows.
+    """
+    n = X.shape[0]
+    Xt = X.T.tocsr()
+    self_similarity = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+
+    def similarity_times(v):
+        return X @ (Xt @ v) - self_similarity * v
+
+    degree = similarity_times(np.ones(n))
+    connected = degree > 1e-12
+    inv_degree = np.zeros(n)
+    inv_degree[connected] = 1.0 / degree[connected]
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        # Sentences without similar sentences spread their score uniformly
+        dangling = scores[~connected].sum() / n
+        new_scores = (1 - damping) / n + damping * (similarity_times(scores * inv_degree) + dangling)
+        if np.abs(new_scores - scores).sum() < tol:
+            return new_scores
+        scores = new_scores
+    return scores
+
+
+def centroid_scores(X) -> np.ndarray:
+    """Cosine similarity of each sentence to the mean TF-IDF vector."""
+    centroid = np.asarray(X.mean(axis=0)).ravel()
+    norm = np.linalg.norm(centroid)
+    if norm == 0:
+        return np.zeros(X.shape[0])
+    return X @ (centroid / norm)
+
+
+def extractive_summary(
+    segments: Iterable[dict],
+    num_sentences: int = 5,
+    method: str = "textrank",
+    stop_words: Optional[str] = "english",
+) -> dict:
+    """
+    Select the num_sentences most central sentences of a transcript.
+
+    Args:
+        segments: transcript segments (dicts with text, start, end, optional speaker)
+        num_sentences: number of key sentences to return
+        method: "textrank" or "centroid"
+        stop_words: stop word list for the TF-IDF vectorizer (None keeps all words)
+
+    Returns:
+        {"summary": key sentences joined in transcript order,
+         "key_sentences": [{"text", "start", "end", "speaker", "score"}, ...],
+         "method": method, "num_sentences": sentences considered}
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown extractive method: {method}. Available: {', '.join(METHODS)}")
+
+    sentences = segment_sentences(segments)
+    if len(sentences) <= num_sentences:
+        scores = np.ones(len(sentences))
+    else:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        try:
+            X = TfidfVectorizer(stop_words=stop_words, sublinear_tf=True).fit_transform(s["text"] for s in sentences)
+            scores = textrank_scores(X) if method == "textrank" else centroid_scores(X)
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words): keep the opening sentences
+            logger.warning("No content words for extractive summary; using leading sentences")
+            scores = -np.arange(len(sentences), dtype=float)
+
+    # Highest scores; ties go to the earlier sentence. Output in transcript order.
+    top = np.sort(np.lexsort((np.arange(len(sentences)), -scores))[:num_sentences])
+    key_sentences = [{**sentences[i], "score": round(float(scores[i]), 6)} for i in top]
+    return {
+        "summary": " ".join(s["text"] for s in key_sentences),
+        "key_sentences": key_sentences,
+        "method": method,
+        "num_sentences": len(sentences),
+    }
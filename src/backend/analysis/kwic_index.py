@@ -0,0 +1,249 @@
+"""
+KWIC Index
+----------
+Handles:
+ - A positional inverted index over transcripts (term -> document, token
+   position, segment) stored in an embedded SQLite database
+ - Adding, replacing and removing single transcripts, and syncing a
+   directory of *_transcript.json files by mtime
+ - Keyword-in-context queries returning left/right context windows with
+   the start/end timestamps (and speaker) of the matching segment
+
+Tables (outputs/kwic_index.sqlite3):
+    documents  doc_id, key, name, source mtime
+    segments   (doc_id, segment) -> start, end, speaker
+    tokens     (doc_id, pos) -> surface token, segment
+    postings   (term, doc_id, pos)    lowercased word tokens only
+
+A lookup is one range scan of `postings` for the term plus one range scan
+of `tokens` per hit, so its cost depends on the number of hits returned,
+not on the size of the corpus.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_PATH = Path("outputs/kwic_index.sqlite3")
+
+# Words (with inner apostrophes/hyphens) and single punctuation marks
+TOKEN_PATTERN = re.compile(r"\w+(?:['’-]\w+)*|[^\w\s]")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    name TEXT,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS segments (
+    doc_id INTEGER NOT NULL,
+    segment INTEGER NOT NULL,
+    start REAL,
+    end REAL,
+    speaker TEXT,
+    PRIMARY KEY (doc_id, segment)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tokens (
+    doc_id INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    token TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    PRIMARY KEY (doc_id, pos)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id, pos)
+) WITHOUT ROWID;
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text or "")
+
+
+def _join(tokens: List[str]) -> str:
+    # Re-attach punctuation to the preceding word for display
+    return re.sub(r" ([^\w\s])(?= |$)", r"\1", " ".join(tokens))
+
+
+class KwicIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # One connection shared by the API worker threads, serialized by _lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------------------------------------------------------------
+    # Updates
+    # ---------------------------------------------------------------
+
+    def _remove(self, key: str) -> bool:
+        row = self._conn.execute("SELECT doc_id FROM documents WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        for table in ("postings", "tokens", "segments", "documents"):
+            self._conn.execute(f"DELETE FROM {table} WHERE doc_id = ?", row)
+        return True
+
+    def add_transcript(
+        self,
+        key: str,
+        segments: Iterable[dict],
+        name: Optional[str] = None,
+        mtime_ns: Optional[int] = None,
+    ) -> int:
+        """
+        Index (or re-index) one transcript under `key`.
+
+        segments: dicts with "text" and optionally "start", "end", "speaker"
+        (the transcript["segments"] format). Returns the number of tokens.
+        """
+        segment_rows, token_rows, posting_rows = [], [], []
+        pos = 0
+        for i, seg in enumerate(segments):
+            segment_rows.append((i, seg.get("start"), seg.get("end"), seg.get("speaker")))
+            for token in tokenize(seg.get("text", "")):
+                token_rows.append((pos, token, i))
+                if token[0].isalnum() or token[0] == "_":
+                    posting_rows.append((token.lower(), pos))
+                pos += 1
+
+        with self._lock, self._conn:
+            self._remove(key)
+            doc_id = self._conn.execute(
+                "INSERT INTO documents (key, name, mtime_ns) VALUES (?, ?, ?)",
+                (key, name or key, mtime_ns),
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO segments VALUES (?, ?, ?, ?, ?)", [(doc_id, *row) for row in segment_rows]
+            )
+            self._conn.executemany(
+                "INSERT INTO tokens VALUES (?, ?, ?, ?)", [(doc_id, *row) for row in token_rows]
+            )
+            self._conn.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?)", [(term, doc_id, p) for term, p in posting_rows]
+            )
+        logger.info(f"KWIC index: {key} ({len(token_rows)} tokens, {len(segment_rows)} segments)")
+        return len(token_rows)
+
+    def add_text(self, key: str, text: str, name: Optional[str] = None) -> int:
+        """Index plain text as a single segment without timestamps."""
+        return self.add_transcript(key, [{"text": text}], name=name)
+
+    def remove(self, key: str) -> bool:
+        with self._lock, self._conn:
+            return self._remove(key)
+
+    def sync_transcripts(self, transcripts_dir, pattern: str = "*_transcript.json") -> Dict[str, int]:
+        """
+        Index transcript JSON files that are new or changed since the last
+        sync (by mtime), keyed "transcript:<analysis_id>".
+        """
+        summary = {"added": 0, "unchanged": 0}
+        with self._lock:
+            known = dict(self._conn.execute("SELECT key, mtime_ns FROM documents"))
+            for path in sorted(Path(transcripts_dir).glob(pattern)):
+                key = f"transcript:{path.name[: -len('_transcript.json')]}"
+                mtime_ns = path.stat().st_mtime_ns
+                if known.get(key) == mtime_ns:
+                    summary["unchanged"] += 1
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    transcript = json.load(f)
+                self.add_transcript(key, transcript.get("segments", []), name=path.name, mtime_ns=mtime_ns)
+                summary["added"] += 1
+        return summary
+
+    # ---------------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    def _term(keyword: str) -> str:
+        """Index term for a single-word query, tokenized like the indexed text."""
+        terms = tokenize(keyword)
+        if len(terms) != 1:
+            raise ValueError(f"KWIC queries take a single word, got: {keyword!r}")
+        return terms[0].lower()
+
+    def count(self, keyword: str) -> int:
+        """Total number of occurrences of a single word (case-insensitive)."""
+        term = self._term(keyword)
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()[0]
+
+    def kwic(self, keyword: str, window: int = 5, limit: int = 25, offset: int = 0) -> List[dict]:
+        """
+        Keyword-in-context lines for a single word (case-insensitive), in
+        document and position order.
+
+        Returns dicts with key, name, position, left, keyword, right, and the
+        segment, start, end and speaker of the matching token.
+        """
+        term = self._term(keyword)
+
+        with self._lock:
+            hits = self._conn.execute(
+                """
+                SELECT p.doc_id, p.pos, d.key, d.name, t.token, s.segment, s.start, s.end, s.speaker
+                FROM postings p
+                JOIN documents d ON d.doc_id = p.doc_id
+                JOIN tokens t ON t.doc_id = p.doc_id AND t.pos = p.pos
+                JOIN segments s ON s.doc_id = t.doc_id AND s.segment = t.segment
+                WHERE p.term = ?
+                ORDER BY p.doc_id, p.pos
+                LIMIT ? OFFSET ?
+                """,
+                (term, limit, offset),
+            ).fetchall()
+
+            lines = []
+            for doc_id, pos, key, name, token, segment, start, end, speaker in hits:
+                context = self._conn.execute(
+                    "SELECT pos, token FROM tokens WHERE doc_id = ? AND pos BETWEEN ? AND ? ORDER BY pos",
+                    (doc_id, pos - window, pos + window),
+                ).fetchall()
+                lines.append({
+                    "key": key,
+                    "name": name,
+                    "position": pos,
+                    "left": _join([t for p, t in context if p < pos]),
+                    "keyword": token,
+                    "right": _join([t for p, t in context if p > pos]),
+                    "segment": segment,
+                    "start": start,
+                    "end": end,
+                    "speaker": speaker,
+                })
+        return lines
+
+
+_shared: Dict[str, KwicIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_kwic_index(path=INDEX_PATH) -> KwicIndex:
+    """Process-wide KwicIndex per database file."""
+    key = str(Path(path).resolve())
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = KwicIndex(path)
+        return _shared[key]
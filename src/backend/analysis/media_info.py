@@ -0,0 +1,182 @@
+"""
+Media Info
+----------
+Handles:
+ - Probing a media file once with ffprobe (container, streams, fps, size)
+ - Persisting the result next to the file (<file>.mediainfo.json)
+ - An in-process cache so every stage reuses the same MediaInfo
+
+Cached entries are keyed by path and invalidated when the file's size or
+modification time changes.
+"""
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import ffmpeg
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIDECAR_SUFFIX = ".mediainfo.json"
+
+
+@dataclass
+class MediaInfo:
+    path: str
+    size_bytes: int
+    mtime_ns: int
+    duration: float = 0.0
+    format_name: str = "unknown"
+    has_video: bool = False
+    has_audio: bool = False
+    video_codec: str = "unknown"
+    audio_codec: str = "unknown"
+    fps: float = 0.0
+    width: int = 0
+    height: int = 0
+    frame_count: int = 0
+    sample_rate: int = 0
+    channels: int = 0
+    # Raw ffprobe output, for anything not covered above
+    probe: dict = field(default_factory=dict, repr=False)
+
+    def to_dict(self, include_probe: bool = False) -> dict:
+        data = asdict(self)
+        if not include_probe:
+            data.pop("probe")
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MediaInfo":
+        return cls(**{k: v for k, v in data.items() if k in cls.__dataclass_fields__})
+
+
+def _parse_rate(rate: Optional[str]) -> float:
+    """ffprobe frame rates look like "30000/1001"."""
+    if not rate:
+        return 0.0
+    num, _, den = rate.partition("/")
+    try:
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+def _rotation(stream: dict) -> int:
+    rotate = stream.get("tags", {}).get("rotate")
+    if rotate is None:
+        for side_data in stream.get("side_data_list", []):
+            if "rotation" in side_data:
+                rotate = side_data["rotation"]
+                break
+    try:
+        return int(float(rotate or 0)) % 360
+    except ValueError:
+        return 0
+
+
+def probe_media(media_path: str) -> MediaInfo:
+    """Run ffprobe once and build a MediaInfo. Raises ffmpeg.Error on failure."""
+    media_path = Path(media_path)
+    stat = media_path.stat()
+    probe = ffmpeg.probe(str(media_path))
+
+    format_info = probe.get("format", {})
+    streams = probe.get("streams", [])
+    video_streams = [s for s in streams if s.get("codec_type") == "video"]
+    audio_streams = [s for s in streams if s.get("codec_type") == "audio"]
+
+    info = MediaInfo(
+        path=str(media_path),
+        size_bytes=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        duration=float(format_info.get("duration", 0) or 0),
+        format_name=format_info.get("format_name", "unknown"),
+        has_video=bool(video_streams),
+        has_audio=bool(audio_streams),
+        probe=probe,
+    )
+
+    if video_streams:
+        video = video_streams[0]
+        info.video_codec = video.get("codec_name", "unknown")
+        info.fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+        info.width = int(video.get("width", 0))
+        info.height = int(video.get("height", 0))
+        # Decoders apply the rotation, so report the displayed frame size
+        if _rotation(video) in (90, 270):
+            info.width, info.height = info.height, info.width
+        info.frame_count = int(video.get("nb_frames", 0) or 0)
+        if not info.frame_count and info.fps and info.duration:
+            info.frame_count = int(round(info.fps * info.duration))
+
+    if audio_streams:
+        audio = audio_streams[0]
+        info.audio_codec = audio.get("codec_name", "unknown")
+        info.sample_rate = int(audio.get("sample_rate", 0) or 0)
+        info.channels = int(audio.get("channels", 0) or 0)
+
+    return info
+
+
+def sidecar_path(media_path: str) -> Path:
+    media_path = Path(media_path)
+    return media_path.with_name(media_path.name + SIDECAR_SUFFIX)
+
+
+_cache: Dict[str, MediaInfo] = {}
+_lock = threading.Lock()
+
+
+def _is_current(info: MediaInfo, stat: os.stat_result) -> bool:
+    return info.mtime_ns == stat.st_mtime_ns and info.size_bytes == stat.st_size
+
+
+def get_media_info(media_path: str, refresh: bool = False) -> MediaInfo:
+    """
+    Return the MediaInfo for a file, probing at most once per file version.
+
+    Lookup order: in-process cache, sidecar JSON next to the file, ffprobe
+    (whose result then fills both). Raises FileNotFoundError if the file is
+    missing and ffmpeg.Error if probing fails.
+    """
+    media_path = Path(media_path)
+    stat = media_path.stat()
+    key = str(media_path.resolve())
+
+    with _lock:
+        info = _cache.get(key)
+        if info is not None and not refresh and _is_current(info, stat):
+            return info
+
+        sidecar = sidecar_path(media_path)
+        info = None
+        if not refresh and sidecar.exists():
+            try:
+                with open(sidecar, "r", encoding="utf-8") as f:
+                    info = MediaInfo.from_dict(json.load(f))
+            except (OSError, json.JSONDecodeError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable media info {sidecar}: {e}")
+            if info is not None and not _is_current(info, stat):
+                info = None
+
+        if info is None:
+            info = probe_media(media_path)
+            try:
+                with open(sidecar, "w", encoding="utf-8") as f:
+                    json.dump(info.to_dict(include_probe=True), f, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not persist media info {sidecar}: {e}")
+            logger.info(
+                f"Media probed: {media_path.name} ({info.duration:.1f}s, "
+                f"{info.width}x{info.height} @ {info.fps:.2f} fps)"
+            )
+
+        _cache[key] = info
+        return info
@@ -0,0 +1,296 @@
+"""
+N-gram Counts
+-------------
+Handles:
+ - Unigram and bigram count tables over a sorted vocabulary (NgramCounts)
+ - Associative merging (and subtraction) of tables built per document or
+   per worker process
+ - Persistence as plain NumPy arrays (.npz)
+ - Vectorized bigram association measures (PMI, likelihood ratio, ...)
+   with the same formulas, frequency filter and tie order as NLTK's
+   BigramCollocationFinder / BigramAssocMeasures
+
+Bigrams are adjacent token pairs within one token sequence; merging tables
+never creates pairs across sequence boundaries.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# NLTK's guard against log(0) / division by zero
+_SMALL = 1e-20
+
+
+class NgramCounts:
+    """
+    Count tables over a sorted vocabulary.
+
+    Attributes:
+        terms: sorted array of unique terms (str)
+        unigram_counts: int64 count per term
+        bigram_ids: (n, 2) int64 term ids of each bigram, sorted lexicographically
+        bigram_counts: int64 count per bigram
+    """
+
+    def __init__(self, terms, unigram_counts, bigram_ids, bigram_counts):
+        self.terms = np.asarray(terms, dtype=str)
+        self.unigram_counts = np.asarray(unigram_counts, dtype=np.int64)
+        self.bigram_ids = np.asarray(bigram_ids, dtype=np.int64).reshape(-1, 2)
+        self.bigram_counts = np.asarray(bigram_counts, dtype=np.int64)
+
+    @classmethod
+    def empty(cls) -> "NgramCounts":
+        return cls([], [], np.zeros((0, 2)), [])
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str]) -> "NgramCounts":
+        """Count the unigrams and adjacent bigrams of one token sequence."""
+        return cls.from_sequences([tokens])
+
+    @classmethod
+    def from_sequences(cls, sequences: Iterable[Iterable[str]]) -> "NgramCounts":
+        """Count several token sequences (e.g. documents); no bigram spans two sequences."""
+        index = {}
+        id_arrays = []
+        for tokens in sequences:
+            id_arrays.append(np.array([index.setdefault(t, len(index)) for t in tokens], dtype=np.int64))
+        if not index:
+            return cls.empty()
+
+        # Renumber first-seen ids so that they follow the sorted vocabulary
+        terms = np.array(list(index), dtype=str)
+        order = np.argsort(terms)
+        rank = np.empty(len(terms), dtype=np.int64)
+        rank[order] = np.arange(len(terms))
+        size = len(terms)
+
+        ids = rank[np.concatenate(id_arrays)]
+        unigram_counts = np.bincount(ids, minlength=size)
+        keys = np.concatenate([rank[a[:-1]] * size + rank[a[1:]] for a in id_arrays])
+        keys, bigram_counts = np.unique(keys, return_counts=True)
+        return cls(terms[order], unigram_counts, _split_keys(keys, size), bigram_counts)
+
+    @property
+    def total(self) -> int:
+        """Number of tokens (NLTK's n_xx)."""
+        return int(self.unigram_counts.sum())
+
+    def __len__(self) -> int:
+        return len(self.bigram_counts)
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, NgramCounts)
+            and np.array_equal(self.terms, other.terms)
+            and np.array_equal(self.unigram_counts, other.unigram_counts)
+            and np.array_equal(self.bigram_ids, other.bigram_ids)
+            and np.array_equal(self.bigram_counts, other.bigram_counts)
+        )
+
+    # ---------------------------------------------------------------
+    # Merging
+    # ---------------------------------------------------------------
+
+    @classmethod
+    def merge_all(cls, parts: Iterable["NgramCounts"], signs: Optional[Iterable[int]] = None) -> "NgramCounts":
+        """
+        Sum any number of tables (associative and commutative). With signs,
+        parts with sign -1 are subtracted; entries whose count drops to zero
+        are removed.
+        """
+        parts = list(parts)
+        signs = list(signs) if signs is not None else [1] * len(parts)
+        used = [(p, s) for p, s in zip(parts, signs) if len(p.terms)]
+        if not used:
+            return cls.empty()
+
+        terms = np.unique(np.concatenate([p.terms for p, _ in used]))
+        size = len(terms)
+        unigram_counts = np.zeros(size, dtype=np.int64)
+        keys, counts = [], []
+        for part, sign in used:
+            remap = np.searchsorted(terms, part.terms)
+            unigram_counts[remap] += sign * part.unigram_counts
+            keys.append(remap[part.bigram_ids[:, 0]] * size + remap[part.bigram_ids[:, 1]])
+            counts.append(sign * part.bigram_counts)
+
+        keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        bigram_counts = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(bigram_counts, inverse, np.concatenate(counts))
+
+        merged = cls(terms, unigram_counts, _split_keys(keys, size), bigram_counts)
+        return merged._pruned() if any(s < 0 for _, s in used) else merged
+
+    def merge(self, *others: "NgramCounts") -> "NgramCounts":
+        return NgramCounts.merge_all([self, *others])
+
+    __add__ = merge
+
+    def subtract(self, other: "NgramCounts") -> "NgramCounts":
+        """Remove a previously merged table (e.g. a deleted document)."""
+        return NgramCounts.merge_all([self, other], signs=[1, -1])
+
+    __sub__ = subtract
+
+    def _pruned(self) -> "NgramCounts":
+        if (self.unigram_counts < 0).any() or (self.bigram_counts < 0).any():
+            raise ValueError("Subtracted n-gram counts that were never added")
+        keep_bigrams = self.bigram_counts > 0
+        keep_terms = self.unigram_counts > 0
+        new_ids = np.cumsum(keep_terms) - 1
+        return NgramCounts(
+            self.terms[keep_terms],
+            self.unigram_counts[keep_terms],
+            new_ids[self.bigram_ids[keep_bigrams]],
+            self.bigram_counts[keep_bigrams],
+        )
+
+    # ---------------------------------------------------------------
+    # Persistence
+    # ---------------------------------------------------------------
+
+    def to_arrays(self, prefix: str = "") -> dict:
+        return {
+            f"{prefix}terms": self.terms,
+            f"{prefix}unigram_counts": self.unigram_counts,
+            f"{prefix}bigram_ids": self.bigram_ids,
+            f"{prefix}bigram_counts": self.bigram_counts,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str = "") -> "NgramCounts":
+        return cls(
+            arrays[f"{prefix}terms"],
+            arrays[f"{prefix}unigram_counts"],
+            arrays[f"{prefix}bigram_ids"],
+            arrays[f"{prefix}bigram_counts"],
+        )
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.stem + ".tmp.npz")
+        np.savez(tmp_path, **self.to_arrays())
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "NgramCounts":
+        with np.load(path) as arrays:
+            return cls.from_arrays(arrays)
+
+    # ---------------------------------------------------------------
+    # Association measures
+    # ---------------------------------------------------------------
+
+    def scores(self, measure: str = "pmi", min_freq: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every bigram seen at least min_freq times.
+
+        Returns:
+            (bigram_ids, scores) for the bigrams that pass the filter.
+        """
+        if measure not in MEASURES:
+            raise ValueError(f"Unknown association measure: {measure}. Available: {', '.join(MEASURES)}")
+        keep = self.bigram_counts >= min_freq
+        ids = self.bigram_ids[keep]
+        n_ii = self.bigram_counts[keep].astype(np.float64)
+        n_ix = self.unigram_counts[ids[:, 0]]
+        n_xi = self.unigram_counts[ids[:, 1]]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return ids, MEASURES[measure](n_ii, n_ix, n_xi, self.total)
+
+    def nbest(self, measure: str = "pmi", n: int = 50, min_freq: int = 1) -> List[Tuple[str, str]]:
+        """
+        Top n bigrams by an association measure, highest first; ties in
+        lexicographic order (as BigramCollocationFinder.nbest after
+        apply_freq_filter(min_freq)).
+        """
+        ids, scores = self.scores(measure, min_freq)
+        valid = ~np.isnan(scores)
+        ids, scores = ids[valid], scores[valid]
+        # Term ids follow the sorted vocabulary, so id order is lexicographic
+        order = np.lexsort((ids[:, 1], ids[:, 0], -scores))[:n]
+        return [(str(self.terms[a]), str(self.terms[b])) for a, b in ids[order].tolist()]
+
+
+def _split_keys(keys: np.ndarray, size: int) -> np.ndarray:
+    return np.stack([keys // size, keys % size], axis=1) if size else np.zeros((0, 2), dtype=np.int64)
+
+
+# Vectorized BigramAssocMeasures: f(n_ii, n_ix, n_xi, n_xx)
+
+def _pmi(n_ii, n_ix, n_xi, n_xx):
+    return np.log2(n_ii * n_xx) - np.log2((n_ix * n_xi).astype(np.float64))
+
+
+def _contingency(n_ii, n_ix, n_xi, n_xx):
+    n_oi = n_xi - n_ii
+    n_io = n_ix - n_ii
+    return n_ii, n_oi, n_io, n_xx - n_ii - n_oi - n_io
+
+
+def _likelihood_ratio(n_ii, n_ix, n_xi, n_xx):
+    cont = _contingency(n_ii, n_ix, n_xi, n_xx)
+    total = 0.0
+    for i in range(4):
+        expected = (cont[i] + cont[i ^ 1]) * (cont[i] + cont[i ^ 2]) / n_xx
+        total = total + cont[i] * np.log(cont[i] / (expected + _SMALL) + _SMALL)
+    return 2 * total
+
+
+def _chi_sq(n_ii, n_ix, n_xi, n_xx):
+    n_ii, n_io, n_oi, n_oo = _contingency(n_ii, n_ix, n_xi, n_xx)
+    phi_sq = (n_ii * n_oo - n_io * n_oi) ** 2 / ((n_ii + n_io) * (n_ii + n_oi) * (n_io + n_oo) * (n_oi + n_oo))
+    return n_xx * phi_sq
+
+
+MEASURES = {
+    "pmi": _pmi,
+    "raw_freq": lambda n_ii, n_ix, n_xi, n_xx: n_ii / n_xx,
+    "student_t": lambda n_ii, n_ix, n_xi, n_xx: (n_ii - n_ix * n_xi / n_xx) / (n_ii + _SMALL) ** 0.5,
+    "chi_sq": _chi_sq,
+    "likelihood_ratio": _likelihood_ratio,
+    "dice": lambda n_ii, n_ix, n_xi, n_xx: 2 * n_ii / (n_ix + n_xi),
+}
+
+
+# ---------------------------------------------------------------
+# Parallel counting
+# ---------------------------------------------------------------
+
+def _count_chunk(tokenize: Callable[[str], List[str]], docs: List[str]) -> NgramCounts:
+    return NgramCounts.from_sequences(tokenize(doc) for doc in docs)
+
+
+def count_documents(
+    docs: Iterable[str],
+    tokenize: Callable[[str], List[str]],
+    workers: int = 1,
+    chunk_size: int = 256,
+) -> NgramCounts:
+    """
+    Count n-grams over many documents, optionally in worker processes.
+
+    Documents are tokenized and counted in chunks of chunk_size (bigrams
+    never span two documents); the per-chunk tables are merged once at the
+    end. tokenize must be
+    picklable (a module-level function or functools.partial of one).
+    """
+    docs = list(docs)
+    chunks = [docs[i: i + chunk_size] for i in range(0, len(docs), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        return NgramCounts.merge_all(_count_chunk(tokenize, chunk) for chunk in chunks)
+
+    logger.info(f"Counting n-grams in {len(docs)} documents with {workers} workers")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        parts = list(pool.map(_count_chunk, [tokenize] * len(chunks), chunks))
+    return NgramCounts.merge_all(parts)
@@ -0,0 +1,195 @@
+"""
+Audio Feature Track
+-------------------
+Handles:
+ - Windowed loudness / spectral curves over the decoded PCM buffer:
+     rms_db                RMS level in dBFS
+     loudness_lufs         momentary K-weighted loudness (ITU-R BS.1770 style)
+     spectral_centroid_hz  power-weighted mean frequency
+     zcr                   zero-crossing rate (crossings per sample)
+ - Integrated (gated) loudness for the whole file
+ - Storage as a raw float32 array (<stem>_features.f32) plus a JSON header
+   (<stem>_features.json) describing shape, columns and timing
+
+Frames are strided views over the buffer; all per-frame math is vectorized.
+K-weighting is applied as a gain on each frame's power spectrum rather than
+as a time-domain IIR filter, so no sample loop is needed.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.backend.analysis.audio_io import SAMPLE_RATE
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FEATURE_COLUMNS = ("rms_db", "loudness_lufs", "spectral_centroid_hz", "zcr")
+FEATURE_TRACK_VERSION = 1
+
+# BS.1770 momentary loudness: 400 ms windows, 75% overlap
+DEFAULT_FRAME_MS = 400
+DEFAULT_HOP_MS = 100
+
+
+def _biquad_response(b: tuple, a: tuple, freqs: np.ndarray, sample_rate: int) -> np.ndarray:
+    """|H|^2 of a biquad at the given frequencies."""
+    z = np.exp(-1j * 2 * np.pi * freqs / sample_rate)
+    num = b[0] + b[1] * z + b[2] * z ** 2
+    den = a[0] + a[1] * z + a[2] * z ** 2
+    return np.abs(num / den) ** 2
+
+
+def k_weighting(freqs: np.ndarray, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Power gain of the BS.1770 K-weighting filter (high shelf + RLB high-pass),
+    designed for the given sample rate (libebur128 parametrization, which
+    reproduces the reference 48 kHz coefficients).
+    """
+    # Stage 1: high shelf, +4 dB above ~1.7 kHz
+    f0, gain_db, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = np.tan(np.pi * f0 / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf_b = ((vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0)
+    shelf_a = (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+
+    # Stage 2: high-pass at ~38 Hz
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = np.tan(np.pi * f0 / sample_rate)
+    a0 = 1 + k / q + k * k
+    hp_b = (1.0, -2.0, 1.0)
+    hp_a = (1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0)
+
+    return _biquad_response(shelf_b, shelf_a, freqs, sample_rate) * _biquad_response(hp_b, hp_a, freqs, sample_rate)
+
+
+def compute_feature_track(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = DEFAULT_FRAME_MS,
+    hop_ms: int = DEFAULT_HOP_MS,
+    block_s: float = 60.0,
+) -> Tuple[np.ndarray, dict]:
+    """
+    Compute the feature track of a mono float32 PCM buffer.
+
+    Frames are processed in blocks of block_s seconds to bound memory.
+
+    Returns:
+        (features, header): float32 array of shape (n_frames, len(FEATURE_COLUMNS))
+        and the JSON-serializable header describing it.
+    """
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    n_fft = 1 << (frame_len - 1).bit_length()
+
+    window = np.hanning(frame_len).astype(np.float32)
+    window_power = float(np.sum(window ** 2))
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    # One-sided spectrum: every bin except DC (and Nyquist) stands for two
+    one_sided = np.full(len(freqs), 2.0)
+    one_sided[0] = 1.0
+    if n_fft % 2 == 0:
+        one_sided[-1] = 1.0
+    k_gain = (k_weighting(freqs, sample_rate) * one_sided / (n_fft * window_power)).astype(np.float32)
+
+    n_frames = max(0, (len(pcm) - frame_len) // hop + 1)
+    frames_per_block = max(1, int(block_s * sample_rate) // hop)
+    block_len = (frames_per_block - 1) * hop + frame_len
+
+    features = np.empty((n_frames, len(FEATURE_COLUMNS)), dtype=np.float32)
+    for first in range(0, n_frames, frames_per_block):
+        offset = first * hop
+        frames = sliding_window_view(pcm[offset: offset + block_len], frame_len)[::hop]
+        rows = slice(first, first + len(frames))
+
+        mean_square = np.mean(np.square(frames, dtype=np.float32), axis=1)
+        features[rows, 0] = 10 * np.log10(mean_square + 1e-10)
+
+        power = np.abs(np.fft.rfft(frames * window, n=n_fft, axis=1)) ** 2
+        # Parseval: K-weighted mean square straight from the power spectrum
+        features[rows, 1] = -0.691 + 10 * np.log10(power @ k_gain + 1e-10)
+        features[rows, 2] = (power @ freqs) / (np.sum(power, axis=1) + 1e-10)
+
+        signs = np.signbit(frames)
+        features[rows, 3] = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    header = {
+        "version": FEATURE_TRACK_VERSION,
+        "dtype": "float32",
+        "shape": list(features.shape),
+        "columns": list(FEATURE_COLUMNS),
+        "sample_rate": sample_rate,
+        "frame_s": frame_len / sample_rate,
+        "hop_s": hop / sample_rate,
+        # Frame i covers [i * hop_s, i * hop_s + frame_s)
+        "duration_s": round(len(pcm) / sample_rate, 3),
+        "integrated_lufs": integrated_loudness(features[:, 1]),
+        "created_at": datetime.now().isoformat(),
+    }
+    return features, header
+
+
+def integrated_loudness(momentary_lufs: np.ndarray) -> float:
+    """
+    Gated integrated loudness from momentary (400 ms) values:
+    absolute gate at -70 LUFS, then a relative gate 10 LU below.
+    Returns None for silent input.
+    """
+    def mean_lufs(values):
+        return -0.691 + 10 * np.log10(np.mean(10 ** ((values + 0.691) / 10)))
+
+    gated = momentary_lufs[momentary_lufs > -70.0]
+    if len(gated) == 0:
+        return None
+    gated = gated[gated > mean_lufs(gated) - 10.0]
+    return round(float(mean_lufs(gated)), 2)
+
+
+def save_feature_track(features: np.ndarray, header: dict, output_stem) -> Path:
+    """
+    Write <stem>_features.f32 (raw little-endian float32, row-major) and
+    <stem>_features.json. Returns the header path.
+    """
+    output_stem = Path(output_stem)
+    output_stem.parent.mkdir(parents=True, exist_ok=True)
+    data_path = output_stem.with_name(f"{output_stem.name}_features.f32")
+    header_path = output_stem.with_name(f"{output_stem.name}_features.json")
+
+    np.ascontiguousarray(features, dtype="<f4").tofile(data_path)
+    with open(header_path, "w", encoding="utf-8") as f:
+        json.dump({**header, "data_file": data_path.name}, f, indent=2)
+
+    logger.info(f"Audio feature track saved: {header_path} ({features.shape[0]} frames)")
+    return header_path
+
+
+def load_feature_track(header_path) -> Tuple[np.ndarray, dict]:
+    """Load a feature track written by save_feature_track (memory-mapped)."""
+    header_path = Path(header_path)
+    with open(header_path, "r", encoding="utf-8") as f:
+        header = json.load(f)
+    shape = tuple(header["shape"])
+    if shape[0] == 0:
+        return np.zeros(shape, dtype=np.float32), header
+    features = np.memmap(header_path.with_name(header["data_file"]), dtype="<f4", mode="r", shape=shape)
+    return features, header
+
+
+def run_audio_features(pcm: np.ndarray, output_stem, sample_rate: int = SAMPLE_RATE) -> dict:
+    """Pipeline stage: compute and persist the feature track for a PCM buffer."""
+    features, header = compute_feature_track(pcm, sample_rate)
+    header_path = save_feature_track(features, header, output_stem)
+    return {
+        "header_path": str(header_path),
+        "data_path": str(header_path.with_name(f"{Path(output_stem).name}_features.f32")),
+        "frames": header["shape"][0],
+        "integrated_lufs": header["integrated_lufs"],
+    }
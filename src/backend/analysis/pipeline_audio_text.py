@@ -4,14 +4,27 @@ Audio → Text Transcription Pipeline
 Handles:
  - Audio file validation and preprocessing
  - Transcription using OpenAI Whisper or compatible model
+   (selectable backend, e.g. faster-whisper INT8)
+ - Transcript cache lookup (decoded-audio hash + model + options) before any model load
+ - Optional music gating: music spans are skipped by Whisper and exported as a timeline
+ - Optional speaker labels per segment (CPU diarization, see pipeline_diarization)
  - Output structured transcript JSON (timestamps + text)
 """
 
-import os
-import json
-from datetime import datetime
 from pathlib import Path
-import whisper
+from src.backend.analysis.audio_io import decode_audio, load_wav
+from src.backend.analysis.pipeline_music_detection import (
+    classify_audio,
+    save_timeline,
+    spans_with_label,
+)
+from src.backend.analysis.pipeline_ingestion import (
+    transcribe_audio,
+    transcript_path_for,
+    save_transcript,
+)
+from src.backend.analysis.transcript_cache import TranscriptCache, audio_fingerprint
+from src.backend.analysis.transcription_backend import DEFAULT_BACKEND
 from src.backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,42 +33,143 @@ SUPPORTED_AUDIO_FORMATS = [".wav", ".mp3", ".m4a"]
 
 
 class AudioTranscriptionPipeline:
-    def __init__(self, audio_path: str, model_name: str = "base"):
+    def __init__(
+        self,
+        audio_path: str,
+        model_name: str = "base",
+        backend: str = None,
+        vad: bool = False,
+        workers: int = None,
+        pcm=None,
+        transcript_path: str = None,
+        use_cache: bool = True,
+        gate_music: bool = False,
+        diarize: bool = False,
+        num_speakers: int = None,
+    ):
+        """
+        Args:
+            audio_path (str): Audio file. When `pcm` is given it only names the
+                job and need not exist on disk.
+            pcm (numpy.ndarray): Already decoded 16 kHz float32 audio, passed
+                to the backend directly instead of re-reading the file.
+            transcript_path (str): Where to write the transcript artifact
+                (default: <audio_dir>/transcripts/<stem>_transcript.json).
+            use_cache (bool): Consult / fill the persistent transcript cache.
+            gate_music (bool): Classify speech / music / silence first, skip
+                music spans during transcription and write a music timeline
+                (<transcript stem>_music.json).
+            diarize (bool): Add a "speaker" label to every segment.
+            num_speakers (int): Known number of speakers (None = estimate).
+        """
         self.audio_path = Path(audio_path)
         self.model_name = model_name
+        self.backend = backend
+        # Speech-region chunking + parallel transcription (see pipeline_vad)
+        self.vad = vad
+        self.workers = workers
+        self.pcm = pcm
+        self.cache = TranscriptCache() if use_cache else None
+        self.gate_music = gate_music
+        self.music_spans = None
+        self.music_timeline_path = None
+        self.diarize = diarize
+        self.num_speakers = num_speakers
 
-        if not self.audio_path.exists():
+        if pcm is None and not self.audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {self.audio_path}")
         if self.audio_path.suffix.lower() not in SUPPORTED_AUDIO_FORMATS:
             raise ValueError(f"Unsupported audio format: {self.audio_path.suffix}")
 
-        self.output_dir = self.audio_path.parent / "transcripts"
-        self.output_dir.mkdir(exist_ok=True)
+        self.transcript_path = Path(transcript_path) if transcript_path else transcript_path_for(self.audio_path)
+        self.output_dir = self.transcript_path.parent
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def run(self) -> dict:
-        """Transcribe the audio file using Whisper model."""
-        logger.info(f"Starting transcription for: {self.audio_path}")
+    def run(self, transcript: dict = None, on_segment=None) -> dict:
+        """
+        Transcribe the audio file using Whisper model and persist the transcript.
 
-        model = whisper.load_model(self.model_name)
-        result = model.transcribe(str(self.audio_path), fp16=False)
+        Args:
+            transcript (dict): Transcript already produced by an earlier stage
+                (e.g. run_ingestion_pipeline). When given, Whisper is not run again.
+            on_segment: Optional callback receiving segments while transcription
+                runs (e.g. TranscriptStream.publish).
+        """
+        # The cache is checked first: a hit skips the spectral pass as well
+        if transcript is None and self.cache is not None:
+            transcript = self._cached_transcript(on_segment)
+
+        if transcript is None:
+            audio_spans = self._detect_music() if self.gate_music else None
+            logger.info(f"Starting transcription for: {self.audio_path}")
+            transcript = transcribe_audio(
+                str(self.audio_path), self.model_name, self.backend, self.vad, self.workers,
+                on_segment=on_segment, pcm=self.pcm, exclude=self.music_spans
+            )
+            if self.cache is not None:
+                # The music timeline is restored from the entry on a hit
+                entry = {**transcript, "audio_spans": audio_spans} if audio_spans is not None else transcript
+                self.cache.put(self._cache_key, entry)
+        else:
+            logger.info(f"Reusing existing transcript for: {self.audio_path}")
+
+        segments = transcript["segments"]
+        if self.diarize:
+            # Runs after the cache, so cached transcripts stay speaker-agnostic
+            from src.backend.analysis.pipeline_diarization import diarize_segments
+
+            segments = diarize_segments(self._load_pcm(), segments, num_speakers=self.num_speakers)
 
         transcript_data = {
             "audio_file": str(self.audio_path),
-            "language": result.get("language", "unknown"),
-            "segments": [
-                {
-                    "start": round(seg["start"], 2),
-                    "end": round(seg["end"], 2),
-                    "text": seg["text"].strip(),
-                }
-                for seg in result["segments"]
-            ],
-            "created_at": datetime.utcnow().isoformat(),
+            "language": transcript.get("language", "unknown"),
+            "segments": segments,
+            "created_at": transcript["created_at"],
         }
 
-        output_file = self.output_dir / f"{self.audio_path.stem}_transcript.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(transcript_data, f, indent=2, ensure_ascii=False)
-
-        logger.info(f"Transcription saved: {output_file}")
+        save_transcript(transcript_data, self.transcript_path)
         return transcript_data
+
+    def _load_pcm(self):
+        """Decode the audio once if no PCM was given; later stages reuse the buffer."""
+        if self.pcm is None:
+            is_wav = self.audio_path.suffix.lower() == ".wav"
+            self.pcm = load_wav(self.audio_path) if is_wav else decode_audio(self.audio_path)
+        return self.pcm
+
+    def _detect_music(self, spans=None):
+        """
+        Label speech / music / silence (unless spans are given, e.g. from the
+        cache) and export the music timeline. Returns the labelled spans.
+        """
+        if spans is None:
+            spans = classify_audio(self._load_pcm())
+        self.music_spans = spans_with_label(spans, "music")
+        stem = self.transcript_path.stem
+        self.music_timeline_path = save_timeline(spans, self.output_dir / f"{stem}_music.json")
+        return spans
+
+    def _cached_transcript(self, on_segment=None):
+        """
+        Look the audio up in the transcript cache (no model is loaded).
+        Decodes the audio first if no PCM was given, so the buffer is then
+        reused for transcription on a miss.
+        """
+        self._cache_key = self.cache.key(
+            audio_fingerprint(self._load_pcm()),
+            self.backend or DEFAULT_BACKEND,
+            self.model_name,
+            {"vad": self.vad, "gate_music": self.gate_music},
+        )
+        transcript = self.cache.get(self._cache_key)
+        if transcript is None:
+            return None
+
+        logger.info(f"Transcript cache hit for: {self.audio_path}")
+        if self.gate_music:
+            # Entries written before spans were cached still need the spectral pass
+            self._detect_music(transcript.get("audio_spans"))
+        if on_segment:
+            for seg in transcript["segments"]:
+                on_segment(seg)
+        return transcript
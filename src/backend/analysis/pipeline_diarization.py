@@ -0,0 +1,296 @@
+"""
+Speaker Turn Segmentation (Diarization)
+---------------------------------------
+Handles:
+ - MFCC features over the decoded 16 kHz PCM buffer (NumPy only)
+ - One embedding per short speech window inside transcript segments
+   (mean + standard deviation of the MFCCs)
+ - Agglomerative clustering of the windows into speakers; the speaker
+   count is estimated unless given
+ - Labelling every transcript segment with its majority speaker
+
+CPU only and lightweight: it separates clearly different voices (interviews,
+panels) but is no substitute for neural diarization on overlapping speech.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.cluster.hierarchy import fcluster, linkage
+
+from src.backend.analysis.audio_io import SAMPLE_RATE
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+N_MELS = 40
+N_MFCC = 20
+
+
+def _mel_filterbank(n_fft: int, sample_rate: int, n_mels: int = N_MELS) -> np.ndarray:
+    """Triangular mel filters, shape (n_mels, n_fft // 2 + 1)."""
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(20.0), hz_to_mel(sample_rate / 2), n_mels + 2))
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def _dct_matrix(n_in: int, n_out: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, shape (n_in, n_out)."""
+    n = np.arange(n_in)[:, None]
+    k = np.arange(n_out)[None, :]
+    basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+    basis[:, 0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+def mfcc(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 25,
+    hop_ms: int = 10,
+    n_mfcc: int = N_MFCC,
+    block_s: float = 60.0,
+) -> np.ndarray:
+    """
+    MFCCs (without c0) for every frame, shape (n_frames, n_mfcc - 1),
+    with cepstral mean normalization over the whole buffer.
+    """
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    n_fft = 1 << (frame_len - 1).bit_length()
+    window = np.hamming(frame_len).astype(np.float32)
+    mel = _mel_filterbank(n_fft, sample_rate)
+    dct = _dct_matrix(mel.shape[0], n_mfcc)
+
+    # Pre-emphasis boosts the formant region that carries speaker identity
+    emphasized = np.append(pcm[:1], pcm[1:] - 0.97 * pcm[:-1]).astype(np.float32)
+
+    n_frames = max(0, (len(emphasized) - frame_len) // hop + 1)
+    frames_per_block = max(1, int(block_s * sample_rate) // hop)
+    block_len = (frames_per_block - 1) * hop + frame_len
+
+    coeffs = np.empty((n_frames, n_mfcc - 1), dtype=np.float32)
+    for first in range(0, n_frames, frames_per_block):
+        frames = sliding_window_view(emphasized[first * hop: first * hop + block_len], frame_len)[::hop]
+        power = np.abs(np.fft.rfft(frames * window, n=n_fft, axis=1)) ** 2
+        log_mel = np.log(power @ mel.T + 1e-8)
+        coeffs[first: first + len(frames)] = (log_mel @ dct)[:, 1:]
+
+    if n_frames:
+        coeffs -= coeffs.mean(axis=0)
+    return coeffs
+
+
+def window_embeddings(
+    coeffs: np.ndarray,
+    segments: List[dict],
+    hop_s: float = 0.01,
+    window_s: float = 1.5,
+    step_s: float = 0.75,
+    min_window_s: float = 0.5,
+):
+    """
+    Embed speech windows inside the transcript segments.
+
+    Segments shorter than window_s form a single window. Returns
+    (embeddings, owners): (mean, std) MFCC vectors and, for each, the index
+    of the segment it belongs to.
+    """
+    # Cumulative sums give every window's mean / variance without a frame loop
+    padded = np.vstack([np.zeros((1, coeffs.shape[1]), dtype=np.float64), coeffs.astype(np.float64)])
+    csum = np.cumsum(padded, axis=0)
+    csum_sq = np.cumsum(padded ** 2, axis=0)
+
+    starts, ends, owners = [], [], []
+    for index, seg in enumerate(segments):
+        seg_start = int(seg["start"] / hop_s)
+        seg_end = min(int(seg["end"] / hop_s), len(coeffs))
+        if (seg_end - seg_start) * hop_s < min_window_s:
+            continue
+        window = int(window_s / hop_s)
+        if seg_end - seg_start <= window:
+            win_starts = np.array([seg_start])
+            win_ends = np.array([seg_end])
+        else:
+            win_starts = np.arange(seg_start, seg_end - window + 1, int(step_s / hop_s))
+            win_ends = win_starts + window
+        starts.append(win_starts)
+        ends.append(win_ends)
+        owners.append(np.full(len(win_starts), index))
+
+    if not starts:
+        return np.zeros((0, 2 * coeffs.shape[1]), dtype=np.float32), np.zeros(0, dtype=int)
+
+    starts, ends, owners = np.concatenate(starts), np.concatenate(ends), np.concatenate(owners)
+    counts = (ends - starts)[:, None]
+    mean = (csum[ends] - csum[starts]) / counts
+    std = np.sqrt(np.maximum((csum_sq[ends] - csum_sq[starts]) / counts - mean ** 2, 0.0))
+
+    return np.hstack([mean, std]).astype(np.float32), owners
+
+
+def _silhouette(distances: np.ndarray, labels: np.ndarray) -> float:
+    """Mean silhouette coefficient from a precomputed distance matrix."""
+    clusters = np.unique(labels)
+    if len(clusters) < 2:
+        return -1.0
+    # Mean distance from every point to each cluster (columns)
+    sizes = np.array([np.sum(labels == c) for c in clusters])
+    mean_to = np.stack([distances[:, labels == c].sum(axis=1) for c in clusters], axis=1)
+    own = np.searchsorted(clusters, labels)
+    own_size = sizes[own]
+    # Exclude the point itself from its own cluster's mean
+    a = mean_to[np.arange(len(labels)), own] / np.maximum(own_size - 1, 1)
+    mean_to = mean_to / sizes
+    mean_to[np.arange(len(labels)), own] = np.inf
+    b = mean_to.min(axis=1)
+    scores = np.where(own_size > 1, (b - a) / np.maximum(np.maximum(a, b), 1e-8), 0.0)
+    return float(scores.mean())
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    """Center on the file average and L2-normalize, for cosine distance."""
+    centered = embeddings - embeddings.mean(axis=0)
+    return centered / (np.linalg.norm(centered, axis=1, keepdims=True) + 1e-8)
+
+
+def _separation(raw: np.ndarray, labels: np.ndarray):
+    """
+    Pairwise cluster separation on the raw (mean, std) MFCC vectors:
+    squared centroid distance over the average within-cluster spread.
+    Returns (clusters, ratio matrix with inf on the diagonal).
+    """
+    clusters = np.unique(labels)
+    means = np.stack([raw[labels == c].mean(axis=0) for c in clusters])
+    spread = np.array([np.mean(np.sum((raw[labels == c] - m) ** 2, axis=1)) for c, m in zip(clusters, means)])
+    between = np.sum((means[:, None, :] - means[None, :, :]) ** 2, axis=2)
+    ratio = between / ((spread[:, None] + spread[None, :]) / 2 + 1e-8)
+    np.fill_diagonal(ratio, np.inf)
+    return clusters, ratio
+
+
+def _merge_close_clusters(raw: np.ndarray, labels: np.ndarray, min_separation: float) -> np.ndarray:
+    """Merge the least separated pair of clusters until all pairs exceed min_separation."""
+    labels = labels.copy()
+    while len(np.unique(labels)) > 1:
+        clusters, ratio = _separation(raw, labels)
+        i, j = np.unravel_index(np.argmin(ratio), ratio.shape)
+        if ratio[i, j] >= min_separation:
+            break
+        labels[labels == clusters[j]] = clusters[i]
+    return labels
+
+
+def cluster_speakers(
+    embeddings: np.ndarray,
+    num_speakers: Optional[int] = None,
+    max_speakers: int = 8,
+    min_silhouette: float = 0.5,
+    min_separation: float = 2.8,
+    min_cluster_share: float = 0.02,
+    max_windows: int = 3000,
+) -> np.ndarray:
+    """
+    Average-linkage clustering on cosine distance.
+
+    With num_speakers the tree is cut into exactly that many clusters.
+    Otherwise every cut from 2 to max_speakers is scored by silhouette and the
+    best one kept (below min_silhouette everything is one speaker), then
+    clusters whose raw-feature separation is below min_separation are merged,
+    so one voice saying different things is not split. Clusters holding less
+    than min_cluster_share of the windows (at least 3) are folded into the
+    nearest remaining one. Beyond max_windows the linkage runs on an evenly
+    spaced subset and the rest join the nearest cluster centroid.
+    Returns a cluster index per embedding.
+    """
+    if len(embeddings) < 2:
+        return np.zeros(len(embeddings), dtype=int)
+
+    normalized = _normalize(embeddings)
+    subset = np.linspace(0, len(embeddings) - 1, min(len(embeddings), max_windows)).astype(int)
+    sample = normalized[subset]
+    tree = linkage(sample, method="average", metric="cosine")
+
+    min_size = max(3, int(min_cluster_share * len(sample)))
+
+    if num_speakers:
+        labels = fcluster(tree, t=num_speakers, criterion="maxclust")
+    else:
+        distances = np.clip(1.0 - sample @ sample.T, 0.0, 2.0)
+        labels, best = np.ones(len(sample), dtype=int), min_silhouette
+        for k in range(2, min(max_speakers, len(sample) - 1) + 1):
+            candidate = _fold_small_clusters(sample, fcluster(tree, t=k, criterion="maxclust"), min_size)
+            score = _silhouette(distances, candidate)
+            if score > best:
+                labels, best = candidate, score
+        labels = _merge_close_clusters(embeddings[subset], labels, min_separation)
+
+    centroids = _centroids(sample, _fold_small_clusters(sample, labels, min_size))
+    return np.argmax(normalized @ centroids.T, axis=1)
+
+
+def _centroids(sample: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    centroids = np.stack([sample[labels == c].mean(axis=0) for c in np.unique(labels)])
+    return centroids / (np.linalg.norm(centroids, axis=1, keepdims=True) + 1e-8)
+
+
+def _fold_small_clusters(sample: np.ndarray, labels: np.ndarray, min_size: int) -> np.ndarray:
+    """Reassign members of clusters smaller than min_size to the nearest larger cluster."""
+    clusters, sizes = np.unique(labels, return_counts=True)
+    large = clusters[sizes >= min_size]
+    if len(large) == len(clusters):
+        return labels
+    if len(large) == 0:
+        return np.full_like(labels, clusters[np.argmax(sizes)])
+    kept = np.isin(labels, large)
+    centroids = _centroids(sample[kept], labels[kept])
+    return np.where(kept, labels, large[np.argmax(sample @ centroids.T, axis=1)])
+
+
+def diarize_segments(
+    pcm: np.ndarray,
+    segments: List[dict],
+    sample_rate: int = SAMPLE_RATE,
+    num_speakers: Optional[int] = None,
+) -> List[dict]:
+    """
+    Label transcript segments with speakers ("SPEAKER_00", "SPEAKER_01", ...
+    in order of first appearance).
+
+    Returns new segment dicts with a "speaker" key. Segments too short to
+    embed inherit the label of the previous segment.
+    """
+    if not segments:
+        return []
+
+    coeffs = mfcc(pcm, sample_rate)
+    embeddings, owners = window_embeddings(coeffs, segments)
+    clusters = cluster_speakers(embeddings, num_speakers)
+
+    # Majority vote of a segment's windows
+    n_clusters = int(clusters.max()) + 1 if len(clusters) else 0
+    votes = np.zeros((len(segments), max(n_clusters, 1)), dtype=int)
+    np.add.at(votes, (owners, clusters), 1)
+    has_votes = votes.sum(axis=1) > 0
+    segment_clusters = np.argmax(votes, axis=1)
+
+    names = {}
+    labelled = []
+    previous = None
+    for seg, cluster, voted in zip(segments, segment_clusters.tolist(), has_votes.tolist()):
+        if voted:
+            previous = names.setdefault(cluster, f"SPEAKER_{len(names):02d}")
+        labelled.append({**seg, "speaker": previous or "SPEAKER_00"})
+
+    logger.info(f"Diarization: {len(names) or 1} speakers over {len(segments)} segments")
+    return labelled
@@ -2,10 +2,18 @@
 Video/Audio Ingestion Pipeline
 ------------------------------
 Handles:
- - Video validation (format, duration, metadata)
+ - Video validation (format, duration, metadata) from the cached MediaInfo
  - Audio extraction (via FFmpeg)
  - Speech-to-text transcription (via Whisper)
  - Output structured transcript data (timestamps, text)
+
+Extraction, transcription and persistence are separate stages. The
+transcript is produced once and written to a single artifact
+(<audio_dir>/transcripts/<stem>_transcript.json) that later stages reuse.
+
+Audio is decoded once into an in-memory float32 PCM buffer that is handed
+straight to the transcription backend; the WAV file is only written when
+the caller wants to keep the audio.
 """
 
 import os
@@ -15,8 +23,14 @@ import json
 from datetime import datetime
 from pathlib import Path
 import ffmpeg
-import whisper
 
+import numpy as np
+
+from src.backend.analysis.media_info import MediaInfo, get_media_info
+from src.backend.analysis.audio_io import SAMPLE_RATE, decode_audio, load_wav, write_wav
+from src.backend.analysis.pipeline_music_detection import exclude_spans
+from src.backend.analysis.pipeline_vad import detect_speech_regions, transcribe_regions
+from src.backend.analysis.transcription_backend import get_transcription_backend
 from src.backend.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -30,9 +44,11 @@ class VideoIngestionError(Exception):
     pass
 
 
-def validate_video(video_path: str) -> dict:
+def validate_video(video_path: str, media_info: MediaInfo = None) -> dict:
     """
     Validate uploaded video file and extract metadata.
+    Uses the given MediaInfo, or the cached one for the file (probing only
+    if no stage has done so yet).
     """
     if not os.path.exists(video_path):
         raise VideoIngestionError(f"File not found: {video_path}")
@@ -41,25 +57,24 @@ def validate_video(video_path: str) -> dict:
     if ext not in SUPPORTED_VIDEO_FORMATS:
         raise VideoIngestionError(f"Unsupported video format: {ext}")
 
-    try:
-        probe = ffmpeg.probe(video_path)
-        format_info = probe.get("format", {})
-        duration = float(format_info.get("duration", 0))
-        size = int(format_info.get("size", 0))
-        video_streams = [s for s in probe["streams"] if s["codec_type"] == "video"]
-        audio_streams = [s for s in probe["streams"] if s["codec_type"] == "audio"]
-    except ffmpeg.Error as e:
-        raise VideoIngestionError(f"ffmpeg probe failed: {e.stderr.decode()}")
+    if media_info is None:
+        try:
+            media_info = get_media_info(video_path)
+        except ffmpeg.Error as e:
+            raise VideoIngestionError(f"ffmpeg probe failed: {e.stderr.decode()}")
 
-    if not audio_streams:
+    if not media_info.has_audio:
         raise VideoIngestionError("Video has no audio track.")
 
     return {
-        "duration": duration,
-        "size_bytes": size,
-        "video_codec": video_streams[0].get("codec_name", "unknown"),
-        "audio_codec": audio_streams[0].get("codec_name", "unknown"),
+        "duration": media_info.duration,
+        "size_bytes": media_info.size_bytes,
+        "video_codec": media_info.video_codec,
+        "audio_codec": media_info.audio_codec,
         "has_audio": True,
+        "fps": media_info.fps,
+        "width": media_info.width,
+        "height": media_info.height,
     }
 
 
@@ -90,29 +105,81 @@ def extract_audio(video_path: str, output_dir: str = None) -> str:
     return audio_path
 
 
-def transcribe_audio(audio_path: str, model_name: str = "base") -> dict:
+def extract_audio_pcm(video_path: str) -> np.ndarray:
+    """
+    Decode the audio track of a video into mono 16 kHz float32 PCM in memory.
+    """
+    try:
+        pcm = decode_audio(video_path)
+    except (RuntimeError, OSError) as e:
+        raise VideoIngestionError(f"FFmpeg extraction failed: {e}")
+
+    logger.info(f"Audio decoded in memory: {len(pcm) / SAMPLE_RATE:.1f}s")
+    return pcm
+
+
+def format_segment(seg: dict) -> dict:
+    """Normalize a raw backend segment for the transcript schema."""
+    return {
+        "start": round(seg["start"], 2),
+        "end": round(seg["end"], 2),
+        "text": seg["text"].strip(),
+    }
+
+
+def transcribe_audio(
+    audio_path: str,
+    model_name: str = "base",
+    backend: str = None,
+    vad: bool = False,
+    workers: int = None,
+    on_segment=None,
+    pcm: np.ndarray = None,
+    exclude: list = None,
+) -> dict:
     """
     Transcribe extracted audio into text using Whisper.
     Returns transcript as structured JSON with timestamps.
+
+    pcm: already decoded 16 kHz float32 audio; when given, audio_path is not read.
+    exclude: (start, end) spans never sent to the model, e.g. music detected by
+    pipeline_music_detection (implies vad).
+
+    backend selects the engine ("whisper" or "faster-whisper"), see
+    transcription_backend.get_transcription_backend.
+    With vad=True (WAV input), only detected speech regions are transcribed,
+    in parallel over `workers` processes, and timestamps are stitched back.
+    on_segment is called with each formatted segment as soon as it is available.
     """
-    if not os.path.exists(audio_path):
+    if pcm is None and not os.path.exists(audio_path):
         raise VideoIngestionError(f"Audio file not found: {audio_path}")
 
-    logger.info(f"Loading Whisper model: {model_name}")
-    model = whisper.load_model(model_name)
+    emit = None
+    if on_segment:
+        def emit(seg):
+            on_segment(format_segment(seg))
+
+    if vad or exclude:
+        if pcm is None:
+            is_wav = Path(audio_path).suffix.lower() == ".wav"
+            pcm = load_wav(audio_path) if is_wav else decode_audio(audio_path)
+        regions = detect_speech_regions(pcm)
+        if exclude:
+            regions = exclude_spans(regions, exclude)
+        speech_s = sum(end - start for start, end in regions)
+        logger.info(
+            f"VAD: {len(regions)} speech regions, {speech_s:.1f}s of "
+            f"{len(pcm) / SAMPLE_RATE:.1f}s audio"
+        )
+        result = transcribe_regions(pcm, regions, model_name, backend, workers, on_segment=emit)
+    else:
+        engine = get_transcription_backend(backend, model_name)
 
-    logger.info("Starting transcription...")
-    result = model.transcribe(audio_path, fp16=False)
+        logger.info(f"Starting transcription ({engine.name})...")
+        result = engine.transcribe(audio_path if pcm is None else pcm, on_segment=emit)
 
     transcript = {
-        "segments": [
-            {
-                "start": round(seg["start"], 2),
-                "end": round(seg["end"], 2),
-                "text": seg["text"].strip(),
-            }
-            for seg in result["segments"]
-        ],
+        "segments": [format_segment(seg) for seg in result["segments"]],
         "language": result.get("language", "unknown"),
         "created_at": datetime.utcnow().isoformat(),
     }
@@ -121,27 +188,88 @@ def transcribe_audio(audio_path: str, model_name: str = "base") -> dict:
     return transcript
 
 
-def run_ingestion_pipeline(video_path: str, model_name: str = "base") -> dict:
+def transcript_path_for(audio_path: str) -> Path:
+    """
+    Location of the transcript artifact belonging to an extracted audio file.
+    """
+    audio_path = Path(audio_path)
+    return audio_path.parent / "transcripts" / f"{audio_path.stem}_transcript.json"
+
+
+def save_transcript(transcript: dict, output_file) -> Path:
+    """
+    Persist a transcript as JSON.
+    Returns path to the written file.
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(transcript, f, indent=2, ensure_ascii=False)
+    logger.info(f"Transcript saved: {output_file}")
+    return output_file
+
+
+def run_ingestion_pipeline(
+    video_path: str,
+    model_name: str = "base",
+    transcribe: bool = True,
+    backend: str = None,
+    keep_audio: bool = True,
+    audio_output_path: str = None,
+    media_info: MediaInfo = None,
+) -> dict:
     """
     Orchestrates video ingestion process.
-    Returns dictionary with metadata, transcript, and audio path.
+    Returns dictionary with metadata, transcript, audio path, transcript path
+    and the decoded PCM buffer ("pcm").
+
+    With transcribe=False only validation and extraction run; transcription is
+    then left to AudioTranscriptionPipeline so Whisper runs exactly once.
+    The WAV is written to audio_output_path (default: a temp directory) only
+    when keep_audio is True; otherwise "audio_path" is None and no directory
+    is created. A transcript then goes next to audio_output_path, or next to
+    the video if no path was given.
+    media_info: MediaInfo from an earlier stage, so the file is not probed again.
     """
     logger.info(f"Starting ingestion pipeline for: {video_path}")
 
-    metadata = validate_video(video_path)
-    audio_path = extract_audio(video_path)
-    transcript = transcribe_audio(audio_path, model_name)
+    metadata = validate_video(video_path, media_info)
+    pcm = extract_audio_pcm(video_path)
+
+    audio_path = None
+    if keep_audio:
+        if audio_output_path is None:
+            audio_output_path = os.path.join(
+                tempfile.mkdtemp(prefix="vaa1_audio_"),
+                Path(video_path).stem + f".{AUDIO_OUTPUT_FORMAT}"
+            )
+        audio_path = write_wav(pcm, audio_output_path)
+        logger.info(f"Audio extracted: {audio_path}")
+
+    transcript = None
+    transcript_path = None
+    if transcribe:
+        transcript = transcribe_audio(audio_path, model_name, backend, pcm=pcm)
+        transcript_path = save_transcript(
+            {"audio_file": audio_path, **transcript}, transcript_path_for(audio_output_path or video_path)
+        )
 
     result = {
         "metadata": metadata,
         "transcript": transcript,
         "audio_path": audio_path,
+        "transcript_path": str(transcript_path) if transcript_path else None,
+        "pcm": pcm,
     }
 
-    # Save structured output
-    output_json = Path(audio_path).with_suffix(".json")
-    with open(output_json, "w", encoding="utf-8") as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
-    logger.info(f"Ingestion pipeline output saved: {output_json}")
+    # Save structured output (the transcript itself lives in its own artifact)
+    if audio_path:
+        output_json = Path(audio_path).with_suffix(".json")
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(
+                {k: v for k, v in result.items() if k not in ("transcript", "pcm")},
+                f, indent=2, ensure_ascii=False
+            )
+        logger.info(f"Ingestion pipeline output saved: {output_json}")
 
     return result
@@ -7,8 +7,10 @@ Video → Audio → Transcript → Summary → Frame Analysis
 
 import os
 from pathlib import Path
+from src.backend.analysis.media_info import get_media_info
 from src.backend.analysis.pipeline_ingestion import run_ingestion_pipeline
 from src.backend.analysis.pipeline_audio_text import AudioTranscriptionPipeline
+from src.backend.analysis.pipeline_audio_features import run_audio_features
 from src.backend.analysis.pipeline_summary import SummarizationPipeline
 from src.backend.analysis.pipeline_video_frames import FrameAnalysisPipeline
 from src.backend.utils.logger import get_logger
@@ -23,13 +25,19 @@ def run_full_pipeline(video_path: str):
 
     logger.info(f"=== Starting full analysis for: {video_path.name} ===")
 
+    # Probe once; every stage reuses the same MediaInfo
+    media_info = get_media_info(video_path)
+
     # Step 1 — Video → Audio extraction
-    ingestion_result = run_ingestion_pipeline(str(video_path))
+    ingestion_result = run_ingestion_pipeline(str(video_path), transcribe=False, media_info=media_info)
     audio_path = ingestion_result["audio_path"]
     logger.info(f"Audio extracted: {audio_path}")
 
-    # Step 2 — Audio → Transcript
-    audio_pipeline = AudioTranscriptionPipeline(audio_path)
+    # Loudness / spectral feature track next to the audio
+    audio_features = run_audio_features(ingestion_result["pcm"], Path(audio_path).with_suffix(""))
+
+    # Step 2 — Audio → Transcript (single Whisper run)
+    audio_pipeline = AudioTranscriptionPipeline(audio_path, pcm=ingestion_result["pcm"])
     transcript = audio_pipeline.run()
 
     # Step 3 — Transcript → Summary
@@ -37,14 +45,15 @@ def run_full_pipeline(video_path: str):
     summary = summary_pipeline.run()
 
     # Step 4 — Video → Visual detections
-    frame_pipeline = FrameAnalysisPipeline(str(video_path))
+    frame_pipeline = FrameAnalysisPipeline(str(video_path), media_info=media_info)
     frame_results = frame_pipeline.analyze(save_video=True, display=False)
 
     # Step 5 — Final summary report
     report = {
         "video": str(video_path),
         "audio": str(audio_path),
-        "transcript_file": audio_pipeline.output_dir / f"{audio_path.stem}_transcript.json",
+        "transcript_file": audio_pipeline.transcript_path,
+        "audio_features": audio_features["header_path"],
         "summary_file": summary_pipeline.output_dir,
         "frame_results": frame_results,
     }
@@ -1,6 +1,11 @@
 import spacy
 from typing import Dict, List
 
+from src.backend.utils.result_cache import ResultCache, get_result_cache, spacy_model_id
+
+# Bump when the result format or processing logic changes (invalidates cached results)
+NLP_CACHE_VERSION = 1
+
 
 class NLPProcessor:
     """
@@ -11,10 +16,12 @@ class NLPProcessor:
     - Named Entity Recognition (NER)
     """
 
-    def __init__(self, model_name: str = "en_core_web_sm"):
+    def __init__(self, model_name: str = "en_core_web_sm", cache: ResultCache = None):
         """
         Initialize spaCy model.
+        Results of process() are cached by cleaned text and model (see result_cache).
         """
+        self.cache = cache if cache is not None else get_result_cache()
         try:
             self.nlp = spacy.load(model_name)
         except OSError:
@@ -44,6 +51,11 @@ class NLPProcessor:
         """
 
         cleaned = self.clean_text(text)
+        return self.cache.get_or_compute(
+            "nlp", cleaned, lambda: self._process(cleaned), model=spacy_model_id(self.nlp), version=NLP_CACHE_VERSION
+        )
+
+    def _process(self, cleaned: str) -> Dict:
         document = self.nlp(cleaned)
 
         # Extract sentences
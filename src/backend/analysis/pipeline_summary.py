@@ -5,109 +5,243 @@ Takes transcript text as input and generates:
  - Concise summary (bullet or paragraph)
  - Key points or highlights
 Uses transformer-based summarization model or GPT-compatible endpoint.
+
+Long transcripts are split into chunks that fit the model's input window
+(measured in model tokens), summarized in one batched call, and the
+partial summaries are summarized again until a single summary remains.
+
+Engines: "transformer" (abstractive, the model above), "textrank" and
+"centroid" (extractive, see extractive_summary); "auto" uses the
+transformer when it is installed. Every engine also reports timestamped
+key sentences.
 """
 
 import os
 import json
+import importlib.util
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Sequence
+from src.backend.analysis.extractive_summary import extractive_summary, split_sentences
 from src.backend.utils.logger import get_logger
+from src.backend.utils.result_cache import ResultCache, get_result_cache
 
 logger = get_logger(__name__)
 
-# Check if transformers is available
-try:
+# Check if transformers is available (imported on first use; importing it is slow)
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec("transformers") is not None
+if not TRANSFORMERS_AVAILABLE:
+    logger.warning("Transformers library not available. Summarization will use extractive TextRank.")
+
+
+DEFAULT_MODEL = "facebook/bart-large-cnn"
+
+# Input window used when the tokenizer does not report one
+FALLBACK_MAX_TOKENS = 1024
+
+# Upper bound on summary-of-summaries rounds
+MAX_REDUCE_LEVELS = 4
+
+ENGINES = ("auto", "transformer", "textrank", "centroid")
+
+# Bump when the summary format or summarization logic changes (invalidates cached results)
+SUMMARY_CACHE_VERSION = 1
+
+
+@lru_cache(maxsize=2)
+def get_summarizer(model_name: str = DEFAULT_MODEL):
+    """Summarization pipeline per model, loaded once per process."""
     from transformers import pipeline
-    TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    logger.warning("Transformers library not available. Summarization will use basic extraction.")
+
+    logger.info(f"Initializing summarization model: {model_name}")
+    return pipeline("summarization", model=model_name)
+
+
+def pack_sentences(sentences: Sequence[str], lengths: Sequence[int], max_tokens: int) -> List[List[str]]:
+    """
+    Greedily group consecutive sentences so that each group's total length
+    stays within max_tokens. A sentence longer than max_tokens forms its own
+    group (the caller splits it).
+    """
+    groups, current, current_len = [], [], 0
+    for sentence, length in zip(sentences, lengths):
+        if current and current_len + length > max_tokens:
+            groups.append(current)
+            current, current_len = [], 0
+        current.append(sentence)
+        current_len += length
+    if current:
+        groups.append(current)
+    return groups
+
+
+def input_token_limit(tokenizer) -> int:
+    """Tokens available for text in one model input (window minus special tokens)."""
+    window = getattr(tokenizer, "model_max_length", None)
+    # Tokenizers without a configured limit report a huge sentinel value
+    if not window or window > 100_000:
+        window = FALLBACK_MAX_TOKENS
+    return window - tokenizer.num_special_tokens_to_add()
+
+
+def chunk_by_tokens(text: str, tokenizer, max_tokens: int) -> List[str]:
+    """Split text at sentence boundaries into chunks of at most max_tokens model tokens."""
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+    token_ids = tokenizer(sentences, add_special_tokens=False)["input_ids"]
+
+    pieces, lengths = [], []
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) <= max_tokens:
+            pieces.append(sentence)
+            lengths.append(len(ids))
+            continue
+        # A run-on "sentence" (e.g. unpunctuated speech): cut it by tokens
+        for i in range(0, len(ids), max_tokens):
+            window = ids[i: i + max_tokens]
+            pieces.append(tokenizer.decode(window, skip_special_tokens=True))
+            lengths.append(len(window))
+    return [" ".join(group) for group in pack_sentences(pieces, lengths, max_tokens)]
 
 
 class SummarizationPipeline:
-    def __init__(self, transcript_data: dict, model_name: str = "facebook/bart-large-cnn"):
+    def __init__(
+        self,
+        transcript_data: dict,
+        model_name: str = DEFAULT_MODEL,
+        batch_size: int = 4,
+        engine: str = "auto",
+        num_key_sentences: int = 5,
+        cache: ResultCache = None,
+    ):
         """
         Args:
             transcript_data (dict): Structured transcript (as produced by pipeline_audio_text).
             model_name (str): Hugging Face model for summarization.
+            batch_size (int): Chunks per forward pass in the batched summarizer call.
+            engine (str): "auto", "transformer", "textrank" or "centroid".
+            num_key_sentences (int): Number of timestamped key sentences to extract.
+            cache (ResultCache): Summary cache (default: the shared on-disk result cache).
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown summarization engine: {engine}. Available: {', '.join(ENGINES)}")
         self.transcript_data = transcript_data
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.engine = engine
+        self.num_key_sentences = num_key_sentences
+        self.cache = cache if cache is not None else get_result_cache()
         self.output_dir = Path("outputs/summaries")
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    def _resolve_engine(self) -> str:
+        if self.engine == "auto":
+            return "transformer" if TRANSFORMERS_AVAILABLE else "textrank"
+        if self.engine == "transformer" and not TRANSFORMERS_AVAILABLE:
+            logger.warning("Transformers not available. Using extractive TextRank summary.")
+            return "textrank"
+        return self.engine
+
     def run(self) -> dict:
-        """Generate summary and key points."""
-        # Combine transcript text
-        full_text = " ".join([seg["text"] for seg in self.transcript_data["segments"]])
-        full_text = full_text.strip().replace("\n", " ")
-        
-        if not TRANSFORMERS_AVAILABLE:
-            logger.warning("Transformers not available. Using basic text extraction.")
-            return self._basic_summary(full_text)
-        
-        if len(full_text.split()) < 50:
-            logger.warning("Transcript too short for summarization. Returning original text.")
-            summary_text = full_text
+        """Generate summary and key points (cached by transcript, engine, model and settings)."""
+        segments = self.transcript_data["segments"]
+        engine = self._resolve_engine()
+
+        cache_key = self.cache.key(
+            "summary",
+            json.dumps(
+                [[seg.get("start"), seg.get("end"), seg.get("speaker"), seg["text"]] for seg in segments],
+                ensure_ascii=False,
+            ),
+            model=self.model_name if engine == "transformer" else "",
+            version=SUMMARY_CACHE_VERSION,
+            params={"engine": engine, "num_key_sentences": self.num_key_sentences},
+        )
+        summary_data = self.cache.get(cache_key)
+        if summary_data is not None:
+            logger.info(f"Result cache hit: summary ({engine})")
         else:
-            try:
-                logger.info(f"Initializing summarization model: {self.model_name}")
-                summarizer = pipeline("summarization", model=self.model_name)
-                
-                # Split into manageable chunks for summarization (max tokens per request)
-                max_chunk = 1500
-                sentences = full_text.split(". ")
-                chunks, current_chunk = [], ""
-
-                for sentence in sentences:
-                    if len(current_chunk.split()) + len(sentence.split()) < max_chunk:
-                        current_chunk += sentence + ". "
-                    else:
-                        chunks.append(current_chunk.strip())
-                        current_chunk = sentence + ". "
-                chunks.append(current_chunk.strip())
-
-                logger.info(f"Summarizing {len(chunks)} text chunks...")
-                partial_summaries = []
-                for chunk in chunks:
-                    try:
-                        summary = summarizer(chunk, max_length=200, min_length=50, do_sample=False)
-                        partial_summaries.append(summary[0]["summary_text"].strip())
-                    except Exception as e:
-                        logger.error(f"Summarization failed on chunk: {e}")
-                        partial_summaries.append("")
-
-                summary_text = " ".join(partial_summaries)
-            except Exception as e:
-                logger.error(f"Summarization failed: {e}. Falling back to basic summary.")
-                summary_text = self._basic_summary(full_text)["summary"]
+            summary_data = self._summarize_transcript(segments, engine)
+            # A transformer run that fell back to the extractive summary is not cached
+            if engine != "transformer" or not summary_data["model"].startswith("extractive_"):
+                self.cache.put(cache_key, summary_data)
 
-        summary_data = {
-            "summary": summary_text.strip(),
-            "model": self.model_name if TRANSFORMERS_AVAILABLE else "basic_extraction",
-            "created_at": datetime.utcnow().isoformat(),
-            "num_segments": len(self.transcript_data.get("segments", [])),
-        }
+        # Stamped per run, so a cached summary does not carry the time it was first made
+        created_at = datetime.utcnow()
+        summary_data = {**summary_data, "created_at": created_at.isoformat()}
 
-        output_path = self.output_dir / f"summary_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+        output_path = self.output_dir / f"summary_{created_at.strftime('%Y%m%d_%H%M%S')}.json"
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(summary_data, f, indent=2, ensure_ascii=False)
 
         logger.info(f"Summary saved: {output_path}")
         return summary_data
 
-    def _basic_summary(self, text: str) -> dict:
-        """Fallback summary when transformers is not available"""
-        # Extract first few sentences as a basic summary
-        sentences = text.split('. ')
-        if len(sentences) > 3:
-            summary = '. '.join(sentences[:3]) + '.'
+    def _summarize_transcript(self, segments: List[dict], engine: str) -> dict:
+        # Combine transcript text
+        full_text = " ".join([seg["text"] for seg in segments])
+        full_text = full_text.strip().replace("\n", " ")
+
+        extractive = extractive_summary(
+            segments,
+            num_sentences=self.num_key_sentences,
+            method="centroid" if engine == "centroid" else "textrank",
+        )
+
+        num_chunks, reduce_levels = 0, 0
+        model = self.model_name
+        if engine != "transformer":
+            summary_text = extractive["summary"]
+            model = f"extractive_{engine}"
+        elif len(full_text.split()) < 50:
+            logger.warning("Transcript too short for summarization. Returning original text.")
+            summary_text = full_text
         else:
-            summary = text
-            
+            try:
+                summarizer = get_summarizer(self.model_name)
+                max_tokens = input_token_limit(summarizer.tokenizer)
+
+                # Map: summarize every chunk of the transcript
+                chunks = chunk_by_tokens(full_text, summarizer.tokenizer, max_tokens)
+                num_chunks = len(chunks)
+                logger.info(f"Summarizing {num_chunks} text chunks (up to {max_tokens} tokens each)...")
+                summaries = self._summarize(summarizer, chunks)
+
+                # Reduce: summarize the joined partial summaries until one is left
+                while len(summaries) > 1 and reduce_levels < MAX_REDUCE_LEVELS:
+                    chunks = chunk_by_tokens(" ".join(summaries), summarizer.tokenizer, max_tokens)
+                    if len(chunks) >= len(summaries):
+                        break
+                    reduce_levels += 1
+                    logger.info(f"Reduce level {reduce_levels}: {len(summaries)} summaries -> {len(chunks)} chunks")
+                    summaries = self._summarize(summarizer, chunks)
+
+                summary_text = " ".join(summaries)
+            except Exception as e:
+                logger.error(f"Summarization failed: {e}. Falling back to extractive summary.")
+                summary_text = extractive["summary"]
+                model = "extractive_textrank"
+
         return {
-            "summary": summary,
-            "model": "basic_extraction",
-            "created_at": datetime.utcnow().isoformat(),
-            "num_segments": len(self.transcript_data.get("segments", [])),
-        }
\ No newline at end of file
+            "summary": summary_text.strip(),
+            "model": model,
+            "engine": engine,
+            "num_segments": len(segments),
+            "num_chunks": num_chunks,
+            "reduce_levels": reduce_levels,
+            "key_sentences": extractive["key_sentences"],
+        }
+
+    def _summarize(self, summarizer, chunks: List[str]) -> List[str]:
+        """One batched summarizer call over all chunks."""
+        outputs = summarizer(
+            chunks,
+            max_length=200,
+            min_length=50,
+            do_sample=False,
+            truncation=True,
+            batch_size=self.batch_size,
+        )
+        return [out["summary_text"].strip() for out in outputs]
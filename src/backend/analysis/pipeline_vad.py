@@ -0,0 +1,270 @@
+"""
+Voice Activity Detection & Chunked Transcription
+------------------------------------------------
+Handles:
+ - Energy-based speech region detection on 16 kHz mono PCM
+ - Parallel transcription of speech regions across a shared process pool
+ - Stitching region segments back to absolute timestamps
+
+Silence (and long pauses) never reach the model, and independent regions
+are transcribed concurrently, one model instance per worker process. The
+pool is kept for the life of the process, so each worker loads the model
+once rather than once per job; short inputs are transcribed serially.
+"""
+
+import atexit
+import os
+import multiprocessing
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.backend.analysis.audio_io import SAMPLE_RATE
+from src.backend.analysis.transcription_backend import DEFAULT_BACKEND, get_transcription_backend
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Below this much speech, loading the model in every worker costs more than
+# the parallel decoding saves
+MIN_PARALLEL_SPEECH_S = float(os.environ.get("VAA1_MIN_PARALLEL_SPEECH_S", "60"))
+
+
+def default_workers() -> int:
+    """Number of transcription worker processes to use by default."""
+    return max(1, min(4, (os.cpu_count() or 1) // 2))
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start (inclusive) and end (exclusive) indices of True runs in a boolean mask."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def detect_speech_regions(
+    pcm: np.ndarray,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+    margin_db: float = 12.0,
+    floor_db: float = -50.0,
+    min_speech_ms: int = 250,
+    min_silence_ms: int = 600,
+    pad_ms: int = 200,
+    max_region_s: float = 30.0,
+) -> List[Tuple[float, float]]:
+    """
+    Split PCM audio into speech regions using frame energy.
+
+    A frame counts as speech when its energy exceeds both the estimated noise
+    floor (10th percentile of frame energies) + margin_db, capped at margin_db
+    below the 95th percentile, and floor_db (dBFS).
+    Pauses shorter than min_silence_ms are bridged, regions shorter than
+    min_speech_ms dropped, and the rest padded by pad_ms. Regions longer than
+    max_region_s are cut at their quietest frame so work can be spread over
+    workers.
+
+    Returns:
+        list of (start_seconds, end_seconds) tuples, in order.
+    """
+    frame_len = int(sample_rate * frame_ms / 1000)
+    n_frames = len(pcm) // frame_len
+    if n_frames == 0:
+        return []
+
+    frames = pcm[: n_frames * frame_len].reshape(n_frames, frame_len)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    noise_db, peak_db = np.percentile(energy_db, [10, 95])
+    threshold = max(min(noise_db + margin_db, peak_db - margin_db), floor_db)
+    starts, ends = _runs(energy_db > threshold)
+    if len(starts) == 0:
+        return []
+
+    # Bridge short pauses
+    min_silence = max(1, min_silence_ms // frame_ms)
+    keep = (starts[1:] - ends[:-1]) >= min_silence
+    starts = starts[np.concatenate(([True], keep))]
+    ends = ends[np.concatenate((keep, [True]))]
+
+    # Drop blips
+    long_enough = (ends - starts) >= max(1, min_speech_ms // frame_ms)
+    starts, ends = starts[long_enough], ends[long_enough]
+    if len(starts) == 0:
+        return []
+
+    # Pad and merge regions that now overlap
+    pad = pad_ms // frame_ms
+    starts = np.maximum(starts - pad, 0)
+    ends = np.minimum(ends + pad, n_frames)
+    keep = starts[1:] > ends[:-1]
+    starts = starts[np.concatenate(([True], keep))]
+    ends = ends[np.concatenate((keep, [True]))]
+
+    # Cut overly long regions at their quietest frame
+    max_frames = int(max_region_s * 1000 / frame_ms)
+    regions = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        while end - start > max_frames:
+            window = energy_db[start + max_frames // 2: start + max_frames]
+            cut = start + max_frames // 2 + int(np.argmin(window))
+            regions.append((start, cut))
+            start = cut
+        regions.append((start, end))
+
+    frame_s = frame_len / sample_rate
+    return [(round(s * frame_s, 3), round(e * frame_s, 3)) for s, e in regions]
+
+
+def offset_segments(segments: List[dict], offset: float, region_end: float = None) -> List[dict]:
+    """
+    Shift region-relative segment timestamps to absolute time.
+    With region_end, ends are clamped to it and segments starting at or
+    after it (e.g. hallucinated in trailing padding) are dropped, so no
+    segment ends before it starts.
+    """
+    shifted = []
+    for seg in segments:
+        start, end = seg["start"] + offset, seg["end"] + offset
+        if region_end is not None:
+            if start >= region_end:
+                continue
+            end = min(end, region_end)
+        shifted.append({"start": start, "end": end, "text": seg["text"]})
+    return shifted
+
+
+# Per-process backend used by pool workers
+_worker_backend = None
+
+
+def _init_worker(backend: str, model_name: str, threads: int):
+    global _worker_backend
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    options = {"cpu_threads": threads} if backend == "faster-whisper" else {}
+    _worker_backend = get_transcription_backend(backend, model_name, **options)
+
+
+def _transcribe_region(audio: np.ndarray, start: float, end: float) -> dict:
+    result = _worker_backend.transcribe(audio)
+    result["segments"] = offset_segments(result["segments"], start, end)
+    return result
+
+
+# Worker pool shared across jobs (workers keep their loaded model), keyed by
+# (backend, model_name, workers); a different key replaces it
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[Tuple] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(backend: str, model_name: str, workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_key
+    key = (backend, model_name, workers)
+    with _pool_lock:
+        if _pool is None or _pool_key != key:
+            if _pool is not None:
+                # Jobs already submitted to the old pool still complete
+                _pool.shutdown(wait=False)
+            threads = max(1, (os.cpu_count() or 1) // workers)
+            logger.info(f"Starting {workers} transcription workers ({backend}, {model_name})")
+            # spawn: forked children would inherit the parent's torch thread pools
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(backend, model_name, threads),
+            )
+            _pool_key = key
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next job starts a fresh one."""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_key = None, None
+    pool.shutdown(wait=False)
+
+
+@atexit.register
+def shutdown_pool():
+    """Stop the shared worker pool (called at interpreter exit)."""
+    global _pool, _pool_key
+    with _pool_lock:
+        pool, _pool, _pool_key = _pool, None, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def transcribe_regions(
+    pcm: np.ndarray,
+    regions: List[Tuple[float, float]],
+    model_name: str = "base",
+    backend: str = None,
+    workers: int = None,
+    sample_rate: int = SAMPLE_RATE,
+    on_segment=None,
+) -> dict:
+    """
+    Transcribe speech regions (in parallel when workers > 1) and stitch the
+    results into one transcript with absolute timestamps.
+
+    Runs serially when there is a single region or less than
+    MIN_PARALLEL_SPEECH_S of speech in total. on_segment receives
+    absolute-time segments in order: as they are decoded when running
+    serially, region by region when running on the pool.
+
+    Returns:
+        dict: {"language": str, "segments": [{"start", "end", "text"}, ...]}
+    """
+    backend = backend or DEFAULT_BACKEND
+    workers = workers or default_workers()
+    chunks = [
+        (pcm[int(start * sample_rate): int(end * sample_rate)], start, end)
+        for start, end in regions
+    ]
+
+    speech_s = sum(end - start for start, end in regions)
+
+    if workers <= 1 or len(chunks) <= 1 or speech_s < MIN_PARALLEL_SPEECH_S:
+        engine = get_transcription_backend(backend, model_name)
+        results = []
+        for audio, start, end in chunks:
+            emit = None
+            if on_segment:
+                def emit(seg, start=start, end=end):
+                    on_segment(offset_segments([seg], start, end)[0])
+            result = engine.transcribe(audio, on_segment=emit)
+            result["segments"] = offset_segments(result["segments"], start, end)
+            results.append(result)
+    else:
+        logger.info(f"Transcribing {len(chunks)} speech regions on {workers} workers")
+        pool = _get_pool(backend, model_name, workers)
+        try:
+            futures = [pool.submit(_transcribe_region, *chunk) for chunk in chunks]
+            results = []
+            for future in futures:
+                result = future.result()
+                results.append(result)
+                if on_segment:
+                    for seg in result["segments"]:
+                        on_segment(seg)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+
+    segments = [seg for result in results for seg in result["segments"]]
+    languages = Counter(r["language"] for r in results if r["segments"])
+    return {
+        "language": languages.most_common(1)[0][0] if languages else "unknown",
+        "segments": segments,
+    }
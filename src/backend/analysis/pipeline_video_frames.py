@@ -12,8 +12,6 @@ Performs:
 import cv2
 import numpy as np
 import pandas as pd
-from ultralytics import YOLO
-import easyocr
 import os
 from pathlib import Path
 from datetime import datetime
@@ -28,9 +26,13 @@ class FrameAnalysisPipeline:
     video_path: str,
     output_dir: str = "outputs/frames",
     yolo_model_path: str = "models/yolov8n.pt",
-    languages: list = ["en"]
+    languages: list = ["en"],
+    enable_ocr: bool = True,
+    media_info=None
 ):
         self.video_path = Path(video_path)
+        # MediaInfo from the ingestion probe; fps/size are then not re-read via OpenCV
+        self.media_info = media_info
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -44,9 +46,17 @@ class FrameAnalysisPipeline:
         self.csv_dir.mkdir(exist_ok=True)
         self.json_dir.mkdir(exist_ok=True)
 
-    # Initialize models
+    # Initialize models (torch-backed libraries are imported on first use)
+        from ultralytics import YOLO
+
         self.yolo = YOLO(yolo_model_path)
-        self.ocr = easyocr.Reader(languages)
+        # OCR is optional (e.g. the fast preview pass skips it entirely)
+        self.enable_ocr = enable_ocr
+        self.ocr = None
+        if enable_ocr:
+            import easyocr
+
+            self.ocr = easyocr.Reader(languages)
 
         self.video_name = self.video_path.stem
         # Store output video in videos subdirectory
@@ -55,20 +65,46 @@ class FrameAnalysisPipeline:
         self.yolo_results_list = []
         self.ocr_results_list = []
 
-    def analyze(self, save_video: bool = True, display: bool = False):
-        """Main processing loop"""
+    def analyze(
+        self,
+        save_video: bool = True,
+        display: bool = False,
+        sample_fps: float = None,
+        imgsz: int = None
+    ):
+        """
+        Main processing loop.
+
+        Args:
+            save_video (bool): Write the annotated video.
+            display (bool): Show frames in a window while processing.
+            sample_fps (float): Only analyze this many frames per second
+                (None = every frame). Skipped frames are grabbed, not decoded.
+            imgsz (int): Inference resolution passed to YOLO (None = model default).
+        """
         logger.info(f"Starting frame analysis on {self.video_path}")
 
         cap = cv2.VideoCapture(str(self.video_path))
         if not cap.isOpened():
             raise ValueError(f"Could not open video: {self.video_path}")
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if self.media_info is not None and self.media_info.fps > 0:
+            fps = self.media_info.fps
+            width, height = self.media_info.width, self.media_info.height
+        else:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         frame_count = 0
         previous_second = -1
 
+        # Frame stride for sampled (preview) runs
+        frame_step = 1
+        if sample_fps and fps > 0:
+            frame_step = max(1, int(round(fps / sample_fps)))
+
+        yolo_kwargs = {"imgsz": imgsz} if imgsz else {}
+
         # Setup video writer if needed
         out = None
         if save_video:
@@ -76,6 +112,14 @@ class FrameAnalysisPipeline:
             out = cv2.VideoWriter(str(self.output_video_path), fourcc, fps, (width, height))
 
         while True:
+            if frame_count % frame_step != 0:
+                # grab() advances without decoding the frame
+                if not cap.grab():
+                    logger.info("End of video reached.")
+                    break
+                frame_count += 1
+                continue
+
             ret, frame = cap.read()
             if not ret:
                 logger.info("End of video reached.")
@@ -83,7 +127,7 @@ class FrameAnalysisPipeline:
 
             timestamp = frame_count / fps
             # --- YOLOv8 object detection ---
-            yolo_results = self.yolo(frame)
+            yolo_results = self.yolo(frame, **yolo_kwargs)
             detections = yolo_results[0].boxes
 
             for det in detections:
@@ -106,7 +150,7 @@ class FrameAnalysisPipeline:
 
             # --- OCR once per second ---
             current_second = int(timestamp)
-            if current_second != previous_second:
+            if self.enable_ocr and current_second != previous_second:
                 ocr_results = self.run_ocr(frame, timestamp)
                 self.ocr_results_list.extend(ocr_results)
                 previous_second = current_second
@@ -13,13 +13,18 @@ To run in powershell, execute the following command:
     Replace 'Hello' with your desired text.
 """
 
+import json
+import os
 from collections import Counter
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
 
 import spacy
+from spacy.matcher import PhraseMatcher
 from spacy.tokens import Doc, Token
 
 from src.backend.utils.logger import get_logger
+from src.backend.utils.result_cache import ResultCache, get_result_cache, spacy_model_id
 
 
 # -------------------------------
@@ -27,11 +32,28 @@ from src.backend.utils.logger import get_logger
 # -------------------------------
 
 # You can swap this model to e.g. 'en_core_web_trf' or a different language.
-NLP = spacy.load("en_core_web_sm")
+DEFAULT_MODEL = "en_core_web_sm"
+
+# Bump when the result format or the analysis logic changes (invalidates cached results)
+POS_CACHE_VERSION = 1
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=None)
+def get_nlp(model_name: str = DEFAULT_MODEL):
+    """Load a spaCy pipeline on first use and reuse it afterwards."""
+    logger.info(f"Loading spaCy model: {model_name}")
+    return spacy.load(model_name)
+
+
+def __getattr__(name):
+    # Backwards compatible module attribute; loads the model on first access
+    if name == "NLP":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # -------------------------------
 # 1. POS LENS (constants)
 # -------------------------------
@@ -54,17 +76,102 @@ MANNER_ADVERBS = {
     "weakly", "safely", "dangerously", "successfully", "unsuccessfully"
 }
 
+# -------------------------------
+# 2. INTERROGATIVE LENS (constants)
+# -------------------------------
+
+TEMPORAL_ADVERBS = {
+    "now", "today", "yesterday", "tonight", "tomorrow",
+    "currently", "presently", "recently", "soon", "lately"
+}
+PLACE_NOUNS = {"office", "city", "country", "parliament", "building",
+               "room", "hall", "campus", "village", "town"}
+PLACE_PREPS = {"in", "at", "on", "inside", "into"}
+PLACE_ENTS = ("GPE", "LOC", "FAC")
+REASON_MARKERS = {"because", "since", "as", "cos", "cause"}
+MULTI_REASON_MARKERS = {"due to", "because of"}
+MANNER_PHRASES = {
+    "in a way", "in this way", "in that way", "by means of", "as if", "as though", "in the manner"
+}
+MEANS_PREPS = {"by", "with", "through", "using", "via"}
+PURPOSE_MARKERS = {"in order to", "so that", "so we can", "so they can"}
+WHENCE_PREPS = {"from", "since"}
+CONSEQUENCE_MARKERS = {"so", "therefore", "thus", "hence"}
+CONSEQUENCE_PHRASES = ("as a result", "resulting in", "which led to")
+
+# Multi-word markers per slot; a sentence containing one is a candidate.
+# Matched case-insensitively on token sequences by one PhraseMatcher pass.
+PHRASE_MARKERS = {
+    "why": MULTI_REASON_MARKERS,
+    "how": MANNER_PHRASES,
+    "by_what_means": ("by means of",),
+    "towards_what_end": PURPOSE_MARKERS,
+    "whence": ("out of",),
+    "by_what_consequence": CONSEQUENCE_PHRASES,
+}
+
+INTERROGATIVE_SLOTS = (
+    "who", "what", "when", "where", "why", "how",
+    "by_what_means", "towards_what_end", "whence", "by_what_consequence"
+)
+POS_WORD_KEYS = ("NOUN", "VERB", "ADJ", "ADV", "PRON", "AUX_MODAL", "ADP", "CONJ")
+
+
+def compute_ratios(pos_counts: Dict[str, int], token_count: int, nominalizations: int) -> Dict[str, float]:
+    """POS ratios from counts; token_count covers non-space, non-punct tokens."""
+    token_count = token_count or 1
+
+    noun = pos_counts.get("NOUN", 0)
+    verb = pos_counts.get("VERB", 0)
+    modal = pos_counts.get("AUX_MODAL", 0)
+    pron = pos_counts.get("PRON", 0)
+    adj = pos_counts.get("ADJ", 0)
+    adv = pos_counts.get("ADV", 0)
+
+    ratios = {}
+    # Verb–noun ratio
+    ratios["verb_noun_ratio"] = (verb / noun) if noun > 0 else 0.0
+    # Modal density (per token)
+    ratios["modal_density"] = modal / token_count
+    # Pronoun share (per token)
+    ratios["pronoun_share"] = pron / token_count
+    # Adjective–adverb ratio (optional but useful)
+    ratios["adj_adv_ratio"] = (adj / adv) if adv > 0 else (float(adj) if adj > 0 else 0.0)
+    # Nominalization Density (nouns with a nominalizing suffix, per token)
+    ratios["nominalization_density"] = nominalizations / token_count
+
+    return ratios
+
+
+@lru_cache(maxsize=None)
+def _marker_matcher(vocab) -> Tuple[PhraseMatcher, Dict[int, Tuple[str, str]]]:
+    """PhraseMatcher (attr LOWER) over all PHRASE_MARKERS, built once per vocab."""
+    matcher = PhraseMatcher(vocab, attr="LOWER")
+    keys: Dict[int, Tuple[str, str]] = {}
+    for slot, markers in PHRASE_MARKERS.items():
+        for marker in markers:
+            key = f"{slot}:{marker}"
+            matcher.add(key, [Doc(vocab, words=marker.split())])
+            keys[vocab.strings[key]] = (slot, marker)
+    return matcher, keys
+
 
 class POSAnalysis:
     """Object-oriented wrapper for POS and dramatistic/interrogative analysis.
 
     Instantiate with `text` and call `run()` to perform analysis.
+
+    All features come from a single pass over the parsed Doc (`_scan`); the
+    public compute/collect/extract methods read from that pass.
     """
 
-    def __init__(self, text: str, nlp=NLP):
+    def __init__(self, text: str, nlp=None, cache: ResultCache = None):
         self.text = text
-        self.nlp = nlp
+        self.nlp = nlp if nlp is not None else get_nlp()
+        self.cache = cache if cache is not None else get_result_cache()
         self.doc: Doc | None = None
+        self._scan_result: Dict[str, Any] | None = None
+        self._scanned_doc: Doc | None = None
 
     def _span_text(self, tokens: List[Token]) -> str:
         if not tokens:
@@ -74,6 +181,13 @@ class POSAnalysis:
         end = max(t.i for t in tokens) + 1
         return doc[start:end].text.strip()
 
+    def _subtree_text(self, token: Token, extra: Token = None) -> str:
+        """Text of token.subtree (plus an optional extra token), like _span_text."""
+        start, end = token.left_edge.i, token.right_edge.i
+        if extra is not None:
+            start, end = min(start, extra.i), max(end, extra.i)
+        return self.doc[start:end + 1].text.strip()
+
     def _unique_append(self, bucket: List[str], text: str, seen: set):
         text = text.strip()
         if not text:
@@ -83,110 +197,183 @@ class POSAnalysis:
         seen.add(text)
         bucket.append(text)
 
-    def compute_pos_counts(self) -> Dict[str, int]:
+    def _scan(self) -> Dict[str, Any]:
+        """
+        Single pass over the Doc filling POS counters, word buckets and all
+        interrogative candidates.
+
+        Candidates are kept in ordered sub-buckets (e.g. entities before token
+        matches) and de-duplicated at the end, so every slot lists the same
+        items in the same order as separate per-feature loops would.
+        """
+        if self._scan_result is not None and self._scanned_doc is self.doc:
+            return self._scan_result
+
+        doc = self.doc
         counts = Counter()
-        for token in self.doc:
-            if token.is_space or token.is_punct:
-                continue
-
-            pos = token.pos_
-            tag = token.tag_.upper()
-            lemma = token.lemma_.lower()
-
-            # Nouns (common + proper)
-            if pos in ("NOUN", "PROPN"):
-                counts["NOUN"] += 1
-            # Verbs (main verbs only; modals handled separately)
-            if pos == "VERB":
-                counts["VERB"] += 1
-            # Adjectives
-            if pos == "ADJ":
-                counts["ADJ"] += 1
-            # Adverbs
-            if pos == "ADV":
-                counts["ADV"] += 1
-            # Pronouns
-            if pos == "PRON":
-                counts["PRON"] += 1
-            # Modals / auxiliary of modality
-            # In English, modals are tagged 'MD' or have modal lemma.
-            if tag == "MD" or lemma in MODAL_LEMMAS:
-                counts["AUX_MODAL"] += 1
-            # Prepositions
-            if pos == "ADP":
-                counts["ADP"] += 1
-            # Conjunctions (coordinating + subordinating)
-            if pos in ("CCONJ", "SCONJ"):
-                counts["CONJ"] += 1
-
-        return dict(counts)
+        pos_words: Dict[str, List[str]] = {key: [] for key in POS_WORD_KEYS}
+        token_count = 0
+        nominalizations = 0
+
+        who, what = [], []
+        when_tokens, where_tokens = [], []
+        why_tokens = []
+        how = []
+        means_tokens = []
+        purpose_tokens = []
+        whence_tokens = []
+        consequence_tokens = []
+        # Sentences containing each multi-word marker, per slot and marker
+        phrase_hits: Dict[str, Dict[str, List[str]]] = {
+            slot: {marker: [] for marker in markers} for slot, markers in PHRASE_MARKERS.items()
+        }
 
-    def collect_pos_words(self) -> Dict[str, List[str]]:
-        full_pos_words: Dict[str, List[str]] = {
-            "NOUN": [], "VERB": [], "ADJ": [], "ADV": [], "PRON": [],
-            "AUX_MODAL": [], "ADP": [], "CONJ": []
+        matcher, match_keys = _marker_matcher(doc.vocab)
+        matches = sorted(matcher(doc), key=lambda m: m[1])
+        next_match = 0
+
+        n_tokens = len(doc)
+        for sent in doc.sents:
+            sent_text = sent.text
+            sent_start = sent.start
+            root = sent.root
+            root_is_verb = root.pos_ == "VERB"
+            is_how = False
+
+            # Matches starting in this sentence (ones running past its end are dropped)
+            while next_match < len(matches) and matches[next_match][1] < sent.end:
+                match_id, _, match_end = matches[next_match]
+                next_match += 1
+                if match_end <= sent.end:
+                    slot, marker = match_keys[match_id]
+                    phrase_hits[slot][marker].append(sent_text)
+                    is_how = is_how or slot == "how"
+
+            for token in sent:
+                pos = token.pos_
+                dep = token.dep_
+                lower = token.text.lower()
+                lemma = token.lemma_.lower()
+
+                # --- Interrogative candidates (all tokens) ---
+                if "subj" in dep:
+                    who.append(self._subtree_text(token))
+                if pos == "VERB" and (token.i == root.i or not root_is_verb):
+                    what.append(self._subtree_text(token))
+                if pos == "ADV" and lemma in TEMPORAL_ADVERBS:
+                    when_tokens.append(token.text)
+                if pos == "ADP" and lemma in PLACE_PREPS:
+                    pobj = next((t for t in token.children if t.dep_ in ("pobj", "obl")), None)
+                    if pobj is not None and (pobj.ent_type_ in PLACE_ENTS or pobj.lemma_.lower() in PLACE_NOUNS):
+                        where_tokens.append(self._subtree_text(pobj, token))
+                if lower in REASON_MARKERS:
+                    why_tokens.append(sent[token.i - sent_start:].text)
+                if not is_how:
+                    if lower == "as" and dep == "advcl":
+                        is_how = True
+                    elif lower == "like" and dep == "prep" and token.head and token.head.pos_ == "VERB":
+                        is_how = True
+                    elif (pos == "ADV" and dep == "advmod" and lemma not in TEMPORAL_ADVERBS
+                          and lemma in MANNER_ADVERBS):
+                        is_how = True
+                if pos == "ADP" and lemma in MEANS_PREPS:
+                    means_tokens.append(self._subtree_text(token))
+                if lower == "to" and token.i + 1 < n_tokens:
+                    next_token = doc[token.i + 1]
+                    if next_token.pos_ == "VERB":
+                        purpose_tokens.append(self._subtree_text(next_token, token))
+                if pos == "ADP" and lower in WHENCE_PREPS:
+                    whence_tokens.append(self._subtree_text(token))
+                if lower in CONSEQUENCE_MARKERS:
+                    consequence_tokens.append(sent[token.i - sent_start:].text)
+
+                if pos == "NOUN" and any(lower.endswith(suffix) for suffix in NOMINALIZATION_SUFFIXES):
+                    nominalizations += 1
+
+                # --- POS lens (content tokens only) ---
+                if token.is_space or token.is_punct:
+                    continue
+                token_count += 1
+                is_modal = token.tag_.upper() == "MD" or lemma in MODAL_LEMMAS
+
+                # Counts may hit several categories; words go to the first match
+                if pos in ("NOUN", "PROPN"):
+                    counts["NOUN"] += 1
+                    pos_words["NOUN"].append(token.text)
+                if pos == "VERB":
+                    counts["VERB"] += 1
+                    pos_words["VERB"].append(token.text)
+                if pos == "ADJ":
+                    counts["ADJ"] += 1
+                    pos_words["ADJ"].append(token.text)
+                if pos == "ADV":
+                    counts["ADV"] += 1
+                    pos_words["ADV"].append(token.text)
+                if pos == "PRON":
+                    counts["PRON"] += 1
+                    pos_words["PRON"].append(token.text)
+                if is_modal:
+                    counts["AUX_MODAL"] += 1
+                    if pos not in ("NOUN", "PROPN", "VERB", "ADJ", "ADV", "PRON"):
+                        pos_words["AUX_MODAL"].append(token.text)
+                if pos == "ADP":
+                    counts["ADP"] += 1
+                    if not is_modal:
+                        pos_words["ADP"].append(token.text)
+                if pos in ("CCONJ", "SCONJ"):
+                    counts["CONJ"] += 1
+                    if not is_modal:
+                        pos_words["CONJ"].append(token.text)
+
+            if is_how:
+                how.append(sent_text)
+
+        when_ents, where_ents = [], []
+        for ent in doc.ents:
+            if ent.label_ in ("DATE", "TIME"):
+                when_ents.append(ent.text)
+            if ent.label_ in PLACE_ENTS:
+                where_ents.append(ent.text)
+
+        candidates = {
+            "who": [who],
+            "what": [what],
+            "when": [when_ents, when_tokens],
+            "where": [where_ents, where_tokens],
+            "why": [why_tokens, *phrase_hits["why"].values()],
+            "how": [how],
+            "by_what_means": [means_tokens, *phrase_hits["by_what_means"].values()],
+            "towards_what_end": [*phrase_hits["towards_what_end"].values(), purpose_tokens],
+            "whence": [whence_tokens, *phrase_hits["whence"].values()],
+            "by_what_consequence": [consequence_tokens, *phrase_hits["by_what_consequence"].values()],
+        }
+        interrogatives: Dict[str, List[str]] = {}
+        for slot in INTERROGATIVE_SLOTS:
+            bucket, seen = [], set()
+            for sub_bucket in candidates[slot]:
+                for text in sub_bucket:
+                    self._unique_append(bucket, text, seen)
+            interrogatives[slot] = bucket
+
+        self._scanned_doc = doc
+        self._scan_result = {
+            "pos_counts": dict(counts),
+            "pos_words": {k: v for k, v in pos_words.items() if v},
+            "token_count": token_count,
+            "nominalizations": nominalizations,
+            "interrogatives": interrogatives,
         }
+        return self._scan_result
 
-        for token in self.doc:
-            if token.is_space or token.is_punct:
-                continue
-
-            pos = token.pos_
-            tag = token.tag_.upper()
-            lemma = token.lemma_.lower()
-
-            if pos in ("NOUN", "PROPN"):
-                full_pos_words["NOUN"].append(token.text)
-            elif pos == "VERB":
-                full_pos_words["VERB"].append(token.text)
-            elif pos == "ADJ":
-                full_pos_words["ADJ"].append(token.text)
-            elif pos == "ADV":
-                full_pos_words["ADV"].append(token.text)
-            elif pos == "PRON":
-                full_pos_words["PRON"].append(token.text)
-            elif tag == "MD" or lemma in MODAL_LEMMAS:
-                full_pos_words["AUX_MODAL"].append(token.text)
-            elif pos == "ADP":
-                full_pos_words["ADP"].append(token.text)
-            elif pos in ("CCONJ", "SCONJ"):
-                full_pos_words["CONJ"].append(token.text)
-
-        return {k: v for k, v in full_pos_words.items() if v}
+    def compute_pos_counts(self) -> Dict[str, int]:
+        return dict(self._scan()["pos_counts"])
+
+    def collect_pos_words(self) -> Dict[str, List[str]]:
+        return {k: list(v) for k, v in self._scan()["pos_words"].items()}
 
     def compute_pos_ratios(self, pos_counts: Dict[str, int]) -> Dict[str, float]:
-        # Count tokens used for ratios (non-space, non-punct)
-        token_count = sum(1 for t in self.doc if not t.is_space and not t.is_punct)
-        if token_count == 0:
-            token_count = 1
-
-        noun = pos_counts.get("NOUN", 0)
-        verb = pos_counts.get("VERB", 0)
-        modal = pos_counts.get("AUX_MODAL", 0)
-        pron = pos_counts.get("PRON", 0)
-        adj = pos_counts.get("ADJ", 0)
-        adv = pos_counts.get("ADV", 0)
-
-        ratios = {}
-        # Verb–noun ratio
-        ratios["verb_noun_ratio"] = (verb / noun) if noun > 0 else 0.0
-        # Modal density (per token)
-        ratios["modal_density"] = modal / token_count
-        # Pronoun share (per token)
-        ratios["pronoun_share"] = pron / token_count
-        # Adjective–adverb ratio (optional but useful)
-        ratios["adj_adv_ratio"] = (adj / adv) if adv > 0 else (float(adj) if adj > 0 else 0.0)
-
-        # Nominalization Density (new)
-        nominalizations_count = 0
-        for token in self.doc:
-            if token.pos_ == "NOUN":
-                lower_text = token.text.lower()
-                if any(lower_text.endswith(s) for s in NOMINALIZATION_SUFFIXES):
-                    nominalizations_count += 1
-        ratios["nominalization_density"] = nominalizations_count / token_count if token_count > 0 else 0.0
-
-        return ratios
+        scan = self._scan()
+        return compute_ratios(pos_counts, scan["token_count"], scan["nominalizations"])
 
     def extract_interrogatives(self) -> Dict[str, List[str]]:
         """
@@ -195,185 +382,24 @@ class POSAnalysis:
         who, what, when, where, why, how,
         by_what_means, towards_what_end, whence, by_what_consequence
     """
-        
-        result: Dict[str, List[str]] = {
-            "who": [],
-            "what": [],
-            "when": [],
-            "where": [],
-            "why": [],
-            "how": [],
-            "by_what_means": [],
-            "towards_what_end": [],
-            "whence": [],
-            "by_what_consequence": []
-        }
+        return {k: list(v) for k, v in self._scan()["interrogatives"].items()}
 
-        seen: Dict[str, set] = {k: set() for k in result.keys()}
-        # Define doc_text_lower once at the beginning
-        doc_text_lower = self.doc.text.lower()
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the full analysis and return a structured dict (compatible with previous `process_segment`).
+        Results are cached by text and model; on a cache hit the text is not parsed (self.doc stays unset).
+        """
+        def analyze():
+            logger.debug("Parsing text into spaCy Doc")
+            return self.analyze_doc(self.nlp(self.text))
 
-        # WHO? (subjects)
-        for token in self.doc:
-            if "subj" in token.dep_:
-                span = self._span_text(list(token.subtree))
-                self._unique_append(result["who"], span, seen["who"])
+        return self.cache.get_or_compute(
+            "pos", self.text, analyze, model=spacy_model_id(self.nlp), version=POS_CACHE_VERSION
+        )
 
-        # WHAT? (main actions)
-        for sent in self.doc.sents:
-            root = sent.root
-            if root.pos_ == "VERB":
-                span = self._span_text(list(root.subtree))
-                self._unique_append(result["what"], span, seen["what"])
-            else:
-                verbs = [t for t in sent if t.pos_ == "VERB"]
-                for v in verbs:
-                    span = self._span_text(list(v.subtree))
-                    self._unique_append(result["what"], span, seen["what"])
-
-        # WHEN? (time)
-        temporal_adverbs = {
-            "now", "today", "yesterday", "tonight", "tomorrow",
-            "currently", "presently", "recently", "soon", "lately"
-        }
-        for ent in self.doc.ents:
-            if ent.label_ in ("DATE", "TIME"):
-                self._unique_append(result["when"], ent.text, seen["when"])
-        for token in self.doc:
-            if token.pos_ == "ADV" and token.lemma_.lower() in temporal_adverbs:
-                self._unique_append(result["when"], token.text, seen["when"])
-
-        # WHERE? (place)
-        for ent in self.doc.ents:
-            if ent.label_ in ("GPE", "LOC", "FAC"):
-                self._unique_append(result["where"], ent.text, seen["where"])
-
-        place_nouns = {"office", "city", "country", "parliament", "building",
-                       "room", "hall", "campus", "village", "town"}
-        for token in self.doc:
-            if token.pos_ == "ADP" and token.lemma_.lower() in {"in", "at", "on", "inside", "into"}:
-                pobj = [t for t in token.children if t.dep_ in ("pobj", "obl")]
-                if pobj:
-                    head_noun = pobj[0].lemma_.lower()
-                    if pobj[0].ent_type_ in ("GPE", "LOC", "FAC") or head_noun in place_nouns:
-                        span_tokens = [token] + list(pobj[0].subtree)
-                        span = self._span_text(span_tokens)
-                        self._unique_append(result["where"], span, seen["where"])
-
-        # WHY? (reason)
-        reason_markers = {"because", "since", "as", "cos", "cause"}
-        multi_markers = {"due to", "because of"}
-        # Single-word markers
-        for token in self.doc:
-            lower = token.text.lower()
-            if lower in reason_markers:
-                sent = token.sent
-                span = sent[token.i - sent.start:].text
-                self._unique_append(result["why"], span, seen["why"])
-        # Single-word markers
-        for marker in multi_markers:
-            for sent in self.doc.sents:
-                if marker in sent.text.lower():
-                    self._unique_append(result["why"], sent.text, seen["why"])
-
-        # HOW? (manner / process)
-        # Heuristic 1: Phrases and conjunctions indicating manner, capturing the full sentence for context.
-        manner_keywords_phrases = {
-            "in a way", "in this way", "in that way", "by means of", "as if", "as though", "in the manner"
-        }
-        for sent in self.doc.sents:
-            sent_text_lower = sent.text.lower()
-            # Check for specific phrases indicating manner
-            for phrase in manner_keywords_phrases:
-                if phrase in sent_text_lower:
-                    self._unique_append(result["how"], sent.text, seen["how"])
-            # Check for conjunctions indicating manner ('as', 'like') followed by a clause.
-            # This is a bit more complex as 'as' and 'like' can have many meanings.
-            # Focusing on clear cases where they introduce a manner clause.
-            for token in sent:
-                if token.text.lower() == "as" and token.dep_ == "advcl":
-                    self._unique_append(result["how"], sent.text, seen["how"])
-                if token.text.lower() == "like" and token.dep_ == "prep":
-                    if token.head and token.head.pos_ == "VERB":
-                        self._unique_append(result["how"], sent.text, seen["how"])
-            # New Heuristic: Capture full sentences where an adverb of manner is present.
-            # This ensures contextual sentences for general 'how' descriptions.
-            for token in sent:
-                if token.pos_ == "ADV" and token.dep_ == "advmod" and token.lemma_.lower() not in temporal_adverbs:
-                    if token.lemma_.lower() in MANNER_ADVERBS:
-                        self._unique_append(result["how"], sent.text, seen["how"])
-
-        # BY WHAT MEANS? (instrument / method)
-        means_preps = {"by", "with", "through", "using", "via"}
-        for token in self.doc:
-            if token.pos_ == "ADP" and token.lemma_.lower() in means_preps:
-                span_tokens = [token] + list(token.subtree)
-                span = self._span_text(span_tokens)
-                self._unique_append(result["by_what_means"], span, seen["by_what_means"])
-        if "by means of" in doc_text_lower:
-            for sent in self.doc.sents:
-                if "by means of" in sent.text.lower():
-                    self._unique_append(result["by_what_means"], sent.text, seen["by_what_means"])
-
-        # TOWARDS WHAT END? (purpose / goal)
-        purpose_markers = {"in order to", "so that", "so we can", "so they can"}
-        for marker in purpose_markers:
-            if marker in doc_text_lower:
-                for sent in self.doc.sents:
-                    if marker in sent.text.lower():
-                        self._unique_append(result["towards_what_end"], sent.text, seen["towards_what_end"])
-        for token in self.doc:
-            # Infinitival purpose clause heuristic
-            if token.text.lower() == "to" and token.nbor(1).pos_ == "VERB":
-                span_tokens = [token, token.nbor(1)]
-                for t in token.nbor(1).subtree:
-                    span_tokens.append(t)
-                span = self._span_text(span_tokens)
-                self._unique_append(result["towards_what_end"], span, seen["towards_what_end"])
-
-        # WHENCE? (origin / source)
-        whence_preps = {"from", "out of", "since"}
-        for token in self.doc:
-            lower = token.text.lower()
-            if token.pos_ == "ADP" and (lower in {"from", "since"}):
-                span_tokens = [token] + list(token.subtree)
-                span = self._span_text(span_tokens)
-                self._unique_append(result["whence"], span, seen["whence"])
-        if "out of" in doc_text_lower:
-            for sent in self.doc.sents:
-                if "out of" in sent.text.lower():
-                    self._unique_append(result["whence"], sent.text, seen["whence"])
-
-        # BY WHAT CONSEQUENCE? (effect / outcome)
-        consequence_markers = {"so", "therefore", "thus", "hence"}
-        for token in self.doc:
-            lower = token.text.lower()
-            if lower in consequence_markers:
-                # Take from marker to end of sentence as rough consequence clause
-                sent = token.sent
-                span = sent[token.i - sent.start:].text
-                self._unique_append(result["by_what_consequence"], span, seen["by_what_consequence"])
-        
-        # Phrases: "as a result", "resulting in", "which led to" (append full sentence)
-        if "as a result" in doc_text_lower:
-            for sent in self.doc.sents:
-                if "as a result" in sent.text.lower():
-                    self._unique_append(result["by_what_consequence"], sent.text, seen["by_what_consequence"])
-        if "resulting in" in self.doc.text.lower():
-            for sent in self.doc.sents:
-                if "resulting in" in sent.text.lower():
-                    self._unique_append(result["by_what_consequence"], sent.text, seen["by_what_consequence"])
-        if "which led to" in self.doc.text.lower():
-            for sent in self.doc.sents:
-                if "which led to" in sent.text.lower():
-                    self._unique_append(result["by_what_consequence"], sent.text, seen["by_what_consequence"])
-
-        return result
-
-    def run(self) -> Dict[str, Any]:
-        """Run the full analysis and return a structured dict (compatible with previous `process_segment`)."""
-        logger.debug("Parsing text into spaCy Doc")
-        self.doc = self.nlp(self.text)
+    def analyze_doc(self, doc: Doc) -> Dict[str, Any]:
+        """Analyze an already parsed Doc (e.g. one produced by nlp.pipe)."""
+        self.doc = doc
 
         pos_counts = self.compute_pos_counts()
         pos_ratios = self.compute_pos_ratios(pos_counts)
@@ -389,6 +415,109 @@ class POSAnalysis:
         }
 
 
+# -------------------------------
+# 3. SEGMENT MODE (timestamped transcripts)
+# -------------------------------
+
+# Below this many segments per worker, extra processes cost more than they save
+MIN_SEGMENTS_PER_PROCESS = 250
+
+
+def _auto_n_process(n_segments: int) -> int:
+    workers = max(1, (os.cpu_count() or 1) // 2)
+    return max(1, min(workers, n_segments // MIN_SEGMENTS_PER_PROCESS))
+
+
+def analyze_segments(
+    segments: List[Dict[str, Any]],
+    nlp=None,
+    batch_size: int = 64,
+    n_process: int = None,
+    cache: ResultCache = None,
+) -> Dict[str, Any]:
+    """
+    Segment-level POS / interrogative analysis for a timestamped transcript.
+
+    Segment texts are parsed with nlp.pipe(batch_size, n_process) (n_process
+    None = chosen from the segment count and CPU count). Each segment gets its
+    own result aligned to its start/end; the global aggregates merge the
+    per-segment counters, word buckets and interrogative slots.
+
+    The whole result is cached by the segments' text/timing/speakers and the
+    model, so re-analyzing the same transcript skips parsing entirely.
+
+    Returns the same top-level keys as POSAnalysis.run() plus "segments".
+    """
+    if nlp is None:
+        nlp = get_nlp()
+    if cache is None:
+        cache = get_result_cache()
+    key_text = json.dumps(
+        [[seg.get("start"), seg.get("end"), "speaker" in seg, seg.get("speaker"), seg.get("text", "")] for seg in segments],
+        ensure_ascii=False,
+    )
+    return cache.get_or_compute(
+        "pos_segments",
+        key_text,
+        lambda: _analyze_segments(segments, nlp, batch_size, n_process, cache),
+        model=spacy_model_id(nlp),
+        version=POS_CACHE_VERSION,
+    )
+
+
+def _analyze_segments(
+    segments: List[Dict[str, Any]], nlp, batch_size: int, n_process: int, cache: ResultCache
+) -> Dict[str, Any]:
+    texts = [seg.get("text", "").strip() for seg in segments]
+    if n_process is None:
+        n_process = _auto_n_process(len(texts))
+    logger.info(f"POS analysis over {len(texts)} segments (batch_size={batch_size}, n_process={n_process})")
+
+    counts = Counter()
+    pos_words: Dict[str, List[str]] = {key: [] for key in POS_WORD_KEYS}
+    token_count = 0
+    nominalizations = 0
+    interrogatives: Dict[str, List[str]] = {slot: [] for slot in INTERROGATIVE_SLOTS}
+    seen: Dict[str, set] = {slot: set() for slot in INTERROGATIVE_SLOTS}
+
+    segment_results = []
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    for seg, text, doc in zip(segments, texts, docs):
+        analyzer = POSAnalysis(text, nlp=nlp, cache=cache)
+        result = analyzer.analyze_doc(doc)
+        scan = analyzer._scan()
+
+        counts.update(scan["pos_counts"])
+        for key, words in scan["pos_words"].items():
+            pos_words[key].extend(words)
+        token_count += scan["token_count"]
+        nominalizations += scan["nominalizations"]
+        for slot, items in scan["interrogatives"].items():
+            for item in items:
+                analyzer._unique_append(interrogatives[slot], item, seen[slot])
+
+        segment_result = {"start": seg.get("start"), "end": seg.get("end")}
+        if "speaker" in seg:
+            segment_result["speaker"] = seg["speaker"]
+        segment_result.update({
+            "text": text,
+            "pos_counts": result["pos_counts"],
+            "pos_ratios": result["pos_ratios"],
+            "interrogative_lens": result["interrogative_lens"],
+        })
+        segment_results.append(segment_result)
+
+    pos_counts = dict(counts)
+    return {
+        "text": " ".join(texts),
+        "pos_counts": pos_counts,
+        "pos_ratios": compute_ratios(pos_counts, token_count, nominalizations),
+        "interrogative_lens": interrogatives,
+        "pos_words": {k: v for k, v in pos_words.items() if v},
+        "segments": segment_results,
+    }
+
+
 # Compatibility function kept for earlier callers
 def process_segment(text: str) -> Dict[str, Any]:
     analyzer = POSAnalysis(text)
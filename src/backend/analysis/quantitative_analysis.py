@@ -20,7 +20,8 @@ The typical workflow is:
 Requirements
 ------------
 - Python 3.x
-- nltk (with "punkt" and "stopwords" resources)
+- nltk (with "punkt"/"punkt_tab" and "stopwords" resources installed;
+  they are checked locally, never downloaded at runtime)
 - scikit-learn
 - spaCy with the ``en_core_web_sm`` model
 - pandas
@@ -38,21 +39,57 @@ from collections import Counter
 import zipfile
 import os
 import re
-from typing import Iterable, List, Dict, Tuple, Any, Optional
+from functools import lru_cache, partial
+from typing import Iterable, List, Dict, Tuple, Any, Optional, TYPE_CHECKING
 
 import nltk
 from nltk.corpus import stopwords
-from nltk.collocations import BigramCollocationFinder, BigramAssocMeasures
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 
 import spacy
+import numpy as np
 import pandas as pd
 
+from src.backend.analysis.ngram_counts import NgramCounts, count_documents
 
-# Ensure basic NLTK resources are available.
-nltk.download("punkt", quiet=True)
-nltk.download("stopwords", quiet=True)
+if TYPE_CHECKING:
+    from src.backend.analysis.corpus_index import CorpusIndex
+
+
+# NLTK resources used here, with the data paths that satisfy them
+# (NLTK >= 3.8.2 tokenizes with "punkt_tab", older releases with "punkt").
+NLTK_RESOURCES = {
+    "punkt": ("tokenizers/punkt_tab", "tokenizers/punkt"),
+    "stopwords": ("corpora/stopwords",),
+}
+_verified_resources: set = set()
+
+
+def ensure_nltk_resources(*names: str) -> None:
+    """Check that NLTK resources are installed locally (nothing is downloaded).
+
+    Raises
+    ------
+    LookupError
+        If a resource is missing, with the command that installs it.
+    """
+    for name in names or tuple(NLTK_RESOURCES):
+        if name in _verified_resources:
+            continue
+        for data_path in NLTK_RESOURCES[name]:
+            try:
+                nltk.data.find(data_path)
+                break
+            except LookupError:
+                continue
+        else:
+            package = NLTK_RESOURCES[name][0].rsplit("/", 1)[-1]
+            raise LookupError(
+                f"NLTK resource '{name}' is not installed. "
+                f"Install it using: python -m nltk.downloader {package}"
+            )
+        _verified_resources.add(name)
 
 
 class QuantitativeAnalysis:
@@ -61,6 +98,8 @@ class QuantitativeAnalysis:
     Usage patterns:
       - Initialize with a ZIP archive path: QuantitativeAnalysis(zip_path="corpus.zip")
       - Or initialize with in-memory docs: QuantitativeAnalysis(docs=docs, file_paths=paths)
+      - Or read from a persistent corpus index: QuantitativeAnalysis(index=get_corpus_index())
+        (see corpus_index.py; documents are added to the index incrementally)
 
     Call `run()` to compute a standard set of exploratory outputs.
     The output is a dictionary containing DataFrames and lists that are
@@ -73,11 +112,13 @@ class QuantitativeAnalysis:
         docs: Optional[List[str]] = None,
         file_paths: Optional[List[Path]] = None,
         spacy_model: str = "en_core_web_sm",
+        index: Optional["CorpusIndex"] = None,
     ) -> None:
         self.zip_path = zip_path
         self.docs = docs
         self.file_paths = file_paths
         self.spacy_model = spacy_model
+        self.index = index
 
         # populated after run()
         self.stats_df: Optional[pd.DataFrame] = None
@@ -106,7 +147,13 @@ class QuantitativeAnalysis:
           - 'tfidf_df': top terms per document (pandas.DataFrame) or None
           - 'bigrams': list of bigram tuples or None
           - 'sentence_tags': DataFrame of sentence WHO/WHY tags
+
+        With an index, results are read from its stored counts; 'token_info'
+        then carries 'token_count'/'type_count' instead of the token lists.
         """
+        if self.index is not None:
+            return self._run_from_index(compute_tfidf, compute_bigrams, bigram_min_freq)
+
         self._ensure_corpus_loaded()
 
         # Basic per-document statistics
@@ -148,6 +195,29 @@ class QuantitativeAnalysis:
         }
 
 
+    def _run_from_index(self, compute_tfidf: bool, compute_bigrams: bool, bigram_min_freq: int) -> Dict[str, Any]:
+        self.stats_df = self.index.stats_df()
+        self.token_info = self.index.token_info()
+
+        self.tfidf_df = None
+        if compute_tfidf:
+            self.tfidf_df = self.index.tfidf_top_terms()
+
+        self.bigrams = []
+        if compute_bigrams:
+            self.bigrams = self.index.bigram_collocations(min_freq=bigram_min_freq)
+
+        self.sentence_tags = self.index.sentence_tags()
+
+        return {
+            "stats_df": self.stats_df,
+            "token_info": self.token_info,
+            "tfidf_df": self.tfidf_df,
+            "bigrams": self.bigrams,
+            "sentence_tags": self.sentence_tags,
+        }
+
+
 def process_quantitative(
     zip_path: Optional[str] = None,
     docs: Optional[List[str]] = None,
@@ -232,6 +302,7 @@ def corpus_sentence_word_stats(
     Sentence and word tokenisation use ``nltk.sent_tokenize`` and
     ``nltk.word_tokenize`` with default (English) models.
     """
+    ensure_nltk_resources("punkt")
     stats = []
 
     for path, doc in zip(file_paths, docs):
@@ -249,6 +320,21 @@ def corpus_sentence_word_stats(
     return df_stats
 
 
+def clean_tokens(text: str, lowercase: bool = True) -> List[str]:
+    """Notebook-style cleaning: strip everything but letters, split on whitespace."""
+    if lowercase:
+        text = text.lower()
+    # Remove everything that is not a lowercase letter or whitespace.
+    return re.sub(r"[^a-z\s]", " ", text).split()
+
+
+@lru_cache(maxsize=None)
+def stopword_set(stop_lang: str = "english") -> frozenset:
+    """NLTK stopwords for a language (loaded once)."""
+    ensure_nltk_resources("stopwords")
+    return frozenset(stopwords.words(stop_lang))
+
+
 def build_token_stream(
     docs: Iterable[str],
     lowercase: bool = True,
@@ -293,13 +379,7 @@ def build_token_stream(
     joined into one long string, punctuation and digits are stripped
     with a regex, then the result is split on whitespace.
     """
-    text = " ".join(docs)
-    if lowercase:
-        text = text.lower()
-
-    # Remove everything that is not a lowercase letter or whitespace.
-    text_clean = re.sub(r"[^a-z\s]", " ", text)
-    raw_tokens = text_clean.split()
+    raw_tokens = clean_tokens(" ".join(docs), lowercase=lowercase)
     if not raw_tokens:
         return {
             "tokens": [],
@@ -317,7 +397,7 @@ def build_token_stream(
 
     tokens_filtered = tokens_alpha
     if remove_stopwords:
-        sw = set(stopwords.words(stop_lang))
+        sw = stopword_set(stop_lang)
         tokens_filtered = [w for w in tokens_alpha if w not in sw]
 
     freq_dist = Counter(tokens_filtered)
@@ -335,6 +415,9 @@ def compute_tfidf_top_terms(
     file_paths: Iterable[Path],
     max_features: int = 1000,
     top_n: int = 10,
+    streaming: bool = False,
+    n_features: int = 2 ** 20,
+    batch_size: int = 1000,
 ) -> pd.DataFrame:
     """
     Compute TF-IDF scores and return top terms per document.
@@ -342,13 +425,19 @@ def compute_tfidf_top_terms(
     Parameters
     ----------
     docs : iterable of str
-        Documents to vectorise.
+        Documents to vectorise. With ``streaming=True`` this must be
+        re-iterable (e.g. a list, or an object whose ``__iter__`` reads the
+        files lazily), since it is traversed twice.
     file_paths : iterable of pathlib.Path
         Paths whose ``name`` attributes are used as document labels.
     max_features : int, optional
         Maximum vocabulary size for ``TfidfVectorizer``.
     top_n : int, optional
         Number of top terms to return for each document.
+    streaming : bool, optional
+        Use :func:`streaming_tfidf_top_terms` (hashed features, batches of
+        ``batch_size`` documents, ``n_features`` hash buckets) instead of
+        holding the corpus and its vocabulary in memory.
 
     Returns
     -------
@@ -361,27 +450,150 @@ def compute_tfidf_top_terms(
     Notes
     -----
     The underlying vectoriser uses English stopwords and unigrams by
-    default. The TF–IDF matrix is built once and rows are inspected
-    to pick top terms for each document.
+    default. The TF–IDF matrix is built once and the top terms are
+    selected from each sparse row (see :func:`top_terms_per_row`).
     """
+    names = [path.name for path in file_paths]
+    if streaming:
+        return streaming_tfidf_top_terms(
+            docs, names, max_features=max_features, top_n=top_n,
+            n_features=n_features, batch_size=batch_size,
+        )
+
     vectorizer = TfidfVectorizer(stop_words="english", max_features=max_features)
     tfidf_matrix = vectorizer.fit_transform(list(docs))
     feature_names = vectorizer.get_feature_names_out()
 
+    return top_terms_per_row(tfidf_matrix, feature_names, names, top_n=top_n)
+
+
+def _top_candidates(data: np.ndarray, columns: np.ndarray, top_n: int):
+    """Partial selection: the entries scoring at least the top_n-th largest value."""
+    if len(data) > top_n:
+        threshold = np.partition(data, len(data) - top_n)[len(data) - top_n]
+        keep = data >= threshold
+        data, columns = data[keep], columns[keep]
+    return data, columns
+
+
+def top_terms_per_row(matrix, feature_names, names: List[str], top_n: int = 10) -> pd.DataFrame:
+    """
+    ``TopTerms`` DataFrame from a sparse (documents x terms) score matrix.
+
+    Works on the CSR arrays directly: each row's stored values are reduced
+    with a partial selection, so nothing is densified and the cost per row
+    depends on its non-zero count, not on the vocabulary size. Only terms
+    with a non-zero score are returned; ties are broken by column order.
+    """
+    matrix = matrix.tocsr()
     records = []
-    for idx, path in enumerate(file_paths):
-        scores = tfidf_matrix[idx].toarray().flatten()
-        top_idx = scores.argsort()[::-1][:top_n]
-        terms = [feature_names[i] for i in top_idx]
-        records.append({"Document": path.name, "TopTerms": terms})
+    for idx, name in enumerate(names):
+        row = slice(matrix.indptr[idx], matrix.indptr[idx + 1])
+        data, columns = matrix.data[row], matrix.indices[row]
+        nonzero = data > 0
+        data, columns = _top_candidates(data[nonzero], columns[nonzero], top_n)
+        # Score descending, ties in column order
+        top_columns = columns[np.lexsort((columns, -data))[:top_n]]
+        records.append({"Document": name, "TopTerms": [feature_names[i] for i in top_columns]})
+
+    return pd.DataFrame(records, columns=["Document", "TopTerms"])
+
+
+def _batches(items: Iterable, batch_size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def streaming_tfidf_top_terms(
+    docs: Iterable[str],
+    names: List[str],
+    max_features: int = 1000,
+    top_n: int = 10,
+    n_features: int = 2 ** 20,
+    batch_size: int = 1000,
+) -> pd.DataFrame:
+    """
+    Out-of-core variant of :func:`compute_tfidf_top_terms`.
+
+    Pass 1 hashes documents batch by batch (``HashingVectorizer``, same
+    tokenisation and stopwords as the in-memory path) and accumulates
+    document frequencies and corpus term counts. Pass 2 re-hashes each
+    batch, applies the smoothed IDF (as ``TfidfTransformer``), restricts it
+    to the ``max_features`` most frequent buckets, L2-normalises and picks
+    the top terms per row. Only one batch and two ``n_features`` vectors
+    are held in memory.
+
+    Bucket ids are mapped back to words by hashing the document's own
+    tokens. Words that collide share a bucket and its counts, so results
+    can differ slightly from the exact path; raise ``n_features`` for
+    large vocabularies.
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer
+    from sklearn.preprocessing import normalize
+    from sklearn.utils import murmurhash3_32
+
+    if iter(docs) is docs:
+        raise ValueError("streaming TF-IDF needs re-iterable docs (e.g. a list), not an iterator")
+
+    vectorizer = HashingVectorizer(
+        stop_words="english", n_features=n_features, alternate_sign=False, norm=None
+    )
+    analyzer = vectorizer.build_analyzer()
+
+    # Pass 1: document frequencies and corpus term counts per bucket
+    n_docs = 0
+    df = np.zeros(n_features, dtype=np.int64)
+    tf = np.zeros(n_features, dtype=np.float64)
+    for batch in _batches(docs, batch_size):
+        counts = vectorizer.transform(batch).tocsc()
+        df += np.diff(counts.indptr)
+        tf += np.asarray(counts.sum(axis=0)).ravel()
+        n_docs += len(batch)
+
+    idf = np.log((1 + n_docs) / (1 + df)) + 1
+    present = np.flatnonzero(df)
+    if len(present) > max_features:
+        kept = present[np.argsort(-tf[present], kind="stable")[:max_features]]
+        weights = np.zeros(n_features)
+        weights[kept] = idf[kept]
+    else:
+        weights = np.where(df > 0, idf, 0.0)
 
-    return pd.DataFrame(records)
+    # Pass 2: weighted rows, top buckets, bucket -> word
+    records = []
+    names = iter(names)
+    for batch in _batches(docs, batch_size):
+        tfidf = normalize(vectorizer.transform(batch).multiply(weights).tocsr())
+        for idx, text in enumerate(batch):
+            row = slice(tfidf.indptr[idx], tfidf.indptr[idx + 1])
+            data, columns = tfidf.data[row], tfidf.indices[row]
+            nonzero = data > 0
+            data, columns = _top_candidates(data[nonzero], columns[nonzero], top_n)
+
+            scores = dict(zip(columns.tolist(), data.tolist()))
+            bucket_words: Dict[int, str] = {}
+            for token in sorted(set(analyzer(text))):
+                bucket = abs(murmurhash3_32(token, seed=0)) % n_features
+                if bucket in scores:
+                    bucket_words.setdefault(bucket, token)
+            # Score descending, ties alphabetically (the in-memory column order)
+            ranked = sorted(scores, key=lambda c: (-scores[c], bucket_words[c]))[:top_n]
+            records.append({"Document": next(names), "TopTerms": [bucket_words[c] for c in ranked]})
+
+    return pd.DataFrame(records, columns=["Document", "TopTerms"])
 
 
 def compute_bigram_collocations(
     tokens: Iterable[str],
     min_freq: int = 5,
     top_n: int = 50,
+    measure: str = "pmi",
 ) -> List[Tuple[str, str]]:
     """
     Find salient bigram collocations using PMI.
@@ -395,6 +607,8 @@ def compute_bigram_collocations(
         Minimum frequency a bigram must have to be considered.
     top_n : int, optional
         Number of top bigrams to return according to PMI.
+    measure : str, optional
+        Association measure (see ``ngram_counts.MEASURES``); PMI by default.
 
     Returns
     -------
@@ -404,16 +618,31 @@ def compute_bigram_collocations(
 
     Notes
     -----
-    This is a very simple collocation finder that mirrors the behaviour
-    of NLTK's ``BigramCollocationFinder`` with PMI as the association
-    measure.
+    Counts and scores are computed with :class:`NgramCounts`, vectorized
+    over the count arrays; results match NLTK's ``BigramCollocationFinder``
+    with ``BigramAssocMeasures().pmi`` (including its tie order).
+    """
+    return NgramCounts.from_tokens(tokens).nbest(measure, top_n, min_freq=min_freq)
+
+
+def filtered_tokens(text: str, stop_lang: str = "english") -> List[str]:
+    """Cleaned, stopword-filtered tokens of one document (as ``tokens_filtered``)."""
+    sw = stopword_set(stop_lang)
+    return [w for w in clean_tokens(text) if w not in sw]
+
+
+def count_document_ngrams(
+    docs: Iterable[str],
+    stop_lang: str = "english",
+    workers: int = 1,
+) -> NgramCounts:
     """
-    tokens_list = list(tokens)
-    finder = BigramCollocationFinder.from_words(tokens_list)
-    if min_freq > 1:
-        finder.apply_freq_filter(min_freq)
-    bigrams = finder.nbest(BigramAssocMeasures().pmi, top_n)
-    return bigrams
+    Unigram/bigram tables for a corpus, counted per document (optionally in
+    ``workers`` processes) and merged. Bigrams do not span documents.
+    The result can be saved, merged with other tables, and ranked with
+    ``NgramCounts.nbest``.
+    """
+    return count_documents(docs, partial(filtered_tokens, stop_lang=stop_lang), workers=workers)
 
 
 def concordance_for_keyword(
@@ -445,9 +674,42 @@ def concordance_for_keyword(
     text_obj.concordance(keyword, width=width, lines=lines)
 
 
+# Components tag_sentences_who_why does not need (entities and sentences only).
+WHO_WHY_UNUSED_COMPONENTS = (
+    "tagger", "morphologizer", "parser", "attribute_ruler", "lemmatizer",
+    "textcat", "textcat_multilabel",
+)
+WHO_LABELS = ("PERSON", "ORG", "GPE")
+WHY_PATTERN = re.compile(r"\b(because|in order to|so that)\b", flags=re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def load_who_why_pipeline(spacy_model: str = "en_core_web_sm"):
+    """
+    Load (once per process) a spaCy pipeline trimmed to entities and sentences.
+
+    The tagger, parser, lemmatizer etc. are disabled; tok2vec, ner and any
+    entity rulers stay. Sentence boundaries come
+    from the model's ``senter`` component if it has one (disabled by default
+    in the ``en_core_web_*`` models), otherwise from a rule-based
+    ``sentencizer``.
+    """
+    nlp = spacy.load(spacy_model)
+    if "senter" in nlp.component_names:
+        nlp.enable_pipe("senter")
+    for name in WHO_WHY_UNUSED_COMPONENTS:
+        if name in nlp.pipe_names:
+            nlp.disable_pipe(name)
+    if not {"senter", "sentencizer"} & set(nlp.pipe_names):
+        nlp.add_pipe("sentencizer", first=True)
+    return nlp
+
+
 def tag_sentences_who_why(
     docs: Iterable[str],
     spacy_model: str = "en_core_web_sm",
+    batch_size: int = 32,
+    n_process: int = 1,
 ) -> pd.DataFrame:
     """
     Tag sentences with simple WHO / WHY indicators.
@@ -458,6 +720,10 @@ def tag_sentences_who_why(
         Documents whose sentences will be tagged.
     spacy_model : str, optional
         Name of the spaCy language model to use.
+    batch_size : int, optional
+        Number of documents per ``nlp.pipe`` batch.
+    n_process : int, optional
+        Number of worker processes for ``nlp.pipe``.
 
     Returns
     -------
@@ -474,24 +740,23 @@ def tag_sentences_who_why(
     -----
     This is a deliberately coarse tagging scheme intended for
     exploratory filtering of sentences that talk about agents (WHO)
-    and reasons / purposes (WHY).
+    and reasons / purposes (WHY). Each document is parsed once with the
+    trimmed pipeline from :func:`load_who_why_pipeline`; sentences and
+    entities both come from that pass.
     """
-    nlp = spacy.load(spacy_model)
-
-    sentences: List[str] = []
-    for doc in docs:
-        sentences.extend(nltk.sent_tokenize(doc))
+    nlp = load_who_why_pipeline(spacy_model)
 
     records = []
-    pattern = re.compile(r"\b(because|in order to|so that)\b", flags=re.IGNORECASE)
-
-    for sent in sentences:
-        doc_spacy = nlp(sent)
-        who_flag = any(ent.label_ in ["PERSON", "ORG", "GPE"] for ent in doc_spacy.ents)
-        why_flag = bool(pattern.search(sent))
-        records.append({"sentence": sent, "WHO": who_flag, "WHY": why_flag})
-
-    return pd.DataFrame(records)
+    for doc_spacy in nlp.pipe(docs, batch_size=batch_size, n_process=n_process):
+        for sent in doc_spacy.sents:
+            text = sent.text.strip()
+            if not text:
+                continue
+            who_flag = any(ent.label_ in WHO_LABELS for ent in sent.ents)
+            why_flag = bool(WHY_PATTERN.search(text))
+            records.append({"sentence": text, "WHO": who_flag, "WHY": why_flag})
+
+    return pd.DataFrame(records, columns=["sentence", "WHO", "WHY"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+"""
+Search Index
+------------
+Handles:
+ - Full-text search over transcript segments and OCR lines of all analyses,
+   stored in an embedded SQLite FTS5 index with analysis_id and timestamps
+ - Indexing one analysis at a time (its transcript and/or OCR results
+   replace any earlier rows for that analysis), and syncing the existing
+   artifacts in outputs/transcripts and outputs/frames/csv by mtime
+ - Ranked (BM25), paginated queries with highlighted snippets
+
+Tables (outputs/search_index.sqlite3):
+    entries   FTS5 table: text (indexed), analysis_id, source ("transcript"
+              or "ocr"), start, end, speaker (stored, not indexed)
+    sources   (analysis_id, source) -> artifact path and mtime
+
+OCR runs once per second, so the same on-screen text is usually read on
+many consecutive frames; such repeats are stored as one line spanning
+start..end.
+"""
+
+import csv
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_PATH = Path("outputs/search_index.sqlite3")
+TRANSCRIPTS_DIR = Path("outputs/transcripts")
+OCR_CSV_DIR = Path("outputs/frames/csv")
+
+SOURCES = ("transcript", "ocr")
+
+# Repeated OCR text further apart than this (seconds) starts a new line
+OCR_MERGE_GAP = 1.5
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(
+    text,
+    analysis_id UNINDEXED,
+    source UNINDEXED,
+    start UNINDEXED,
+    end UNINDEXED,
+    speaker UNINDEXED,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS sources (
+    analysis_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    path TEXT,
+    mtime_ns INTEGER,
+    PRIMARY KEY (analysis_id, source)
+);
+"""
+
+# "quoted phrases", words and prefix* terms; everything else is dropped
+QUERY_PATTERN = re.compile(r'"([^"]+)"|(\w+)(\*?)')
+
+
+def to_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word or
+    "quoted phrase" must occur (implicit AND); a trailing * keeps prefix
+    matching. FTS5 operators in user input are treated as plain words.
+    """
+    parts = []
+    for phrase, word, star in QUERY_PATTERN.findall(query):
+        if phrase.strip():
+            parts.append('"' + phrase.replace('"', "") + '"')
+        elif word:
+            parts.append(f'"{word}"{star}')
+    return " ".join(parts)
+
+
+def merge_ocr_lines(ocr_results: Iterable[dict], gap: float = OCR_MERGE_GAP) -> List[dict]:
+    """
+    Collapse OCR detections of the same text on consecutive samples into one
+    line with start/end. Input dicts need "timestamp" and "text".
+    """
+    open_lines: Dict[str, dict] = {}
+    lines = []
+    for row in sorted(ocr_results, key=lambda r: float(r["timestamp"])):
+        text = " ".join(str(row.get("text") or "").split())
+        if not text:
+            continue
+        timestamp = float(row["timestamp"])
+        line = open_lines.get(text.lower())
+        if line is not None and timestamp - line["end"] <= gap:
+            line["end"] = timestamp
+            continue
+        line = {"text": text, "start": timestamp, "end": timestamp}
+        open_lines[text.lower()] = line
+        lines.append(line)
+    return lines
+
+
+def read_ocr_csv(path) -> List[dict]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return [row for row in csv.DictReader(f) if row.get("timestamp")]
+
+
+class SearchIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        # One connection shared by the API worker threads, serialized by _lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---------------------------------------------------------------
+    # Updates
+    # ---------------------------------------------------------------
+
+    def _replace(self, analysis_id: str, source: str, rows: List[tuple], path=None, mtime_ns=None) -> int:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM entries WHERE analysis_id = ? AND source = ?", (analysis_id, source)
+            )
+            self._conn.executemany(
+                "INSERT INTO entries (text, analysis_id, source, start, end, speaker) VALUES (?, ?, ?, ?, ?, ?)",
+                [(text, analysis_id, source, start, end, speaker) for text, start, end, speaker in rows],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                (analysis_id, source, str(path) if path else None, mtime_ns),
+            )
+        logger.info(f"Search index: {analysis_id} ({len(rows)} {source} lines)")
+        return len(rows)
+
+    def index_transcript(self, analysis_id: str, segments: Iterable[dict], path=None) -> int:
+        """Index transcript segments (dicts with text, start, end, optional speaker)."""
+        rows = [
+            (seg["text"].strip(), seg.get("start"), seg.get("end"), seg.get("speaker"))
+            for seg in segments
+            if seg.get("text", "").strip()
+        ]
+        mtime_ns = Path(path).stat().st_mtime_ns if path and Path(path).exists() else None
+        return self._replace(analysis_id, "transcript", rows, path, mtime_ns)
+
+    def index_ocr(self, analysis_id: str, ocr_results: Iterable[dict], path=None) -> int:
+        """Index OCR detections (dicts with timestamp and text, as FrameAnalysisPipeline produces)."""
+        rows = [(line["text"], line["start"], line["end"], None) for line in merge_ocr_lines(ocr_results)]
+        mtime_ns = Path(path).stat().st_mtime_ns if path and Path(path).exists() else None
+        return self._replace(analysis_id, "ocr", rows, path, mtime_ns)
+
+    def remove(self, analysis_id: str) -> bool:
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM entries WHERE analysis_id = ?", (analysis_id,)).rowcount
+            self._conn.execute("DELETE FROM sources WHERE analysis_id = ?", (analysis_id,))
+        return deleted > 0
+
+    def sync(self, transcripts_dir=TRANSCRIPTS_DIR, ocr_csv_dir=OCR_CSV_DIR) -> Dict[str, int]:
+        """
+        Index transcript JSON files (<analysis_id>_transcript.json) and the
+        newest OCR CSV per analysis (<analysis_id>_ocr_<timestamp>.csv) that
+        are new or changed since they were last indexed.
+        """
+        artifacts = {}
+        for path in sorted(Path(transcripts_dir).glob("*_transcript.json")):
+            artifacts[(path.name[: -len("_transcript.json")], "transcript")] = path
+        # Names end in a sortable timestamp, so the last one per analysis wins
+        for path in sorted(Path(ocr_csv_dir).glob("*_ocr_*.csv")):
+            artifacts[(path.name.rsplit("_ocr_", 1)[0], "ocr")] = path
+
+        summary = {"indexed": 0, "unchanged": 0}
+        with self._lock:
+            known = {
+                (analysis_id, source): (path, mtime_ns)
+                for analysis_id, source, path, mtime_ns in self._conn.execute("SELECT * FROM sources")
+            }
+            for (analysis_id, source), path in artifacts.items():
+                if known.get((analysis_id, source)) == (str(path), path.stat().st_mtime_ns):
+                    summary["unchanged"] += 1
+                    continue
+                if source == "transcript":
+                    with open(path, "r", encoding="utf-8") as f:
+                        self.index_transcript(analysis_id, json.load(f).get("segments", []), path)
+                else:
+                    self.index_ocr(analysis_id, read_ocr_csv(path), path)
+                summary["indexed"] += 1
+        return summary
+
+    # ---------------------------------------------------------------
+    # Queries
+    # ---------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        analysis_id: Optional[str] = None,
+        source: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> dict:
+        """
+        Ranked full-text search (best match first).
+
+        Returns {"query", "total", "results"}; each result has analysis_id,
+        source, start, end, speaker, text, snippet (matches wrapped in
+        <mark></mark>) and score (BM25, lower is better).
+        """
+        if source is not None and source not in SOURCES:
+            raise ValueError(f"Unknown source: {source}. Available: {', '.join(SOURCES)}")
+        match = to_match_query(query)
+        if not match:
+            return {"query": query, "total": 0, "results": []}
+
+        where = "entries MATCH ?"
+        params = [match]
+        if analysis_id is not None:
+            where += " AND analysis_id = ?"
+            params.append(analysis_id)
+        if source is not None:
+            where += " AND source = ?"
+            params.append(source)
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM entries WHERE {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT analysis_id, source, start, end, speaker, text,
+                       snippet(entries, 0, '<mark>', '</mark>', '…', 16), bm25(entries)
+                FROM entries WHERE {where}
+                ORDER BY bm25(entries), analysis_id, start
+                LIMIT ? OFFSET ?
+                """,
+                params + [limit, offset],
+            ).fetchall()
+
+        keys = ("analysis_id", "source", "start", "end", "speaker", "text", "snippet", "score")
+        return {"query": query, "total": total, "results": [dict(zip(keys, row)) for row in rows]}
+
+
+_shared: Dict[str, SearchIndex] = {}
+_shared_lock = threading.Lock()
+
+
+def get_search_index(path=INDEX_PATH) -> SearchIndex:
+    """Process-wide SearchIndex per database file."""
+    key = str(Path(path).resolve())
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = SearchIndex(path)
+        return _shared[key]
@@ -0,0 +1,80 @@
+"""
+Transcript Cache
+----------------
+Persistent cache of transcripts keyed by:
+ - a hash of the decoded PCM audio (not the container bytes, so re-uploads
+   and re-muxed files with identical audio still hit)
+ - the transcription backend and model name
+ - the decoding options that influence the output
+
+Entries are plain JSON files under outputs/cache/transcripts, stored by a
+ResultCache: size-bounded, least recently used entries are evicted first.
+Set VAA1_TRANSCRIPT_CACHE_MB to change the bound (0 disables the cache).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.backend.utils.logger import get_logger
+from src.backend.utils.result_cache import MISSING, ResultCache
+
+logger = get_logger(__name__)
+
+CACHE_DIR = Path("outputs/cache/transcripts")
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("VAA1_TRANSCRIPT_CACHE_MB", "256")) * 2**20)
+
+# Bump when the transcript format or transcription logic changes
+CACHE_VERSION = 1
+
+
+def audio_fingerprint(pcm: np.ndarray) -> str:
+    """SHA-256 of the decoded float32 PCM samples."""
+    samples = np.ascontiguousarray(pcm, dtype=np.float32)
+    return hashlib.sha256(samples.tobytes()).hexdigest()
+
+
+class TranscriptCache:
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._store = ResultCache(self.cache_dir, max_bytes=max_bytes)
+        # Entries written before the size bound were stored flat; move them under the store
+        for path in self.cache_dir.glob("*.json"):
+            target = self._store._path(path.stem)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            path.replace(target)
+
+    def key(self, fingerprint: str, backend: str, model_name: str, options: dict = None) -> str:
+        """Cache key for one audio fingerprint + model + decoding options."""
+        payload = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "audio": fingerprint,
+                "backend": backend,
+                "model": model_name,
+                "options": options or {},
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return the cached transcript, or None on a miss."""
+        transcript = self._store.get(key, MISSING)
+        return None if transcript is MISSING else transcript
+
+    def put(self, key: str, transcript: dict):
+        """
+        Store a transcript (written atomically via a per-writer temp file).
+        A failed write is logged and ignored: the transcript itself is done.
+        """
+        try:
+            self._store.put(key, transcript)
+        except OSError as e:
+            logger.warning(f"Could not write transcript cache entry {key}: {e}")
@@ -0,0 +1,98 @@
+"""
+Transcript Streaming
+--------------------
+Handles:
+ - Collecting transcript segments while transcription is still running
+ - Appending each segment to a partial transcript file (JSON lines)
+ - Pushing segments to subscribers (e.g. the SSE endpoint in api_server)
+ - Removing the partial file once the final transcript has been saved
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TranscriptStream:
+    """
+    Thread-safe sink for incrementally produced transcript segments.
+
+    The transcription stage calls `publish(segment)` (usable directly as an
+    on_segment callback) and `close()` when done. Subscribers receive every
+    new segment, then `None` once the stream is closed.
+    """
+
+    def __init__(self, partial_path: Optional[str] = None):
+        self.segments: List[dict] = []
+        self.closed = False
+        self.partial_path = Path(partial_path) if partial_path else None
+        self._subscribers: List[Callable[[Optional[dict]], None]] = []
+        self._lock = threading.Lock()
+        self._file = None
+
+        if self.partial_path:
+            self.partial_path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.partial_path, "w", encoding="utf-8")
+
+    def publish(self, segment: dict):
+        """Record a new segment and forward it to subscribers."""
+        with self._lock:
+            if self.closed:
+                return
+            self.segments.append(segment)
+            if self._file:
+                self._file.write(json.dumps(segment, ensure_ascii=False) + "\n")
+                self._file.flush()
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            callback(segment)
+
+    def close(self):
+        """Mark the stream finished and notify subscribers with None."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            if self._file:
+                self._file.close()
+                self._file = None
+            subscribers = list(self._subscribers)
+
+        logger.info(f"Transcript stream closed after {len(self.segments)} segments")
+        for callback in subscribers:
+            callback(None)
+
+    def discard(self):
+        """Close the stream and delete the partial file (the final transcript supersedes it)."""
+        self.close()
+        if self.partial_path:
+            self.partial_path.unlink(missing_ok=True)
+
+    def subscribe(self, callback: Callable[[Optional[dict]], None]) -> List[dict]:
+        """
+        Register a callback for new segments.
+
+        Returns the segments published so far; every later segment goes to
+        the callback, so nothing is missed or delivered twice. If the stream
+        is already closed the callback immediately receives None.
+        """
+        with self._lock:
+            backlog = list(self.segments)
+            closed = self.closed
+            if not closed:
+                self._subscribers.append(callback)
+
+        if closed:
+            callback(None)
+        return backlog
+
+    def unsubscribe(self, callback: Callable[[Optional[dict]], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
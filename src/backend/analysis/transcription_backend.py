@@ -0,0 +1,147 @@
+"""
+Transcription Backends
+----------------------
+Selectable speech-to-text engines that all return the same structure:
+    {"language": str, "segments": [{"start": float, "end": float, "text": str}, ...]}
+
+Available backends:
+ - "whisper":        openai-whisper (PyTorch, fp32 on CPU)
+ - "faster-whisper": CTranslate2 re-implementation of Whisper, INT8 on CPU
+
+The default backend can be set with the VAA1_TRANSCRIPTION_BACKEND
+environment variable. Loaded models are cached per process.
+"""
+
+import importlib.util
+import os
+from typing import Dict, Tuple
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Check if faster-whisper is available (imported on first use; it pulls in CTranslate2)
+FASTER_WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
+DEFAULT_BACKEND = os.environ.get("VAA1_TRANSCRIPTION_BACKEND", "whisper")
+
+
+class TranscriptionBackend:
+    """Base class for speech-to-text engines."""
+
+    name = "base"
+
+    def __init__(self, model_name: str = "base"):
+        self.model_name = model_name
+
+    def transcribe(self, audio, on_segment=None) -> dict:
+        """
+        Transcribe audio.
+
+        Args:
+            audio: Path to an audio file, or a mono float32 NumPy array at 16 kHz.
+            on_segment: Optional callback invoked with each segment as soon as
+                the engine produces it.
+
+        Returns:
+            dict: {"language": str, "segments": [{"start", "end", "text"}, ...]}
+        """
+        raise NotImplementedError
+
+
+class WhisperBackend(TranscriptionBackend):
+    """openai-whisper backend."""
+
+    name = "whisper"
+
+    def __init__(self, model_name: str = "base"):
+        super().__init__(model_name)
+        import whisper
+
+        logger.info(f"Loading Whisper model: {model_name}")
+        self.model = whisper.load_model(model_name)
+
+    def transcribe(self, audio, on_segment=None) -> dict:
+        if hasattr(audio, "__fspath__"):
+            audio = str(audio)
+        result = self.model.transcribe(audio, fp16=False)
+
+        # openai-whisper only returns once the whole input is decoded
+        segments = []
+        for seg in result["segments"]:
+            segment = {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+            segments.append(segment)
+            if on_segment:
+                on_segment(segment)
+        return {"language": result.get("language", "unknown"), "segments": segments}
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper (CTranslate2) backend, INT8 quantized by default."""
+
+    name = "faster-whisper"
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        beam_size: int = 5,
+    ):
+        super().__init__(model_name)
+        if not FASTER_WHISPER_AVAILABLE:
+            raise RuntimeError(
+                "faster-whisper is not installed. Install it using: pip install faster-whisper"
+            )
+
+        from faster_whisper import WhisperModel
+
+        logger.info(f"Loading faster-whisper model: {model_name} ({device}, {compute_type})")
+        self.beam_size = beam_size
+        self.model = WhisperModel(
+            model_name, device=device, compute_type=compute_type, cpu_threads=cpu_threads
+        )
+
+    def transcribe(self, audio, on_segment=None) -> dict:
+        if hasattr(audio, "__fspath__"):
+            audio = str(audio)
+        # Segments are produced lazily while decoding progresses
+        segment_iter, info = self.model.transcribe(audio, beam_size=self.beam_size)
+
+        segments = []
+        for seg in segment_iter:
+            segment = {"start": seg.start, "end": seg.end, "text": seg.text}
+            segments.append(segment)
+            if on_segment:
+                on_segment(segment)
+        return {"language": info.language or "unknown", "segments": segments}
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+}
+
+_backend_cache: Dict[Tuple, TranscriptionBackend] = {}
+
+
+def get_transcription_backend(name: str = None, model_name: str = "base", **options) -> TranscriptionBackend:
+    """
+    Return a (cached) transcription backend instance.
+
+    Args:
+        name (str): Backend name ("whisper" or "faster-whisper"). Defaults to DEFAULT_BACKEND.
+        model_name (str): Model size/name or path to a local model directory.
+        **options: Backend-specific options (e.g. compute_type for faster-whisper).
+    """
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown transcription backend: {name}. Available: {', '.join(BACKENDS)}"
+        )
+
+    key = (name, model_name, tuple(sorted(options.items())))
+    if key not in _backend_cache:
+        _backend_cache[key] = BACKENDS[name](model_name, **options)
+    return _backend_cache[key]
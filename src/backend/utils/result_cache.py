@@ -0,0 +1,197 @@
+"""
+Result Cache
+------------
+Persistent cache of NLP stage results (POS analysis, NLPProcessor,
+summaries) keyed by:
+ - a hash of the input text
+ - the stage name and its result-format version
+ - the model name (and model version where known)
+ - the stage parameters that influence the output
+
+Entries are plain JSON files under outputs/cache/results. The directory is
+bounded in size: reads refresh an entry's mtime, and once the total
+exceeds max_bytes the least recently used entries are deleted down to
+LOW_WATER * max_bytes, so eviction (a sort over all entries) runs only
+after another ~10% of the budget has been written.
+
+Set VAA1_RESULT_CACHE_MB to change the bound (0 disables the cache).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.backend.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR = Path("outputs/cache/results")
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("VAA1_RESULT_CACHE_MB", "256")) * 2**20)
+
+# Eviction target as a fraction of max_bytes
+LOW_WATER = 0.9
+
+# Marks a miss (None is a valid cached value)
+MISSING = object()
+
+
+def text_fingerprint(text: str) -> str:
+    """SHA-256 of the UTF-8 text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def spacy_model_id(nlp) -> str:
+    """
+    Name, version and components of a loaded spaCy pipeline, disabled ones
+    marked with "!" (e.g. "en_core_web_sm@3.7.1[tok2vec,tagger,parser,!ner]").
+    """
+    meta = getattr(nlp, "meta", {}) or {}
+    disabled = set(getattr(nlp, "disabled", ()))
+    components = ",".join(
+        f"!{name}" if name in disabled else name for name in getattr(nlp, "component_names", ())
+    )
+    return f"{meta.get('lang', '')}_{meta.get('name', '')}@{meta.get('version', '')}[{components}]"
+
+
+class ResultCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # path -> (mtime_ns, size); scanned once, then kept up to date
+        self._entries: Optional[Dict[Path, Tuple[int, int]]] = None
+        self._total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def key(self, stage: str, text: str, model: str = "", version: int = 1, params: dict = None) -> str:
+        """Cache key for one input text + stage + model + parameters."""
+        payload = json.dumps(
+            {
+                "stage": stage,
+                "version": version,
+                "text": text_fingerprint(text),
+                "model": model,
+                "params": params or {},
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        if self._entries is None:
+            self._entries = {}
+            for path in self.cache_dir.glob("*/*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                self._entries[path] = (stat.st_mtime_ns, stat.st_size)
+            self._total = sum(size for _, size in self._entries.values())
+        return self._entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value (and mark it recently used), or default on a miss."""
+        if not self.enabled:
+            return default
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return default
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable result cache entry {path}: {e}")
+            return default
+
+        with self._lock:
+            try:
+                self._record(path)
+            except FileNotFoundError:
+                # Evicted meanwhile (e.g. by another process)
+                pass
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a JSON-serializable value (written atomically), then evict if over budget."""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per process and thread, so concurrent writers of one key never share a temp file
+        tmp_path = path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        tmp_path.replace(path)
+
+        with self._lock:
+            self._record(path)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _record(self, path: Path):
+        stat = path.stat()
+        entries = self._scan()
+        self._total += stat.st_size - entries.get(path, (0, 0))[1]
+        entries[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def _evict(self):
+        # Oldest first, down to the low-water mark; the newest entry stays
+        # even if it alone exceeds the budget
+        target = self.max_bytes * LOW_WATER
+        for path, (_, size) in sorted(self._entries.items(), key=lambda item: item[1][0])[:-1]:
+            if self._total <= target:
+                break
+            path.unlink(missing_ok=True)
+            del self._entries[path]
+            self._total -= size
+        logger.info(f"Result cache evicted to {self._total / 2**20:.1f} MB ({len(self._entries)} entries)")
+
+    def get_or_compute(
+        self,
+        stage: str,
+        text: str,
+        compute: Callable[[], Any],
+        model: str = "",
+        version: int = 1,
+        params: dict = None,
+    ) -> Any:
+        """Cached result of compute() for this text/stage/model/params; computed and stored on a miss."""
+        key = self.key(stage, text, model=model, version=version, params=params)
+        value = self.get(key, MISSING)
+        if value is not MISSING:
+            logger.info(f"Result cache hit: {stage} ({model or 'no model'})")
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            for path in self._scan():
+                path.unlink(missing_ok=True)
+            self._entries, self._total = {}, 0
+
+
+_shared: Dict[str, ResultCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_result_cache(cache_dir=CACHE_DIR) -> ResultCache:
+    """Process-wide ResultCache per directory."""
+    key = str(Path(cache_dir).resolve())
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = ResultCache(cache_dir)
+        return _shared[key]
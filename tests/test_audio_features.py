@@ -0,0 +1,46 @@
+# test_audio_features.py
+# Loudness / spectral feature track and its on-disk format.
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis.pipeline_audio_features import (
+    FEATURE_COLUMNS,
+    compute_feature_track,
+    load_feature_track,
+    save_feature_track,
+)
+
+SR = 16000
+
+
+def _sine(freq: float, seconds: float, amplitude: float = 1.0) -> np.ndarray:
+    t = np.arange(int(seconds * SR), dtype=np.float32) / SR
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_sine_levels():
+    features, header = compute_feature_track(_sine(997, 5), SR)
+    rms_db, lufs, centroid, zcr = features[len(features) // 2]
+
+    assert rms_db == pytest.approx(-3.01, abs=0.05)
+    # BS.1770 reference: a full-scale 997 Hz sine reads -3.01 LUFS
+    assert lufs == pytest.approx(-3.01, abs=0.1)
+    assert header["integrated_lufs"] == pytest.approx(-3.01, abs=0.1)
+    assert centroid == pytest.approx(997, abs=5)
+    assert zcr == pytest.approx(2 * 997 / SR, rel=0.02)
+
+
+def test_silence_has_no_integrated_loudness():
+    _, header = compute_feature_track(np.zeros(2 * SR, dtype=np.float32), SR)
+    assert header["integrated_lufs"] is None
+
+
+def test_round_trip(tmp_path):
+    features, header = compute_feature_track(_sine(440, 3, 0.1), SR)
+    header_path = save_feature_track(features, header, tmp_path / "clip")
+
+    loaded, loaded_header = load_feature_track(header_path)
+    assert loaded_header["columns"] == list(FEATURE_COLUMNS)
+    assert loaded.dtype == np.float32 and loaded.shape == features.shape
+    np.testing.assert_array_equal(loaded, features)
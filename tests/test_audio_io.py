@@ -0,0 +1,130 @@
+# test_audio_io.py
+# In-memory audio decoding and WAV I/O: dtype/shape, WAV round trip, FFmpeg
+# pipe chunking, no deadlock on a chatty stderr, and no temp directory when
+# the WAV is not kept.
+import io
+import shutil
+import subprocess
+import sys
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis import pipeline_ingestion
+from src.backend.analysis.audio_io import SAMPLE_RATE, decode_audio, iter_audio_chunks, load_wav, write_wav
+
+
+def tone(seconds=1.0, freq=440.0):
+    t = np.arange(int(seconds * SAMPLE_RATE), dtype=np.float32) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+class FakeFFmpeg:
+    """Popen stand-in whose stdout yields the given s16le bytes."""
+
+    def __init__(self, raw, returncode=0, stderr=b""):
+        self.raw, self.returncode, self.stderr_bytes = raw, returncode, stderr
+        self.cmd = None
+
+    def __call__(self, cmd, stdout=None, stderr=None):
+        self.cmd = cmd
+        self.stdout = io.BytesIO(self.raw)
+        self.stderr = io.BytesIO(self.stderr_bytes)
+        return self
+
+    def wait(self):
+        return self.returncode
+
+
+def test_write_wav_round_trip(tmp_path):
+    pcm = tone()
+    pcm[:3] = [1.5, -1.5, 0.0]  # out of range samples are clipped
+    path = write_wav(pcm, tmp_path / "nested" / "clip.wav")
+
+    loaded = load_wav(path)
+    assert loaded.dtype == np.float32 and loaded.shape == pcm.shape
+    assert np.abs(loaded - np.clip(pcm, -1.0, 1.0)).max() < 2 / 32768
+    # 16-bit mono, 44-byte header
+    assert (tmp_path / "nested" / "clip.wav").stat().st_size == 44 + 2 * len(pcm)
+
+
+def test_iter_audio_chunks_boundaries(monkeypatch):
+    samples = np.arange(-2500, 2500, dtype=np.int16) * 13
+    # An odd trailing byte (truncated stream) is dropped
+    ffmpeg = FakeFFmpeg(samples.tobytes() + b"\x01")
+    monkeypatch.setattr(subprocess, "Popen", ffmpeg)
+
+    chunks = list(iter_audio_chunks("clip.mp4", sample_rate=1000, chunk_seconds=2.0))
+    assert [len(c) for c in chunks] == [2000, 2000, 1000]
+    assert all(c.dtype == np.float32 for c in chunks)
+    np.testing.assert_array_equal(np.concatenate(chunks), samples.astype(np.float32) / 32768.0)
+    assert ffmpeg.cmd[ffmpeg.cmd.index("-ar") + 1] == "1000"
+
+
+def test_decode_audio_empty_and_failure(monkeypatch):
+    monkeypatch.setattr(subprocess, "Popen", FakeFFmpeg(b""))
+    empty = decode_audio("silent.mp4")
+    assert empty.dtype == np.float32 and empty.shape == (0,)
+
+    monkeypatch.setattr(subprocess, "Popen", FakeFFmpeg(b"", returncode=1, stderr=b"Invalid data"))
+    with pytest.raises(RuntimeError, match="Invalid data"):
+        decode_audio("broken.mp4")
+
+
+def test_iter_audio_chunks_drains_stderr(monkeypatch):
+    # More stderr output than a pipe buffer holds, written before any stdout
+    script = (
+        "import sys; sys.stderr.write('w' * 1_000_000); sys.stderr.flush(); "
+        "sys.stdout.buffer.write(b'\\x00\\x01' * 1000); sys.exit(1)"
+    )
+    popen = subprocess.Popen
+    monkeypatch.setattr(
+        subprocess, "Popen", lambda cmd, **kwargs: popen([sys.executable, "-c", script], **kwargs)
+    )
+    outcome = []
+
+    def decode():
+        try:
+            decode_audio("chatty.mp4")
+        except RuntimeError as e:
+            outcome.append(e)
+
+    worker = threading.Thread(target=decode, daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+    assert not worker.is_alive(), "decoding deadlocked on a full stderr pipe"
+    assert len(outcome) == 1 and str(outcome[0]).endswith("w" * 100)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_decode_audio_matches_wav(tmp_path):
+    pcm = tone(2.5)
+    path = write_wav(pcm, tmp_path / "clip.wav")
+    decoded = decode_audio(path)
+    assert decoded.dtype == np.float32 and decoded.shape == pcm.shape
+    np.testing.assert_array_equal(decoded, load_wav(path))
+
+
+def test_ingestion_creates_temp_dir_only_for_kept_audio(tmp_path, monkeypatch):
+    pcm = tone()
+    monkeypatch.setattr(pipeline_ingestion, "validate_video", lambda path, media_info=None: {"duration": 1.0})
+    monkeypatch.setattr(pipeline_ingestion, "extract_audio_pcm", lambda path: pcm)
+    temp_dirs = []
+
+    def mkdtemp(prefix=""):
+        temp_dirs.append(tmp_path / f"{prefix}1")
+        temp_dirs[-1].mkdir()
+        return str(temp_dirs[-1])
+
+    monkeypatch.setattr(pipeline_ingestion.tempfile, "mkdtemp", mkdtemp)
+
+    result = pipeline_ingestion.run_ingestion_pipeline("talk.mp4", transcribe=False, keep_audio=False)
+    assert result["audio_path"] is None and result["pcm"] is pcm
+    assert temp_dirs == []
+
+    result = pipeline_ingestion.run_ingestion_pipeline("talk.mp4", transcribe=False, keep_audio=True)
+    assert len(temp_dirs) == 1
+    assert result["audio_path"] == str(temp_dirs[0] / "talk.wav")
+    assert len(load_wav(result["audio_path"])) == len(pcm)
@@ -0,0 +1,139 @@
+# test_corpus_index.py
+# Incremental corpus index: updates match a fresh build and survive a reload
+# (journal replay and compaction included).
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("nltk")
+pytest.importorskip("sklearn")
+
+from src.backend.analysis.corpus_index import CorpusIndex
+from src.backend.analysis.quantitative_analysis import ensure_nltk_resources
+
+
+@pytest.fixture(autouse=True)
+def nltk_resources():
+    try:
+        ensure_nltk_resources()
+    except LookupError as e:
+        pytest.skip(str(e))
+
+
+def _snapshot(index):
+    terms = {index.vocab[i]: int(index.tf[i]) for i in range(len(index.vocab)) if index.tf[i]}
+    return terms, index.ngrams, sorted(index.stats_df().values.tolist())
+
+
+def test_incremental_updates_match_fresh_build(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "a.txt").write_text("Red apples grow fast. Red apples taste sweet.")
+    (data / "b.txt").write_text("Green pears grow slowly.")
+
+    index = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    assert index.sync_directory(data)["added"] == 2
+    index.add_document("transcript:1", "Red apples and green pears.", name="1_transcript.txt")
+
+    (data / "b.txt").unlink()
+    (data / "c.txt").write_text("Blue plums grow fast.")
+    summary = index.sync_directory(data)
+    assert (summary["added"], summary["removed"], summary["unchanged"]) == (1, 1, 1)
+
+    fresh = CorpusIndex(tmp_path / "fresh", spacy_model=str(tmp_path / "no-model"))
+    fresh.sync_directory(data)
+    fresh.add_document("transcript:1", "Red apples and green pears.", name="1_transcript.txt")
+    assert _snapshot(index) == _snapshot(fresh)
+
+    reloaded = CorpusIndex(tmp_path / "index")
+    assert _snapshot(reloaded) == _snapshot(index)
+    assert reloaded.token_info()["freq_dist"]["apples"] == 3
+
+
+def test_journal_compaction_and_reload(tmp_path, monkeypatch):
+    import src.backend.analysis.corpus_index as corpus_index
+
+    monkeypatch.setattr(corpus_index, "MIN_COMPACT_ENTRIES", 6)
+    index = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    for i in range(3):
+        index.add_document(f"doc:{i}", f"Apples number {i} grow. Pears follow apples.")
+    index.add_document("doc:0", "Plums replace apples.")
+    index.remove_document("doc:1")
+    # 3 adds + replace (remove+add) + remove = 6 journal entries: compacted
+    assert not (tmp_path / "index" / "journal.jsonl").exists()
+    assert len(list((tmp_path / "index" / "docs").glob("*.npz"))) == 2
+    index.add_document("doc:3", "Cherries and plums.")
+
+    reloaded = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    assert _snapshot(reloaded) == _snapshot(index)
+
+    fresh = CorpusIndex(tmp_path / "fresh", spacy_model=str(tmp_path / "no-model"))
+    fresh.add_document("doc:2", "Apples number 2 grow. Pears follow apples.")
+    fresh.add_document("doc:0", "Plums replace apples.")
+    fresh.add_document("doc:3", "Cherries and plums.")
+    assert _snapshot(reloaded) == _snapshot(fresh)
+
+
+def test_sync_directory_saves_once(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    for i in range(5):
+        (data / f"{i}.txt").write_text(f"Document {i} about apples.")
+
+    index = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    saves = []
+    original = index._save
+    monkeypatch.setattr(index, "_save", lambda entries, new_terms: saves.append(len(entries)) or original(entries, new_terms))
+    assert index.sync_directory(data)["added"] == 5
+    assert saves == [5]
+
+
+def test_settings_change_rebuilds_after_closing_snapshot(tmp_path, monkeypatch):
+    import src.backend.analysis.corpus_index as corpus_index
+
+    monkeypatch.setattr(corpus_index, "MIN_COMPACT_ENTRIES", 1)
+    index = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    index.add_document("doc:0", "Apples grow fast.")
+    assert (tmp_path / "index" / "snapshot.npz").exists()
+
+    # Deleting the snapshot while np.load still has it open fails on Windows
+    original_np_load = corpus_index.np.load
+    open_files = []
+
+    class TrackedLoad:
+        def __init__(self, path):
+            self.npz = original_np_load(path)
+
+        def __enter__(self):
+            open_files.append(True)
+            return self.npz.__enter__()
+
+        def __exit__(self, *exc):
+            open_files.pop()
+            return self.npz.__exit__(*exc)
+
+    original_unlink = corpus_index.Path.unlink
+
+    def unlink(path, *args, **kwargs):
+        assert not open_files, f"{path} deleted while the snapshot is open"
+        return original_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(corpus_index.np, "load", TrackedLoad)
+    monkeypatch.setattr(corpus_index.Path, "unlink", unlink)
+    rebuilt = CorpusIndex(tmp_path / "index", stop_lang="german", spacy_model=str(tmp_path / "no-model"))
+    assert rebuilt.documents == {}
+    assert not (tmp_path / "index" / "snapshot.npz").exists()
+
+
+def test_tfidf_reads_document_counts_once(tmp_path, monkeypatch):
+    index = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    index.add_document("a", "Red apples grow fast. Red apples taste sweet.")
+    index.add_document("b", "Green pears grow slowly.")
+    first = index.tfidf_top_terms()
+
+    reloaded = CorpusIndex(tmp_path / "index", spacy_model=str(tmp_path / "no-model"))
+    loads = []
+    original = reloaded._load_doc
+    monkeypatch.setattr(reloaded, "_load_doc", lambda doc_id: loads.append(doc_id) or original(doc_id))
+    for _ in range(3):
+        assert reloaded.tfidf_top_terms().equals(first)
+    assert len(loads) <= 2
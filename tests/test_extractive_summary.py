@@ -0,0 +1,47 @@
+# test_extractive_summary.py
+# Extractive summarizer: matrix-free TextRank equals dense PageRank on the
+# similarity graph; key sentences keep their segment timestamps.
+import numpy as np
+import pytest
+
+pytest.importorskip("sklearn")
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.backend.analysis.extractive_summary import extractive_summary, textrank_scores
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "text": "The city council approved the new budget. It was a long night."},
+    {"start": 4.0, "end": 9.0, "text": "The budget funds schools and the city parks.", "speaker": "SPEAKER_01"},
+    {"start": 9.0, "end": 12.0, "text": "Council members debated school funding for hours."},
+    {"start": 12.0, "end": 14.0, "text": "Weather tomorrow looks sunny."},
+]
+
+
+def test_textrank_matches_dense_pagerank():
+    sentences = [s for seg in SEGMENTS for s in seg["text"].split(". ")]
+    X = TfidfVectorizer().fit_transform(sentences)
+
+    similarity = (X @ X.T).toarray()
+    np.fill_diagonal(similarity, 0)
+    n = len(sentences)
+    degree = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no words with any other link to every sentence
+    transition = np.where(degree > 0, similarity / np.where(degree > 0, degree, 1), 1 / n)
+    expected = np.full(n, 1 / n)
+    for _ in range(200):
+        expected = 0.15 / n + 0.85 * transition.T @ expected
+
+    assert np.allclose(textrank_scores(X, tol=1e-12), expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("method", ["textrank", "centroid"])
+def test_key_sentences_are_timestamped_and_in_order(method):
+    result = extractive_summary(SEGMENTS, num_sentences=2, method=method)
+
+    key = result["key_sentences"]
+    assert result["num_sentences"] == 5
+    assert [s["start"] for s in key] == sorted(s["start"] for s in key)
+    assert "Weather tomorrow looks sunny." not in result["summary"]
+    budget = next(s for s in key if s["text"] == "The budget funds schools and the city parks.")
+    assert (budget["start"], budget["end"], budget["speaker"]) == (4.0, 9.0, "SPEAKER_01")
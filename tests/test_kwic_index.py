@@ -0,0 +1,58 @@
+# test_kwic_index.py
+# Positional KWIC index: context windows (in tokens, punctuation included),
+# timestamps, re-indexing and sync.
+import json
+
+import pytest
+
+from src.backend.analysis.kwic_index import KwicIndex
+
+
+SEGMENTS = [
+    {"start": 0.0, "end": 2.5, "text": "Human rights matter.", "speaker": "SPEAKER_00"},
+    {"start": 2.5, "end": 6.0, "text": "We defend the rights of every person, always."},
+]
+
+
+def test_kwic_returns_context_and_segment_times(tmp_path):
+    index = KwicIndex(tmp_path / "kwic.sqlite3")
+    index.add_transcript("transcript:a", SEGMENTS, name="a_transcript.json")
+
+    lines = index.kwic("Rights", window=3)
+    assert index.count("RIGHTS") == 2
+    assert [(l["left"], l["keyword"], l["right"]) for l in lines] == [
+        ("Human", "rights", "matter. We"),
+        ("We defend the", "rights", "of every person"),
+    ]
+    assert [(l["start"], l["end"], l["speaker"]) for l in lines] == [(0.0, 2.5, "SPEAKER_00"), (2.5, 6.0, None)]
+    assert index.kwic("rights", limit=1, offset=1)[0]["position"] == lines[1]["position"]
+
+
+def test_count_and_kwic_normalize_the_query_alike(tmp_path):
+    index = KwicIndex(tmp_path / "kwic.sqlite3")
+    index.add_transcript("transcript:a", SEGMENTS)
+
+    for query in (" rights ", "Rights\n", "rights"):
+        assert index.count(query) == len(index.kwic(query)) == 2
+    for query in ("human rights", "", "  "):
+        with pytest.raises(ValueError):
+            index.count(query)
+        with pytest.raises(ValueError):
+            index.kwic(query)
+
+
+def test_reindex_remove_and_sync(tmp_path):
+    index = KwicIndex(tmp_path / "kwic.sqlite3")
+    index.add_transcript("transcript:a", SEGMENTS)
+    index.add_transcript("transcript:a", [{"start": 1.0, "end": 2.0, "text": "No match here."}])
+    assert index.count("rights") == 0
+
+    transcripts = tmp_path / "transcripts"
+    transcripts.mkdir()
+    (transcripts / "b_transcript.json").write_text(json.dumps({"segments": SEGMENTS}))
+    assert index.sync_transcripts(transcripts) == {"added": 1, "unchanged": 0}
+    assert index.sync_transcripts(transcripts) == {"added": 0, "unchanged": 1}
+    assert {l["key"] for l in index.kwic("rights")} == {"transcript:b"}
+
+    assert index.remove("transcript:b")
+    assert index.kwic("rights") == []
@@ -0,0 +1,53 @@
+# test_media_info.py
+# MediaInfo parsing and probe-once caching (ffprobe is faked).
+import pytest
+
+pytest.importorskip("ffmpeg")
+
+from src.backend.analysis import media_info
+
+PROBE = {
+    "format": {"duration": "12.5", "size": "4", "format_name": "mov,mp4"},
+    "streams": [
+        {"codec_type": "video", "codec_name": "h264", "width": 1920, "height": 1080,
+         "avg_frame_rate": "30000/1001", "nb_frames": "375", "tags": {"rotate": "90"}},
+        {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2},
+    ],
+}
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_probe(path):
+        calls.append(path)
+        return PROBE
+
+    monkeypatch.setattr(media_info.ffmpeg, "probe", fake_probe)
+    monkeypatch.setattr(media_info, "_cache", {})
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"0000")
+    return path, calls
+
+
+def test_probe_fields(video):
+    path, _ = video
+    info = media_info.get_media_info(path)
+
+    assert info.duration == 12.5 and info.fps == pytest.approx(29.97, abs=0.01)
+    # Rotated 90 degrees: displayed frames are portrait
+    assert (info.width, info.height) == (1080, 1920)
+    assert info.has_audio and info.audio_codec == "aac" and info.frame_count == 375
+
+
+def test_probed_once_and_persisted(video, monkeypatch):
+    path, calls = video
+    first = media_info.get_media_info(path)
+    assert media_info.get_media_info(path) is first
+
+    # A new process finds the sidecar file instead of probing
+    monkeypatch.setattr(media_info, "_cache", {})
+    assert media_info.sidecar_path(path).exists()
+    assert media_info.get_media_info(path).to_dict() == first.to_dict()
+    assert len(calls) == 1
@@ -0,0 +1,41 @@
+# test_music_detection.py
+# Speech / music / silence labelling and music-span exclusion.
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis.pipeline_music_detection import (
+    classify_audio,
+    exclude_spans,
+    spans_with_label,
+)
+
+SR = 16000
+
+
+def _chord(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR), dtype=np.float32) / SR
+    tone = sum(np.sin(2 * np.pi * f * t) for f in (220, 277, 330))
+    return (0.1 * tone).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (0.001 * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+
+def test_steady_chord_is_music():
+    spans = classify_audio(np.concatenate([_silence(2), _chord(6), _silence(2)]), SR)
+
+    music = spans_with_label(spans, "music")
+    assert len(music) == 1
+    start, end = music[0]
+    assert start == pytest.approx(2.0, abs=0.5) and end == pytest.approx(8.0, abs=0.5)
+    assert spans[0]["label"] == "silence" and spans[-1]["end"] == pytest.approx(10.0)
+
+
+def test_exclude_spans_cuts_regions():
+    regions = [(0.0, 10.0), (12.0, 20.0)]
+    excluded = [(2.0, 4.0), (9.9, 13.0), (25.0, 30.0)]
+
+    assert exclude_spans(regions, excluded) == [(0.0, 2.0), (4.0, 9.9), (13.0, 20.0)]
@@ -0,0 +1,36 @@
+# test_ngram_counts.py
+# Mergeable n-gram tables and vectorized association measures.
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis.ngram_counts import MEASURES, NgramCounts, count_documents
+
+
+def _docs():
+    rng = np.random.default_rng(0)
+    vocab = np.array(["red", "apple", "green", "pear", "ripe", "fruit", "tree", "big"])
+    return [list(rng.choice(vocab, size=200, p=[.3, .2, .15, .1, .1, .05, .05, .05])) for _ in range(6)]
+
+
+def test_merge_is_associative_and_subtractable(tmp_path):
+    parts = [NgramCounts.from_tokens(doc) for doc in _docs()]
+    whole = NgramCounts.from_sequences(_docs())
+
+    assert NgramCounts.merge_all(parts) == whole
+    assert (parts[0] + parts[1]) + NgramCounts.merge_all(parts[2:]) == whole
+    assert whole - parts[0] == NgramCounts.merge_all(parts[1:])
+    assert NgramCounts.load(whole.save(tmp_path / "counts.npz")) == whole
+    assert count_documents([" ".join(doc) for doc in _docs()], str.split, chunk_size=2) == whole
+
+
+def test_association_measures_match_nltk():
+    collocations = pytest.importorskip("nltk.collocations")
+    tokens = [t for doc in _docs() for t in doc]
+    finder = collocations.BigramCollocationFinder.from_words(tokens)
+    finder.apply_freq_filter(3)
+    counts = NgramCounts.from_tokens(tokens)
+
+    for measure in MEASURES:
+        score_fn = getattr(collocations.BigramAssocMeasures, measure)
+        assert counts.nbest(measure, 20, min_freq=3) == finder.nbest(score_fn, 20)
@@ -0,0 +1,39 @@
+# test_pipeline_summary.py
+# Token-length chunking for the summarizer (no model needed: a whitespace
+# tokenizer with the same call signature stands in for a Hugging Face one).
+from src.backend.analysis.pipeline_summary import (
+    chunk_by_tokens,
+    input_token_limit,
+    pack_sentences,
+    split_sentences,
+)
+
+
+class WhitespaceTokenizer:
+    model_max_length = 8
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+
+def test_pack_sentences_respects_token_budget():
+    groups = pack_sentences(["a", "b", "c", "d"], [3, 3, 5, 9], max_tokens=6)
+    assert groups == [["a", "b"], ["c"], ["d"]]
+
+
+def test_chunk_by_tokens_splits_long_sentences():
+    text = "One two three. Four five! " + " ".join(f"w{i}" for i in range(14)) + " end."
+    assert split_sentences(text)[:2] == ["One two three.", "Four five!"]
+
+    tokenizer = WhitespaceTokenizer()
+    assert input_token_limit(tokenizer) == 6
+    chunks = chunk_by_tokens(text, tokenizer, max_tokens=6)
+    assert all(len(chunk.split()) <= 6 for chunk in chunks)
+    assert chunks[0] == "One two three. Four five!"
+    assert " ".join(chunks).split() == text.split()
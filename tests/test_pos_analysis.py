@@ -0,0 +1,275 @@
+# test_pos_analysis.py
+# POSAnalysis on hand-annotated Docs (no statistical model needed). The
+# expected dicts are the output of the original per-feature implementation
+# (one loop per count/bucket/slot) on the same Docs.
+from collections import Counter
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from spacy.tokens import Doc
+
+from src.backend.analysis.pos_analysis import POSAnalysis, _marker_matcher, analyze_segments
+from src.backend.utils.result_cache import ResultCache
+
+# (word, pos, tag, dep, head index, lemma, entity IOB)
+TOKENS_A = [
+    ("Yesterday", "ADV", "RB", "npadvmod", 5, "yesterday", "B-DATE"),
+    (",", "PUNCT", ",", "punct", 5, ",", ""),
+    ("the", "DET", "DT", "det", 3, "the", ""),
+    ("committee", "NOUN", "NN", "nsubj", 5, "committee", ""),
+    ("carefully", "ADV", "RB", "advmod", 5, "carefully", ""),
+    ("approved", "VERB", "VBD", "ROOT", 5, "approve", ""),
+    ("the", "DET", "DT", "det", 7, "the", ""),
+    ("regulation", "NOUN", "NN", "dobj", 5, "regulation", ""),
+    ("in", "ADP", "IN", "prep", 5, "in", ""),
+    ("Berlin", "PROPN", "NNP", "pobj", 8, "Berlin", "B-GPE"),
+    ("because", "SCONJ", "IN", "prep", 5, "because", ""),
+    ("of", "ADP", "IN", "pcomp", 10, "of", ""),
+    ("rising", "VERB", "VBG", "amod", 13, "rise", ""),
+    ("costs", "NOUN", "NNS", "pobj", 10, "cost", ""),
+    (".", "PUNCT", ".", "punct", 5, ".", ""),
+    ("We", "PRON", "PRP", "nsubj", 17, "we", ""),
+    ("must", "AUX", "MD", "aux", 17, "must", ""),
+    ("act", "VERB", "VB", "ROOT", 17, "act", ""),
+    ("quickly", "ADV", "RB", "advmod", 17, "quickly", ""),
+    ("to", "PART", "TO", "aux", 20, "to", ""),
+    ("reduce", "VERB", "VB", "advcl", 17, "reduce", ""),
+    ("emissions", "NOUN", "NNS", "dobj", 20, "emission", ""),
+    ("so", "SCONJ", "IN", "mark", 25, "so", ""),
+    ("that", "SCONJ", "IN", "mark", 25, "that", ""),
+    ("people", "NOUN", "NNS", "nsubj", 25, "people", ""),
+    ("benefit", "VERB", "VBP", "advcl", 17, "benefit", ""),
+    (".", "PUNCT", ".", "punct", 17, ".", ""),
+]
+
+TOKENS_B = [
+    ("As", "ADP", "IN", "prep", 4, "as", ""),
+    ("a", "DET", "DT", "det", 2, "a", ""),
+    ("result", "NOUN", "NN", "pobj", 0, "result", ""),
+    (",", "PUNCT", ",", "punct", 4, ",", ""),
+    ("prices", "NOUN", "NNS", "nsubj", 5, "price", ""),
+    ("rose", "VERB", "VBD", "ROOT", 5, "rise", ""),
+    ("from", "ADP", "IN", "prep", 5, "from", ""),
+    ("January", "PROPN", "NNP", "pobj", 6, "January", "B-DATE"),
+    ("by", "ADP", "IN", "prep", 5, "by", ""),
+    ("means", "NOUN", "NN", "pobj", 8, "means", ""),
+    ("of", "ADP", "IN", "prep", 9, "of", ""),
+    ("taxation", "NOUN", "NN", "pobj", 10, "taxation", ""),
+    (".", "PUNCT", ".", "punct", 5, ".", ""),
+    ("Therefore", "ADV", "RB", "advmod", 15, "therefore", ""),
+    ("workers", "NOUN", "NNS", "nsubj", 15, "worker", ""),
+    ("stayed", "VERB", "VBD", "ROOT", 15, "stay", ""),
+    ("in", "ADP", "IN", "prep", 15, "in", ""),
+    ("the", "DET", "DT", "det", 18, "the", ""),
+    ("office", "NOUN", "NN", "pobj", 16, "office", ""),
+    ("with", "ADP", "IN", "prep", 15, "with", ""),
+    ("their", "PRON", "PRP$", "poss", 21, "their", ""),
+    ("tools", "NOUN", "NNS", "pobj", 19, "tool", ""),
+    (".", "PUNCT", ".", "punct", 15, ".", ""),
+]
+
+SENT_A1 = "Yesterday, the committee carefully approved the regulation in Berlin because of rising costs."
+SENT_A2 = "We must act quickly to reduce emissions so that people benefit."
+SENT_B1 = "As a result, prices rose from January by means of taxation."
+SENT_B2 = "Therefore workers stayed in the office with their tools."
+
+EXPECTED_A = {
+    "text": f"{SENT_A1} {SENT_A2}",
+    "pos_counts": {"ADV": 3, "NOUN": 6, "VERB": 5, "ADP": 2, "CONJ": 3, "PRON": 1, "AUX_MODAL": 1},
+    "pos_ratios": {
+        "verb_noun_ratio": 5 / 6,
+        "modal_density": 1 / 24,
+        "pronoun_share": 1 / 24,
+        "adj_adv_ratio": 0.0,
+        "nominalization_density": 1 / 24,
+    },
+    "interrogative_lens": {
+        "who": ["the committee", "We", "people"],
+        "what": [SENT_A1, SENT_A2],
+        "when": ["Yesterday"],
+        "where": ["Berlin", "in Berlin"],
+        "why": ["because of rising costs.", SENT_A1],
+        "how": [SENT_A1, SENT_A2],
+        "by_what_means": [],
+        "towards_what_end": [SENT_A2, "to reduce emissions"],
+        "whence": [],
+        "by_what_consequence": ["so that people benefit."],
+    },
+    "pos_words": {
+        "NOUN": ["committee", "regulation", "Berlin", "costs", "emissions", "people"],
+        "VERB": ["approved", "rising", "act", "reduce", "benefit"],
+        "ADV": ["Yesterday", "carefully", "quickly"],
+        "PRON": ["We"],
+        "AUX_MODAL": ["must"],
+        "ADP": ["in", "of"],
+        "CONJ": ["because", "so", "that"],
+    },
+}
+
+EXPECTED_B = {
+    "text": f"{SENT_B1} {SENT_B2}",
+    "pos_counts": {"ADP": 6, "NOUN": 8, "VERB": 2, "ADV": 1, "PRON": 1},
+    "pos_ratios": {
+        "verb_noun_ratio": 2 / 8,
+        "modal_density": 0.0,
+        "pronoun_share": 1 / 20,
+        "adj_adv_ratio": 0.0,
+        "nominalization_density": 1 / 20,
+    },
+    "interrogative_lens": {
+        "who": ["As a result, prices", "workers"],
+        "what": [SENT_B1, SENT_B2],
+        "when": ["January"],
+        "where": ["in the office"],
+        "why": [SENT_B1],
+        "how": [SENT_B1],
+        "by_what_means": ["by means of taxation", "with their tools", SENT_B1],
+        "towards_what_end": [],
+        "whence": ["from January"],
+        "by_what_consequence": [SENT_B2, SENT_B1],
+    },
+    "pos_words": {
+        "NOUN": ["result", "prices", "January", "means", "taxation", "workers", "office", "tools"],
+        "VERB": ["rose", "stayed"],
+        "ADV": ["Therefore"],
+        "PRON": ["their"],
+        "ADP": ["As", "from", "by", "of", "in", "with"],
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def vocab():
+    # English lexical attributes (LOWER, IS_PUNCT) as a real pipeline has them
+    return spacy.blank("en").vocab
+
+
+def build_doc(vocab, tokens):
+    n = len(tokens)
+    return Doc(
+        vocab,
+        words=[t[0] for t in tokens],
+        spaces=[i + 1 < n and tokens[i + 1][1] != "PUNCT" for i in range(n)],
+        pos=[t[1] for t in tokens],
+        tags=[t[2] for t in tokens],
+        deps=[t[3] for t in tokens],
+        heads=[t[4] for t in tokens],
+        lemmas=[t[5] for t in tokens],
+        ents=[t[6] or "O" for t in tokens],
+    )
+
+
+def run_on(doc, tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=0)
+    return POSAnalysis(doc.text, nlp=lambda text: doc, cache=cache).run()
+
+
+@pytest.mark.parametrize("tokens, expected", [(TOKENS_A, EXPECTED_A), (TOKENS_B, EXPECTED_B)])
+def test_run_matches_reference(vocab, tokens, expected, tmp_path):
+    doc = build_doc(vocab, tokens)
+    assert doc.text == expected["text"]
+    assert run_on(doc, tmp_path) == expected
+
+
+def test_to_as_last_token(vocab, tmp_path):
+    doc = build_doc(vocab, [
+        ("We", "PRON", "PRP", "nsubj", 1, "we", ""),
+        ("want", "VERB", "VBP", "ROOT", 1, "want", ""),
+        ("to", "PART", "TO", "xcomp", 1, "to", ""),
+    ])
+    result = run_on(doc, tmp_path)
+    assert result["interrogative_lens"]["towards_what_end"] == []
+    assert result["interrogative_lens"]["what"] == ["We want to"]
+    assert result["pos_counts"] == {"PRON": 1, "VERB": 1}
+
+
+@pytest.fixture(scope="module")
+def sentencizer_nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def lens(nlp, text, tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=0)
+    return POSAnalysis(text, nlp=nlp, cache=cache).run()["interrogative_lens"]
+
+
+def test_phrase_markers_match_whole_tokens(sentencizer_nlp, tmp_path):
+    result = lens(sentencizer_nlp, "It failed because often nobody checked. They went out office. Resulting into chaos.", tmp_path)
+    # Only the single-word "because" marker; "because of"/"out of"/"resulting in" are not substrings here
+    assert result["why"] == ["because often nobody checked."]
+    assert result["whence"] == []
+    assert result["by_what_consequence"] == []
+
+
+def test_phrase_markers_map_to_their_sentence(sentencizer_nlp, tmp_path):
+    text = "We met. Prices rose Due to inflation. He went out. Of course he left. It happened in a way."
+    result = lens(sentencizer_nlp, text, tmp_path)
+    assert result["why"] == ["Prices rose Due to inflation."]
+    assert result["how"] == ["It happened in a way."]
+    # "out. Of" spans a sentence boundary
+    assert result["whence"] == []
+
+
+def test_marker_matcher_built_once_per_vocab(sentencizer_nlp):
+    vocab = sentencizer_nlp.vocab
+    assert _marker_matcher(vocab) is _marker_matcher(vocab)
+    assert _marker_matcher(spacy.blank("en").vocab) is not _marker_matcher(vocab)
+
+
+POS_LOOKUP = {
+    "we": "PRON", "they": "PRON", "must": "AUX", "should": "AUX", "and": "CCONJ", "because": "SCONJ",
+    "act": "VERB", "left": "VERB", "waited": "VERB", "tested": "VERB", "quickly": "ADV", "now": "ADV",
+    "new": "ADJ", "in": "ADP", "from": "ADP", "with": "ADP",
+}
+
+
+@spacy.Language.component("test_pos_lookup")
+def _pos_lookup(doc):
+    for token in doc:
+        token.pos_ = "PUNCT" if token.is_punct else POS_LOOKUP.get(token.lower_, "NOUN")
+        token.lemma_ = token.lower_
+    return doc
+
+
+def test_analyze_segments_aligns_and_merges(tmp_path):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("test_pos_lookup")
+    segments = [
+        {"start": 0.0, "end": 2.5, "speaker": "SPEAKER_00", "text": " We must act now. "},
+        {"start": 2.5, "end": 6.0, "speaker": "SPEAKER_01", "text": "They left the station because of delays."},
+        {"start": 6.0, "end": 9.0, "text": "We waited in the hall with new equipment and tested it quickly."},
+    ]
+    cache = ResultCache(tmp_path / "cache", max_bytes=0)
+    result = analyze_segments(segments, nlp=nlp, n_process=1, cache=cache)
+
+    assert [(s["start"], s["end"], s.get("speaker"), s["text"]) for s in result["segments"]] == [
+        (seg["start"], seg["end"], seg.get("speaker"), seg["text"].strip()) for seg in segments
+    ]
+    assert "speaker" not in result["segments"][2]
+
+    merged = Counter()
+    for seg, seg_result in zip(segments, result["segments"]):
+        alone = POSAnalysis(seg["text"].strip(), nlp=nlp, cache=cache).run()
+        assert seg_result["pos_counts"] == alone["pos_counts"]
+        assert seg_result["pos_ratios"] == alone["pos_ratios"]
+        assert seg_result["interrogative_lens"] == alone["interrogative_lens"]
+        merged.update(seg_result["pos_counts"])
+    assert result["pos_counts"] == dict(merged)
+    assert result["pos_counts"]["AUX_MODAL"] == 1
+
+    # POS features are token level, so they match one analysis of the joined text
+    joined = POSAnalysis(result["text"], nlp=nlp, cache=cache).run()
+    assert result["pos_counts"] == joined["pos_counts"]
+    assert result["pos_ratios"] == pytest.approx(joined["pos_ratios"])
+    assert result["pos_words"] == joined["pos_words"]
+
+    # Slots list each item once, in segment order
+    assert result["interrogative_lens"]["why"] == [
+        "because of delays.", "They left the station because of delays."
+    ]
+    assert result["interrogative_lens"]["when"] == ["now"]
@@ -0,0 +1,54 @@
+# test_quantitative_analysis.py
+# Corpus utilities that run without downloaded models or NLTK data.
+from pathlib import Path
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+pytest.importorskip("nltk")
+pytest.importorskip("sklearn")
+
+from src.backend.analysis.quantitative_analysis import compute_tfidf_top_terms, tag_sentences_who_why
+
+
+@pytest.fixture
+def ner_model(tmp_path):
+    """A blank English pipeline with a rule-based PERSON entity, saved to disk."""
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "PERSON", "pattern": "Alice"}])
+    nlp.to_disk(tmp_path / "model")
+    return str(tmp_path / "model")
+
+
+def test_who_why_tags_sentences_from_one_pass(ner_model):
+    docs = [
+        "Alice opened the meeting. We left early because it rained.",
+        "Nothing happened here.",
+    ]
+    tags = tag_sentences_who_why(docs, spacy_model=ner_model)
+
+    assert tags["sentence"].tolist() == [
+        "Alice opened the meeting.",
+        "We left early because it rained.",
+        "Nothing happened here.",
+    ]
+    assert tags["WHO"].tolist() == [True, False, False]
+    assert tags["WHY"].tolist() == [False, True, False]
+
+
+def test_tfidf_top_terms_sparse_and_streaming():
+    docs = [
+        "apples apples pears market",
+        "pears pears plums orchard orchard",
+        "market prices apples orchard",
+    ]
+    paths = [Path(f"doc{i}.txt") for i in range(len(docs))]
+
+    exact = compute_tfidf_top_terms(docs, paths, top_n=2)
+    assert exact["Document"].tolist() == ["doc0.txt", "doc1.txt", "doc2.txt"]
+    # Ties (equal scores) come out alphabetically
+    assert exact["TopTerms"].tolist() == [["apples", "market"], ["orchard", "pears"], ["prices", "apples"]]
+
+    streamed = compute_tfidf_top_terms(docs, paths, top_n=2, streaming=True, batch_size=2)
+    assert streamed.equals(exact)
@@ -0,0 +1,195 @@
+# test_result_cache.py
+# On-disk result cache: keys, size-bounded LRU eviction and hits/misses in
+# the summarization pipeline, POSAnalysis, analyze_segments and NLPProcessor.
+import time
+
+import pytest
+
+from src.backend.utils.result_cache import ResultCache, spacy_model_id
+
+
+def test_key_covers_text_stage_model_version_and_params(tmp_path):
+    cache = ResultCache(tmp_path)
+    base = cache.key("pos", "Hello there.", model="en_core_web_sm@3.7.1", params={"a": 1})
+    assert base == cache.key("pos", "Hello there.", model="en_core_web_sm@3.7.1", params={"a": 1})
+    assert len({
+        base,
+        cache.key("pos", "Hello there!", model="en_core_web_sm@3.7.1", params={"a": 1}),
+        cache.key("nlp", "Hello there.", model="en_core_web_sm@3.7.1", params={"a": 1}),
+        cache.key("pos", "Hello there.", model="en_core_web_sm@3.8.0", params={"a": 1}),
+        cache.key("pos", "Hello there.", model="en_core_web_sm@3.7.1", params={"a": 2}),
+        cache.key("pos", "Hello there.", model="en_core_web_sm@3.7.1", version=2, params={"a": 1}),
+    }) == 6
+
+
+def test_spacy_model_id_covers_components():
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("en")
+    blank_id = spacy_model_id(nlp)
+    nlp.add_pipe("sentencizer")
+    with_sentencizer = spacy_model_id(nlp)
+    nlp.disable_pipe("sentencizer")
+    disabled = spacy_model_id(nlp)
+    # Same meta (lang/name/version) in all three
+    assert len({blank_id, with_sentencizer, disabled}) == 3
+    assert with_sentencizer.endswith("[sentencizer]") and disabled.endswith("[!sentencizer]")
+
+
+def test_get_or_compute_and_lru_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=2500)
+    calls = []
+
+    def compute(name):
+        calls.append(name)
+        return {"name": name, "payload": "x" * 1000}
+
+    for name in ("a", "b"):
+        cache.get_or_compute("stage", name, lambda: compute(name))
+        time.sleep(0.01)
+    # A hit refreshes "a", so adding "c" evicts "b"
+    assert cache.get_or_compute("stage", "a", lambda: compute("a"))["name"] == "a"
+    time.sleep(0.01)
+    cache.get_or_compute("stage", "c", lambda: compute("c"))
+    assert calls == ["a", "b", "c"]
+
+    assert cache.get(cache.key("stage", "b")) is None
+    assert cache.get(cache.key("stage", "a"))["name"] == "a"
+    assert sum(p.stat().st_size for p in tmp_path.glob("*/*.json")) <= 2500
+
+    # A new instance sees the same entries
+    assert ResultCache(tmp_path, max_bytes=2500).get(cache.key("stage", "c"))["name"] == "c"
+
+
+def test_eviction_runs_down_to_low_water_mark(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path, max_bytes=10_000)
+    evictions = []
+    evict = cache._evict
+    monkeypatch.setattr(cache, "_evict", lambda: (evictions.append(cache._total), evict()))
+
+    for i in range(40):
+        cache.put(cache.key("stage", str(i)), {"payload": "x" * 1000})
+        assert cache._total <= 10_000 + 1100
+
+    # Each eviction frees room for several more entries instead of one
+    assert 0 < len(evictions) <= 40 // 2
+    assert cache._total <= 10_000
+    assert cache.get(cache.key("stage", "39")) is not None
+
+
+def test_disabled_cache_always_computes(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=0)
+    assert cache.get_or_compute("stage", "t", lambda: 1) == 1
+    assert cache.get_or_compute("stage", "t", lambda: 2) == 2
+    assert not list(tmp_path.iterdir())
+
+
+def test_summarization_pipeline_reuses_cached_summary(tmp_path, monkeypatch):
+    pytest.importorskip("sklearn")
+    from src.backend.analysis import pipeline_summary
+
+    monkeypatch.chdir(tmp_path)
+    cache = ResultCache(tmp_path / "cache")
+    transcript = {"segments": [
+        {"start": 0.0, "end": 3.0, "text": "The budget funds schools. Parks get money too."},
+        {"start": 3.0, "end": 6.0, "text": "School funding dominated the budget debate."},
+    ]}
+    first = pipeline_summary.SummarizationPipeline(transcript, engine="textrank", num_key_sentences=1, cache=cache).run()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("summary was recomputed")
+
+    monkeypatch.setattr(pipeline_summary, "extractive_summary", fail)
+    again = pipeline_summary.SummarizationPipeline(transcript, engine="textrank", num_key_sentences=1, cache=cache).run()
+    # created_at is stamped per run, not cached
+    assert again.pop("created_at") != first.pop("created_at")
+    assert again == first
+
+
+class CountingNLP:
+    """Wraps a spaCy pipeline and counts the texts it parses."""
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.parsed = []
+
+    def __getattr__(self, name):
+        return getattr(self.nlp, name)
+
+    def __call__(self, text):
+        self.parsed.append(text)
+        return self.nlp(text)
+
+    def pipe(self, texts, **kwargs):
+        texts = list(texts)
+        self.parsed.extend(texts)
+        return self.nlp.pipe(texts, **kwargs)
+
+
+@pytest.fixture
+def counting_nlp():
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return CountingNLP(nlp)
+
+
+def test_pos_analysis_run_hit_and_miss(tmp_path, counting_nlp):
+    from src.backend.analysis.pos_analysis import POSAnalysis
+
+    cache = ResultCache(tmp_path)
+    first = POSAnalysis("They left because of delays.", nlp=counting_nlp, cache=cache).run()
+    again = POSAnalysis("They left because of delays.", nlp=counting_nlp, cache=cache).run()
+    assert again == first
+    assert counting_nlp.parsed == ["They left because of delays."]
+
+    POSAnalysis("They stayed.", nlp=counting_nlp, cache=cache).run()
+    assert counting_nlp.parsed[-1] == "They stayed."
+
+
+def test_analyze_segments_hit_and_miss(tmp_path, counting_nlp):
+    from src.backend.analysis.pos_analysis import analyze_segments
+
+    cache = ResultCache(tmp_path)
+    segments = [
+        {"start": 0.0, "end": 2.0, "text": "We met."},
+        {"start": 2.0, "end": 4.0, "speaker": "SPEAKER_01", "text": "Prices rose due to inflation."},
+    ]
+    first = analyze_segments(segments, nlp=counting_nlp, n_process=1, cache=cache)
+    assert analyze_segments(segments, nlp=counting_nlp, n_process=1, cache=cache) == first
+    assert len(counting_nlp.parsed) == 2
+
+    # Same texts with other timestamps are a different transcript
+    moved = [{**seg, "start": seg["start"] + 1} for seg in segments]
+    assert analyze_segments(moved, nlp=counting_nlp, n_process=1, cache=cache)["segments"][0]["start"] == 1.0
+    assert len(counting_nlp.parsed) == 4
+
+
+def test_nlp_processor_process_hit_and_miss(tmp_path, monkeypatch):
+    spacy = pytest.importorskip("spacy")
+    from src.backend.analysis.pipeline_nlp import NLPProcessor
+
+    model_dir = tmp_path / "model"
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.to_disk(model_dir)
+
+    processor = NLPProcessor(str(model_dir), cache=ResultCache(tmp_path / "cache"))
+    calls = []
+
+    def fake_process(cleaned):
+        calls.append(cleaned)
+        return {"cleaned_text": cleaned, "tokens": [t.text for t in processor.nlp(cleaned)]}
+
+    monkeypatch.setattr(processor, "_process", fake_process)
+    first = processor.process("Budget talks   resumed. Schools get more.")
+    # Same text after cleanup
+    assert processor.process("  Budget talks resumed.  Schools get more. ") == first
+    assert calls == ["Budget talks resumed. Schools get more."]
+
+    processor.process("Budget talks stalled.")
+    assert len(calls) == 2
+
+    # Same text through a pipeline with a component disabled
+    processor.nlp.disable_pipe("sentencizer")
+    processor.process("Budget talks stalled.")
+    assert len(calls) == 3
@@ -0,0 +1,75 @@
+# test_search_index.py
+# FTS5 search over transcript segments and OCR lines: ranking, filters,
+# pagination, OCR line merging and sync from on-disk artifacts.
+import json
+
+from src.backend.analysis.search_index import SearchIndex, merge_ocr_lines, to_match_query
+
+
+def _index(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.index_transcript("a1", [
+        {"start": 0.0, "end": 3.0, "text": "The climate summit opens today.", "speaker": "SPEAKER_00"},
+        {"start": 3.0, "end": 5.0, "text": "Climate policy, climate money and climate goals."},
+        {"start": 5.0, "end": 8.0, "text": "Unrelated closing remarks."},
+    ])
+    index.index_ocr("b2", [
+        {"timestamp": 1.0, "text": "CLIMATE SUMMIT"},
+        {"timestamp": 2.0, "text": "CLIMATE  SUMMIT"},
+        {"timestamp": 9.0, "text": "Climate summit"},
+    ])
+    return index
+
+
+def test_ranked_filtered_and_paginated(tmp_path):
+    index = _index(tmp_path)
+
+    page = index.search("climate")
+    assert page["total"] == 4
+    top = page["results"][0]
+    assert (top["analysis_id"], top["source"], top["start"]) == ("a1", "transcript", 3.0)
+    assert "<mark>Climate</mark>" in top["snippet"]
+
+    ocr = index.search("summits", source="ocr")["results"]
+    assert [(r["start"], r["end"]) for r in ocr] == [(1.0, 2.0), (9.0, 9.0)]
+
+    assert index.search('"summit opens"', analysis_id="a1")["total"] == 1
+    assert [r["start"] for r in index.search("climate", limit=2, offset=2)["results"]] == \
+        [r["start"] for r in page["results"][2:]]
+
+
+def test_user_input_is_not_fts_syntax(tmp_path):
+    index = _index(tmp_path)
+    assert to_match_query('climate OR "summit" clim* NEAR(') == '"climate" "OR" "summit" "clim"* "NEAR"'
+    assert index.search('closing AND (remarks')["total"] == 0
+    assert index.search("***")["total"] == 0
+
+
+def test_merge_ocr_lines_by_text_and_gap():
+    lines = merge_ocr_lines([
+        {"timestamp": "0.0", "text": "Breaking"},
+        {"timestamp": "1.0", "text": "breaking"},
+        {"timestamp": "1.0", "text": "News"},
+        {"timestamp": "5.0", "text": "Breaking"},
+    ])
+    assert [(l["text"], l["start"], l["end"]) for l in lines] == [
+        ("Breaking", 0.0, 1.0), ("News", 1.0, 1.0), ("Breaking", 5.0, 5.0),
+    ]
+
+
+def test_sync_and_remove(tmp_path):
+    transcripts, csv_dir = tmp_path / "transcripts", tmp_path / "csv"
+    transcripts.mkdir()
+    csv_dir.mkdir()
+    (transcripts / "x9_transcript.json").write_text(json.dumps({"segments": [{"start": 0, "end": 1, "text": "hello world"}]}))
+    (csv_dir / "x9_ocr_20240101_000000.csv").write_text("timestamp,text,confidence,bbox\n1.0,old banner,0.9,[]\n")
+    (csv_dir / "x9_ocr_20240102_000000.csv").write_text("timestamp,text,confidence,bbox\n2.0,hello banner,0.9,[]\n")
+
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    assert index.sync(transcripts, csv_dir) == {"indexed": 2, "unchanged": 0}
+    assert index.sync(transcripts, csv_dir) == {"indexed": 0, "unchanged": 2}
+    assert {r["source"] for r in index.search("hello")["results"]} == {"transcript", "ocr"}
+    assert index.search("old")["total"] == 0
+
+    assert index.remove("x9")
+    assert index.search("hello")["total"] == 0
@@ -0,0 +1,161 @@
+# test_transcript_cache.py
+# Transcript cache: keys follow the decoded audio, model and decoding
+# options; writes are safe under concurrency and size-bounded; a cached
+# transcript is returned before any backend (or music detection) runs.
+import json
+import threading
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis import pipeline_audio_text, pipeline_ingestion, pipeline_vad
+from src.backend.analysis.pipeline_audio_text import AudioTranscriptionPipeline
+from src.backend.analysis.transcript_cache import TranscriptCache, audio_fingerprint
+from src.backend.analysis.transcription_backend import DEFAULT_BACKEND
+
+TRANSCRIPT = {
+    "language": "en",
+    "segments": [{"start": 0.0, "end": 1.5, "text": "Hello there."}],
+    "created_at": "2026-01-01T00:00:00",
+}
+
+
+def tone(seconds=1.0, freq=440.0):
+    t = np.arange(int(seconds * 16000), dtype=np.float32) / 16000
+    return (0.1 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def test_key_depends_on_audio_model_and_options(tmp_path):
+    cache = TranscriptCache(tmp_path)
+    pcm = tone()
+    fingerprint = audio_fingerprint(pcm)
+    base = cache.key(fingerprint, "whisper", "base", {"vad": False})
+
+    # Same samples in another buffer (e.g. a re-muxed upload) give the same key
+    assert audio_fingerprint(pcm.astype(np.float64)) == fingerprint
+    assert cache.key(audio_fingerprint(pcm.copy()), "whisper", "base", {"vad": False}) == base
+
+    changed = pcm.copy()
+    changed[100] += 0.01
+    assert len({
+        base,
+        cache.key(audio_fingerprint(changed), "whisper", "base", {"vad": False}),
+        cache.key(fingerprint, "whisper", "small", {"vad": False}),
+        cache.key(fingerprint, "faster-whisper", "base", {"vad": False}),
+        cache.key(fingerprint, "whisper", "base", {"vad": True}),
+    }) == 5
+
+
+def test_round_trip(tmp_path):
+    cache = TranscriptCache(tmp_path)
+    key = cache.key(audio_fingerprint(tone()), "whisper", "base")
+    assert cache.get(key) is None
+    cache.put(key, TRANSCRIPT)
+    assert TranscriptCache(tmp_path).get(key) == TRANSCRIPT
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_concurrent_writers_and_failed_writes(tmp_path, monkeypatch):
+    cache = TranscriptCache(tmp_path)
+    key = cache.key(audio_fingerprint(tone()), "whisper", "base")
+    errors = []
+
+    def write():
+        try:
+            for _ in range(20):
+                cache.put(key, TRANSCRIPT)
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write) for _ in range(4)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert errors == []
+    assert cache.get(key) == TRANSCRIPT
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(cache._store, "put", disk_full)
+    cache.put(cache.key("other", "whisper", "base"), TRANSCRIPT)  # logged, not raised
+
+
+def test_size_bound_and_legacy_entries(tmp_path):
+    # An entry in the flat layout used before the size bound
+    (tmp_path / "legacy.json").write_text(json.dumps(TRANSCRIPT))
+    cache = TranscriptCache(tmp_path, max_bytes=400)
+    assert cache.get("legacy") == TRANSCRIPT
+
+    for i in range(5):
+        cache.put(f"key{i}", TRANSCRIPT)
+    stored = list(tmp_path.rglob("*.json"))
+    assert sum(path.stat().st_size for path in stored) <= 400
+    assert cache.get("key4") == TRANSCRIPT
+    assert cache.get("legacy") is None
+
+    disabled = TranscriptCache(tmp_path / "off", max_bytes=0)
+    disabled.put("key", TRANSCRIPT)
+    assert disabled.get("key") is None
+
+
+def test_pipeline_hit_skips_backend(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def no_backend(*args, **kwargs):
+        raise AssertionError("transcription backend loaded on a cache hit")
+
+    monkeypatch.setattr(pipeline_ingestion, "get_transcription_backend", no_backend)
+    monkeypatch.setattr(pipeline_vad, "get_transcription_backend", no_backend)
+
+    pcm = tone()
+    cache = TranscriptCache()
+    cache.put(cache.key(audio_fingerprint(pcm), DEFAULT_BACKEND, "base", {"vad": False, "gate_music": False}), TRANSCRIPT)
+
+    streamed = []
+    pipeline = AudioTranscriptionPipeline(
+        "clip.wav", model_name="base", pcm=pcm, transcript_path=tmp_path / "clip_transcript.json"
+    )
+    result = pipeline.run(on_segment=streamed.append)
+
+    assert result["segments"] == TRANSCRIPT["segments"]
+    assert result["created_at"] == TRANSCRIPT["created_at"]
+    assert streamed == TRANSCRIPT["segments"]
+    assert (tmp_path / "clip_transcript.json").exists()
+
+    # Another model misses the cache and reaches the backend
+    with pytest.raises(AssertionError, match="backend loaded"):
+        AudioTranscriptionPipeline(
+            "clip.wav", model_name="small", pcm=pcm, transcript_path=tmp_path / "clip_transcript.json"
+        ).run()
+
+
+def test_pipeline_hit_skips_music_detection(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pcm = tone()
+    spans = [{"start": 0.0, "end": 0.5, "label": "speech"}, {"start": 0.5, "end": 1.0, "label": "music"}]
+    monkeypatch.setattr(pipeline_audio_text, "classify_audio", lambda pcm: spans)
+    monkeypatch.setattr(pipeline_audio_text, "transcribe_audio", lambda *args, **kwargs: dict(TRANSCRIPT))
+
+    def run():
+        return AudioTranscriptionPipeline(
+            "clip.wav", pcm=pcm, gate_music=True, transcript_path=tmp_path / "out" / "clip_transcript.json"
+        )
+
+    first = run()
+    first.run()
+    assert first.music_spans == [(0.5, 1.0)]
+
+    def no_classify(pcm):
+        raise AssertionError("music detection ran on a cache hit")
+
+    monkeypatch.setattr(pipeline_audio_text, "classify_audio", no_classify)
+    timeline = tmp_path / "out" / "clip_transcript_music.json"
+    timeline.unlink()
+    again = run()
+    result = again.run()
+    assert again.music_spans == [(0.5, 1.0)]
+    assert json.loads(timeline.read_text())["spans"] == [{"start": 0.5, "end": 1.0}]
+    assert "audio_spans" not in result
@@ -0,0 +1,107 @@
+# test_transcript_stream.py
+# TranscriptStream: late subscribers get the backlog, live segments arrive in
+# order, close() ends consumers, and the partial transcript file is written
+# and removed again by discard().
+import json
+import queue
+import threading
+
+from src.backend.analysis.transcript_stream import TranscriptStream
+
+
+def segment(i):
+    return {"start": float(i), "end": i + 1.0, "text": f"Segment {i}."}
+
+
+def iter_stream(stream, timeout=5):
+    """Backlog, then live segments until close() (as the SSE endpoint consumes it)."""
+    pending = queue.Queue()
+    backlog = stream.subscribe(pending.put)
+    try:
+        yield from backlog
+        while True:
+            item = pending.get(timeout=timeout)
+            if item is None:
+                return
+            yield item
+    finally:
+        stream.unsubscribe(pending.put)
+
+
+def test_late_subscriber_receives_backlog_once():
+    stream = TranscriptStream()
+    stream.publish(segment(0))
+    stream.publish(segment(1))
+
+    received = []
+    backlog = stream.subscribe(received.append)
+    stream.publish(segment(2))
+    stream.close()
+
+    assert backlog == [segment(0), segment(1)]
+    assert received == [segment(2), None]
+
+
+def test_live_segments_arrive_in_order_until_close():
+    stream = TranscriptStream()
+    stream.publish(segment(0))
+    consumer = iter_stream(stream)
+    # Subscribes and yields the backlog
+    assert next(consumer) == segment(0)
+
+    def produce():
+        for i in range(1, 200):
+            stream.publish(segment(i))
+        stream.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    rest = list(consumer)
+    producer.join()
+
+    assert rest == [segment(i) for i in range(1, 200)]
+    assert stream.segments == [segment(i) for i in range(200)]
+
+
+def test_close_ends_new_and_existing_subscribers():
+    stream = TranscriptStream()
+    consumer = iter_stream(stream)
+    stream.publish(segment(0))
+    assert next(consumer) == segment(0)
+    stream.close()
+    assert list(consumer) == []
+
+    # Publishing after close is ignored; a late subscriber still gets the backlog, then the end
+    stream.publish(segment(1))
+    assert list(iter_stream(stream)) == [segment(0)]
+
+
+def test_partial_transcript_file(tmp_path):
+    path = tmp_path / "partial" / "clip_transcript.partial.jsonl"
+    stream = TranscriptStream(path)
+    stream.publish(segment(0))
+    stream.publish({"start": 1.0, "end": 2.0, "text": "Grüße."})
+
+    # Flushed per segment, readable while transcription runs
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == stream.segments
+
+    stream.close()
+    stream.publish(segment(2))
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_discard_removes_partial_file_after_subscribers_drain(tmp_path):
+    path = tmp_path / "clip_transcript.partial.jsonl"
+    stream = TranscriptStream(path)
+    consumer = iter_stream(stream)
+    stream.publish(segment(0))
+    assert next(consumer) == segment(0)
+    stream.publish(segment(1))
+
+    # The final transcript is saved: the partial file goes, open consumers still finish
+    stream.discard()
+    assert not path.exists()
+    assert list(consumer) == [segment(1)]
+    assert stream._subscribers == []
+    stream.discard()
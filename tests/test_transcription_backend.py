@@ -0,0 +1,38 @@
+# test_transcription_backend.py
+# Checks that the faster-whisper backend returns the same segment schema as
+# the openai-whisper path. Uses the "tiny" model (or a local model directory
+# given in VAA1_TEST_WHISPER_MODEL) so it runs quickly on CPU.
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis.transcription_backend import get_transcription_backend
+
+TEST_MODEL = os.environ.get("VAA1_TEST_WHISPER_MODEL", "tiny")
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        get_transcription_backend("does-not-exist", TEST_MODEL)
+
+
+def test_faster_whisper_segments_schema():
+    pytest.importorskip("faster_whisper")
+    backend = get_transcription_backend("faster-whisper", TEST_MODEL)
+
+    # Two seconds of a 440 Hz tone at 16 kHz
+    t = np.arange(2 * 16000, dtype=np.float32) / 16000
+    audio = (0.1 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+    result = backend.transcribe(audio)
+
+    assert isinstance(result["language"], str)
+    assert isinstance(result["segments"], list)
+    for seg in result["segments"]:
+        assert set(seg) == {"start", "end", "text"}
+        assert seg["start"] <= seg["end"]
+
+    # Backend instances (and loaded models) are cached
+    assert get_transcription_backend("faster-whisper", TEST_MODEL) is backend
@@ -0,0 +1,118 @@
+# test_vad.py
+# Energy-based speech region detection, timestamp stitching, and the shared
+# transcription pool (reused across jobs, skipped for short inputs).
+from concurrent.futures import Future
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.backend.analysis import pipeline_vad
+from src.backend.analysis.pipeline_vad import detect_speech_regions, offset_segments, transcribe_regions
+
+SR = 16000
+
+
+def _tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR), dtype=np.float32) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def _silence(seconds: float) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (0.001 * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+
+def test_detects_separated_speech_regions():
+    pcm = np.concatenate([_silence(2), _tone(3), _silence(4), _tone(2), _silence(1)])
+    regions = detect_speech_regions(pcm, SR)
+
+    assert len(regions) == 2
+    (s1, e1), (s2, e2) = regions
+    assert s1 == pytest.approx(2.0, abs=0.3) and e1 == pytest.approx(5.0, abs=0.3)
+    assert s2 == pytest.approx(9.0, abs=0.3) and e2 == pytest.approx(11.0, abs=0.3)
+
+
+def test_silence_only_has_no_regions():
+    assert detect_speech_regions(_silence(5), SR) == []
+
+
+def test_long_regions_are_split():
+    regions = detect_speech_regions(np.concatenate([_silence(1), _tone(70), _silence(1)]), SR)
+
+    assert len(regions) >= 3
+    assert all(end - start <= 30.0 + 1e-6 for start, end in regions)
+    # Pieces are contiguous
+    for (_, end), (start, _) in zip(regions, regions[1:]):
+        assert start == pytest.approx(end)
+
+
+def test_offset_segments_to_absolute_time():
+    segments = [{"start": 0.0, "end": 1.5, "text": "hi"}, {"start": 1.5, "end": 4.0, "text": "there"}]
+    shifted = offset_segments(segments, 10.0, region_end=13.0)
+
+    assert [(s["start"], s["end"]) for s in shifted] == [(10.0, 11.5), (11.5, 13.0)]
+    assert [s["text"] for s in shifted] == ["hi", "there"]
+
+
+def test_offset_segments_drop_segments_past_region_end():
+    segments = [
+        {"start": 0.0, "end": 2.0, "text": "inside"},
+        {"start": 2.5, "end": 3.5, "text": "crosses"},
+        {"start": 3.0, "end": 3.0, "text": "at the end"},
+        {"start": 3.4, "end": 4.0, "text": "past the end"},
+    ]
+    shifted = offset_segments(segments, 10.0, region_end=13.0)
+
+    assert [(s["start"], s["end"], s["text"]) for s in shifted] == [(10.0, 12.0, "inside"), (12.5, 13.0, "crosses")]
+    assert all(s["start"] <= s["end"] for s in shifted)
+
+
+class FakeEngine:
+    def transcribe(self, audio, on_segment=None):
+        seg = {"start": 0.0, "end": len(audio) / SR, "text": "words"}
+        if on_segment:
+            on_segment(seg)
+        return {"language": "en", "segments": [seg]}
+
+
+class FakePool:
+    """In-process ProcessPoolExecutor stand-in that counts pool creations."""
+
+    created = []
+
+    def __init__(self, max_workers, mp_context, initializer, initargs):
+        initializer(*initargs)
+        FakePool.created.append(self)
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_pool_is_reused_across_jobs_and_skipped_for_short_speech(monkeypatch):
+    monkeypatch.setattr(pipeline_vad, "get_transcription_backend", lambda *args, **kwargs: FakeEngine())
+    monkeypatch.setattr(pipeline_vad, "ProcessPoolExecutor", FakePool)
+    monkeypatch.setattr(pipeline_vad, "MIN_PARALLEL_SPEECH_S", 60.0)
+    monkeypatch.setattr(FakePool, "created", [])
+    pcm = np.zeros(200 * SR, dtype=np.float32)
+
+    # Short speech: serial, no pool
+    result = transcribe_regions(pcm, [(0.0, 10.0), (20.0, 30.0)], workers=2)
+    assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.0, 10.0), (20.0, 30.0)]
+    assert FakePool.created == []
+
+    regions = [(0.0, 30.0), (40.0, 70.0), (80.0, 110.0)]
+    for _ in range(3):
+        result = transcribe_regions(pcm, regions, workers=2)
+        assert [(s["start"], s["end"]) for s in result["segments"]] == regions
+    assert len(FakePool.created) == 1
+
+    # Another model gets its own pool
+    transcribe_regions(pcm, regions, model_name="small", workers=2)
+    assert len(FakePool.created) == 2
+    pipeline_vad.shutdown_pool()